@@ -0,0 +1,269 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import struct
+import sys
+import zlib
+import pygame
+import settings
+
+try:
+    from PIL import Image, ImageSequence
+    _GIF_SUPPORT = True
+except ImportError:
+    Image = ImageSequence = None
+    _GIF_SUPPORT = False
+
+# asset build step and integrity manifest
+# build step (run whenever the art changes, and before deploying):
+#     python asset_manifest.py                  # check every asset, write assets/manifest.json
+#     python asset_manifest.py --fix-in-place   # same, and rewrite the pngs that need fixing
+#     python asset_manifest.py --check          # only verify the files still match the manifest
+# every *_PATH in settings.py that points into the assets folder is opened once
+# here and decoded to make sure it actually loads. pngs with a colour profile
+# (a profile libpng doesn't like, the iCCP error, is the usual reason a png
+# fails to load) and 16 bit or interlaced pngs are reported as fixable. only
+# with --fix-in-place is the profile stripped and the png re-saved as a plain
+# 8 bit one, with the original kept next to it as <file>.bak. the source art
+# is never rewritten otherwise. the manifest records the hash, byte size and
+# dimensions (or frame count / length) of each file and whether it's ok,
+# missing or broken. the build exits with status 1 if anything is missing or
+# broken, so a deploy script stops there instead of a player finding out.
+# at runtime Assets reads the manifest once and trusts it instead of probing
+# the filesystem for every file. paths it doesn't list (e.g. changed by a
+# settings profile) are still checked on disk like before.
+
+MANIFEST_VERSION = 1
+BAD_STATUSES = ("missing", "broken")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# chunks --fix-in-place drops. SDL_image ignores colour management anyway, and
+# everything else (gamma, text, timestamps...) is left alone
+STRIP_PNG_CHUNKS = {b"iCCP"}
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp"}
+SOUND_EXTENSIONS = {".mp3", ".ogg", ".wav"}
+FONT_EXTENSIONS = {".ttf", ".otf"}
+
+# outputs of build steps, not source assets
+_GENERATED = {"ATLAS_INDEX_PATH", "ASSET_MANIFEST_PATH"}
+
+def asset_dir():
+    return os.path.dirname(settings.ASSET_MANIFEST_PATH)
+
+def manifest_key(path):
+    """`path` relative to the assets folder, the way the manifest stores it (no filesystem access)."""
+    return os.path.relpath(path, asset_dir()).replace(os.sep, "/")
+
+def referenced_assets():
+    """Maps every asset file referenced in settings.py to the setting names that use it."""
+    root = asset_dir() + os.sep
+    files = {}
+    for name, value in sorted(vars(settings).items()):
+        if name.endswith("_PATH") and name not in _GENERATED and isinstance(value, str) and value.startswith(root):
+            files.setdefault(value, []).append(name)
+    return files
+
+# ---- png chunks ----
+def read_png_chunks(data):
+    """Splits png bytes into (tag, body) pairs. Raises ValueError if the file is damaged."""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("not a png file")
+    chunks = []
+    offset = len(PNG_SIGNATURE)
+    while offset < len(data):
+        if offset + 8 > len(data):
+            raise ValueError("truncated chunk header")
+        length, tag = struct.unpack_from(">I4s", data, offset)
+        body = data[offset + 8:offset + 8 + length]
+        crc = data[offset + 8 + length:offset + 12 + length]
+        if len(body) != length or len(crc) != 4:
+            raise ValueError(f"truncated {tag.decode('latin-1')} chunk")
+        if struct.unpack(">I", crc)[0] != zlib.crc32(tag + body):
+            raise ValueError(f"bad checksum in {tag.decode('latin-1')} chunk")
+        chunks.append((tag, body))
+        offset += 12 + length
+        if tag == b"IEND":
+            break
+    if not chunks or chunks[0][0] != b"IHDR" or chunks[-1][0] != b"IEND":
+        raise ValueError("missing IHDR or IEND chunk")
+    return chunks
+
+def write_png_chunks(chunks):
+    return PNG_SIGNATURE + b"".join(
+        struct.pack(">I", len(body)) + tag + body + struct.pack(">I", zlib.crc32(tag + body)) for tag, body in chunks)
+
+def clean_png(data):
+    """Returns (cleaned png bytes, list of the fixes applied to them)."""
+    chunks = read_png_chunks(data)
+    changes = []
+    _, _, depth, _, _, _, interlace = struct.unpack(">IIBBBBB", chunks[0][1])
+    if depth == 16 or interlace:
+        # pygame decodes to 8 bits per channel and saves without interlacing
+        surface = pygame.image.load(io.BytesIO(data), "asset.png")
+        out = io.BytesIO()
+        pygame.image.save(surface, out, "asset.png")
+        chunks = read_png_chunks(out.getvalue())
+        changes.append("re-save as 8 bit" if depth == 16 else "re-save without interlacing")
+
+    stripped = sorted({tag.decode("latin-1") for tag, _ in chunks if tag in STRIP_PNG_CHUNKS})
+    if stripped:
+        chunks = [(tag, body) for tag, body in chunks if tag not in STRIP_PNG_CHUNKS]
+        changes.append("strip " + ", ".join(stripped))
+    return (write_png_chunks(chunks) if changes else data), changes
+
+# ---- build step ----
+def _kind(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        return "image"
+    if extension == ".gif":
+        return "gif"
+    if extension in SOUND_EXTENSIONS:
+        return "sound"
+    if extension in FONT_EXTENSIONS:
+        return "font"
+    return "file"
+
+def _decode(kind, path, entry):
+    """Loads the file the way the game will and records what it found. Raises on failure."""
+    if kind == "image":
+        entry["size"] = list(pygame.image.load(path).get_size())
+    elif kind == "gif" and _GIF_SUPPORT:
+        with Image.open(path) as gif:
+            entry["size"] = list(gif.size)
+            frames = 0
+            for frame in ImageSequence.Iterator(gif):
+                frame.load()
+                frames += 1
+            entry["frames"] = frames
+    elif kind == "sound" and pygame.mixer.get_init():
+        entry["length_s"] = round(pygame.mixer.Sound(path).get_length(), 3)
+    elif kind == "font":
+        pygame.font.Font(path, 12)
+
+def _write_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def build_entry(path, setting_names, fix_in_place=False):
+    """Checks (and with `fix_in_place`, fixes up) one asset. Returns its manifest entry."""
+    kind = _kind(path)
+    entry = {"settings": setting_names, "kind": kind, "status": "ok"}
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        entry["status"] = "missing"
+        return entry
+    except OSError as e:
+        entry.update(status="broken", error=str(e))
+        return entry
+
+    try:
+        if kind == "image" and data.startswith(PNG_SIGNATURE):
+            cleaned, changes = clean_png(data)
+            if changes and fix_in_place:
+                if not os.path.exists(path + ".bak"): # keep the very first original
+                    _write_atomic(path + ".bak", data)
+                _write_atomic(path, cleaned)
+                data = cleaned
+                entry["changes"] = changes
+            elif changes:
+                entry["fixable"] = changes
+        _decode(kind, path, entry)
+    except (ValueError, pygame.error, OSError) as e: # PIL raises OSError subclasses for bad gifs
+        entry.update(status="broken", error=str(e))
+    entry["bytes"] = len(data)
+    entry["sha256"] = hashlib.sha256(data).hexdigest()
+    return entry
+
+def build_manifest(out_path=None, fix_in_place=False):
+    """Checks every referenced asset and writes the manifest. Returns it."""
+    out_path = out_path or settings.ASSET_MANIFEST_PATH
+    assets = {}
+    for path, setting_names in referenced_assets().items():
+        assets[manifest_key(path)] = build_entry(path, setting_names, fix_in_place)
+    manifest = {"version": MANIFEST_VERSION, "assets": assets}
+    with open(out_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def check_manifest(manifest):
+    """Rehashes every file the manifest lists as ok. Returns a list of problems."""
+    problems = []
+    for key, entry in sorted(manifest["assets"].items()):
+        if entry["status"] != "ok":
+            continue
+        try:
+            with open(os.path.join(asset_dir(), key), "rb") as f:
+                data = f.read()
+        except OSError as e:
+            problems.append(f"{key}: {e}")
+            continue
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            problems.append(f"{key}: changed since the manifest was built")
+    listed = set(manifest["assets"])
+    for path in referenced_assets():
+        if manifest_key(path) not in listed:
+            problems.append(f"{manifest_key(path)}: referenced in settings.py but not in the manifest")
+    return problems
+
+# ---- runtime loading ----
+def load_manifest(path=None):
+    """Reads the manifest the build step wrote. Returns None if there isn't a usable one."""
+    path = path or settings.ASSET_MANIFEST_PATH
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error loading asset manifest {path}: {e}")
+        return None
+    if manifest.get("version") != MANIFEST_VERSION or "assets" not in manifest:
+        print(f"Asset manifest {path} is from another version, rebuild it with `python asset_manifest.py`")
+        return None
+    return manifest
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check and clean the go fish assets, and write the asset manifest")
+    parser.add_argument("--check", action="store_true", help="only verify the files against an existing manifest")
+    parser.add_argument("--fix-in-place", action="store_true",
+                        help="rewrite pngs with a colour profile or 16 bit / interlaced pixels (originals kept as .bak)")
+    cli = parser.parse_args()
+
+    # sounds only get decoded if there's an audio device, the dummy one will do
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+
+    if cli.check:
+        manifest = load_manifest()
+        if manifest is None:
+            parser.exit(1, f"No asset manifest at {settings.ASSET_MANIFEST_PATH}\n")
+        problems = check_manifest(manifest)
+        problems += [f"{key}: {entry['status']}" for key, entry in sorted(manifest["assets"].items())
+                     if entry["status"] in BAD_STATUSES]
+        for problem in problems:
+            print(f"[BAD] {problem}")
+        print(f"{len(manifest['assets'])} assets, {len(problems)} problem(s)")
+        sys.exit(1 if problems else 0)
+
+    manifest = build_manifest(fix_in_place=cli.fix_in_place)
+    bad = 0
+    for key, entry in sorted(manifest["assets"].items()):
+        if entry["status"] in BAD_STATUSES:
+            bad += 1
+            print(f"[{entry['status'].upper()}] {key}" + (f": {entry['error']}" if "error" in entry else ""))
+            if "fixable" in entry:
+                print(f"    might load after: {'; '.join(entry['fixable'])} (run with --fix-in-place)")
+        elif "changes" in entry:
+            print(f"[FIXED] {key}: {'; '.join(entry['changes'])} (original kept as {key}.bak)")
+        elif "fixable" in entry:
+            print(f"[FIXABLE] {key}: {'; '.join(entry['fixable'])} (run with --fix-in-place)")
+    print(f"Wrote {settings.ASSET_MANIFEST_PATH} ({len(manifest['assets'])} assets, {bad} missing or broken)")
+    sys.exit(1 if bad else 0)
@@ -1,6 +1,10 @@
 import pygame
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import settings
+from atlas import load_atlas
+from asset_manifest import load_manifest, manifest_key, BAD_STATUSES
 
 # has everything related to loading assets (images, sounds, etc)
 try:
@@ -10,10 +14,36 @@ except ImportError:
     Image = ImageSequence = None
     _GIF_SUPPORT = False
 
+# ---- asset manifest ----
+# set once by Assets() from the build step's manifest (see asset_manifest.py), None without one
+_manifest = None
+
+def manifest_status(path):
+    """'ok', 'missing' or 'broken' if the manifest lists `path`, otherwise None."""
+    if _manifest is None:
+        return None
+    entry = _manifest["assets"].get(manifest_key(path))
+    return entry["status"] if entry else None
+
+def asset_exists(path):
+    """Whether `path` is usable: a dict lookup if the manifest lists it, a filesystem check otherwise."""
+    status = manifest_status(path)
+    if status is None:
+        return os.path.exists(path)
+    return status == "ok"
+
 # ---- error handling for image loading ----
 def load_image_safely(path, variable_name):
     """Tries to load an image, printing a specific error if it fails."""
-    if not os.path.exists(path):
+    img = decode_image_safely(path, variable_name)
+    return img.convert_alpha() if img else None
+
+def decode_image_safely(path, variable_name):
+    """Like load_image_safely() but without convert_alpha(), so it's safe off the main thread."""
+    status = manifest_status(path)
+    if status in BAD_STATUSES:
+        return None # already reported at startup, see Assets.report_manifest()
+    if status is None and not os.path.exists(path):
         directory = os.path.dirname(path)
         alt_path = os.path.join(directory, variable_name + ".png")
         if os.path.exists(alt_path):
@@ -23,8 +53,12 @@ def load_image_safely(path, variable_name):
             print(f"Asset not found: {path} (also checked {alt_path})")
             return None
     try:
-        return pygame.image.load(path).convert_alpha()
-    except pygame.error as e:
+        return pygame.image.load(path)
+    except FileNotFoundError:
+        # the manifest said ok, but the file was removed since it was built
+        print(f"Asset not found: {path} (the asset manifest is out of date, rebuild it with `python asset_manifest.py`)")
+        return None
+    except (pygame.error, OSError) as e:
         print(f"Error loading {variable_name} from {path}: {e}")
         print("This can be caused by a file corruption or an 'iCCP' profile issue.")
         print("-> Try re-saving the PNG file in an image editor like GIMP or Paint.NET.")
@@ -44,11 +78,138 @@ def _safe_scale_image(img, max_w, max_h):
     except Exception:
         return pygame.transform.scale(img, new_size)
 
-# ---- gif loading support ---- (frame counting and resizing)
+# ---- scaled variant cache ----
+class ScaledSurfaceCache:
+    """Bounded LRU cache of scaled surface variants, keyed by (name, size, fit).
+
+    variants are built lazily the first time they're drawn at a resolution, so a
+    resize only rebuilds what's actually on screen. the least recently drawn
+    variants are dropped once the cache goes over `max_bytes`.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.dependencies = {} # cache key -> names of the source images it was built from
+        self.total_bytes = 0
+
+    def get(self, key, source, size, fit=False):
+        name = key[0] if isinstance(key, tuple) else key
+        return self.get_or_build((key, size, fit), lambda: _scale_surface(source, size, fit), (name,))
+
+    def get_or_build(self, cache_key, build, depends_on=()):
+        """Returns the cached surface for `cache_key`, calling `build()` to make it on a miss."""
+        surface = self.entries.get(cache_key)
+        if surface is not None:
+            self.entries.move_to_end(cache_key)
+            return surface
+
+        surface = build()
+        self.entries[cache_key] = surface
+        self.dependencies[cache_key] = frozenset(depends_on)
+        self.total_bytes += _surface_bytes(surface)
+        self.trim()
+        return surface
+
+    def trim(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            self._remove(next(iter(self.entries)))
+
+    def invalidate(self, names):
+        """Drops every variant built from any of the source images in `names`."""
+        names = set(names)
+        for cache_key in [k for k, deps in self.dependencies.items() if deps & names]:
+            self._remove(cache_key)
+
+    def _remove(self, cache_key):
+        self.total_bytes -= _surface_bytes(self.entries.pop(cache_key))
+        del self.dependencies[cache_key]
+
+    def clear(self):
+        self.entries.clear()
+        self.dependencies.clear()
+        self.total_bytes = 0
+
+def _scale_surface(source, size, fit):
+    if fit:
+        return _safe_scale_image(source, *size)
+    if source.get_size() == size:
+        return source
+    try:
+        return pygame.transform.smoothscale(source, size)
+    except ValueError: # smoothscale only handles 24/32 bit surfaces
+        return pygame.transform.scale(source, size)
+
+def _surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+# ---- on-demand fish art ----
+class SpeciesArtCache:
+    """Loads fish art on demand and keeps the most recently used species in memory.
+
+    a session only ever shows the fish that was caught, so nothing is loaded at
+    startup. prefetch() decodes a species on a background thread as soon as the
+    catch starts, and get() picks it up (converting on the main thread) by the
+    time the won screen needs it. least recently used species are unloaded once
+    the cache goes over `max_bytes`.
+    """
+    def __init__(self, paths, max_bytes):
+        self.paths = dict(paths) # species id -> png path
+        self.max_bytes = max_bytes
+        self.loaded = OrderedDict() # species id -> surface (None if the file is missing)
+        self.pending = {} # species id -> Future of the decoded surface
+        self.total_bytes = 0
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fish-art")
+
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def prefetch(self, species_id):
+        if species_id in self.loaded or species_id in self.pending or species_id not in self.paths:
+            return
+        self.pending[species_id] = self.executor.submit(
+            decode_image_safely, self.paths[species_id], "fish_" + species_id + "_img")
+
+    def get(self, species_id):
+        if species_id in self.loaded:
+            self.loaded.move_to_end(species_id)
+            self.hits += 1
+            return self.loaded[species_id]
+        if species_id not in self.paths:
+            return None
+
+        future = self.pending.pop(species_id, None)
+        if future is not None:
+            img = future.result() # normally already done, the catch took longer than the decode
+        else:
+            img = decode_image_safely(self.paths[species_id], "fish_" + species_id + "_img")
+        surface = img.convert_alpha() if img else None
+        self.loads += 1
+
+        self.loaded[species_id] = surface
+        self.total_bytes += _surface_bytes(surface) if surface else 0
+        while self.total_bytes > self.max_bytes and len(self.loaded) > 1:
+            _, evicted = self.loaded.popitem(last=False)
+            self.total_bytes -= _surface_bytes(evicted) if evicted else 0
+            self.evictions += 1
+        return surface
+
+    def forget(self, species_id, path=None):
+        """Drops a species (e.g. after its path changed) so the next get() reloads it."""
+        if path is not None:
+            self.paths[species_id] = path
+        self.pending.pop(species_id, None)
+        surface = self.loaded.pop(species_id, None)
+        self.total_bytes -= _surface_bytes(surface) if surface else 0
+
+# ---- gif loading support ---- (frame counting)
     # also error handling if PIL is not installed (if gif not working)
 def load_gif_frames(path):
-    """Loads frames and their durations from a GIF, resizing them to fit the screen."""
-    if not _GIF_SUPPORT or not os.path.exists(path):
+    """Loads frames and their durations from a GIF at their original size.
+
+    frames get scaled to the screen lazily through Assets.cutscene_frame().
+    """
+    if not _GIF_SUPPORT or not asset_exists(path):
         return None
 
     frames = []
@@ -58,10 +219,9 @@ def load_gif_frames(path):
             for pil_frame in ImageSequence.Iterator(pil_img):
                 duration = int(pil_frame.info.get('duration', default_duration) * settings.GIF_SPEED_MULTIPLIER)
                 pil_frame = pil_frame.copy().convert('RGBA')
-                raw_surface = pygame.image.fromstring(
+                frame_surface = pygame.image.fromstring(
                     pil_frame.tobytes(), pil_frame.size, pil_frame.mode
                 ).convert_alpha()
-                frame_surface = pygame.transform.smoothscale(raw_surface, (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
                 frames.append((frame_surface, duration))
     except Exception as e:
         print(f"Error loading GIF {path}: {e}")
@@ -71,29 +231,33 @@ def load_gif_frames(path):
 
 class Assets:
     def __init__(self):
+        # one read of the build step's manifest instead of probing every file
+        global _manifest
+        _manifest = load_manifest()
+        self.report_manifest()
+
         # --- menu assets ---
         self.menu_bg_img = self.load_menu_bg()
         self.play_button_img = self.load_play_button()
         self.fishing_bg_img = self.load_fishing_bg()
         self.success_img = load_image_safely(settings.SUCCESS_IMG_PATH, "success_img")
         self.lose_img = load_image_safely(settings.LOSE_IMG_PATH, "lose_img")
-        self.fish_carp_img = load_image_safely(settings.FISH_CARP_PATH, "fish_carp_img")
-        self.fish_sardine_img = load_image_safely(settings.FISH_SARDINE_PATH, "fish_sardine_img")
-        self.fish_bream_img = load_image_safely(settings.FISH_BREAM_PATH, "fish_bream_img")
-        self.fish_bass_img = load_image_safely(settings.FISH_BASS_PATH, "fish_bass_img")
-        self.fish_trout_img = load_image_safely(settings.FISH_TROUT_PATH, "fish_trout_img")
-        self.fih = load_image_safely(settings.FISH_SALMON_PATH, "fih")
-        self.fish_tuna_img = load_image_safely(settings.FISH_TUNA_PATH, "fish_tuna_img")
-        self.pufferfish = load_image_safely(settings.FISH_PUFFERFISH_PATH, "pufferfish")
-        self.fish_shark_img = load_image_safely(settings.FISH_SHARK_PATH, "fish_shark_img")
-        self.fish_legend_img = load_image_safely(settings.FISH_LEGEND_PATH, "fish_legend_img")
+
+        # --- ui indicator sprites come from the texture atlas ---
+        # falls back to the individual pngs if `python atlas.py` hasn't been run
+        sprites = load_atlas()
+        if not sprites:
+            print("Texture atlas not found, loading sprites individually (run `python atlas.py` to build it)")
+
+        # --- fish art is loaded per species when it's needed, see SpeciesArtCache ---
+        self.fish_art = SpeciesArtCache(settings.FISH_SPRITE_PATHS, settings.FISH_ART_CACHE_MB * 1024 * 1024)
 
         # --- game state image assets ---
-        self.waiting_img = load_image_safely(settings.WAITING_IMG_PATH, "waiting_img")
-        self.bite_img = load_image_safely(settings.BITE_IMG_PATH, "bite_img")
-        self.progress_high_img = load_image_safely(settings.PROGRESS_HIGH_IMG_PATH, "progress_high_img")
-        self.progress_mid_img = load_image_safely(settings.PROGRESS_MID_IMG_PATH, "progress_mid_img")
-        self.progress_low_img = load_image_safely(settings.PROGRESS_LOW_IMG_PATH, "progress_low_img")
+        self.waiting_img = self.load_sprite(sprites, "waiting", settings.WAITING_IMG_PATH)
+        self.bite_img = self.load_sprite(sprites, "bite", settings.BITE_IMG_PATH)
+        self.progress_high_img = self.load_sprite(sprites, "progress_high", settings.PROGRESS_HIGH_IMG_PATH)
+        self.progress_mid_img = self.load_sprite(sprites, "progress_mid", settings.PROGRESS_MID_IMG_PATH)
+        self.progress_low_img = self.load_sprite(sprites, "progress_low", settings.PROGRESS_LOW_IMG_PATH)
 
         # --- sound assets ---
         self.casting_sound = self.load_sound(settings.CASTING_SOUND_PATH)
@@ -109,11 +273,163 @@ class Assets:
         # --- cutscene frames ---
         self.cutscene_frames = load_gif_frames(settings.WIN_GIF_PATH)
 
-        self.scale_images()
+        # images above are kept at their source size. whatever gets drawn is
+        # scaled to the current resolution through this cache.
+        self.scaled_cache = ScaledSurfaceCache(settings.SCALED_ASSET_CACHE_MB * 1024 * 1024)
+        # (overlay key, size) -> composite, see fishing_scene(). kept out of the
+        # scaled cache so the menu/won/lost variants can't push them out
+        self.fishing_scenes = {}
+        # frame size -> cutscene frames scaled to it (None until first drawn), see cutscene_frame()
+        self.cutscene_scaled = {}
+
+    def report_manifest(self):
+        if _manifest is None:
+            print("Asset manifest not found, checking files on disk (run `python asset_manifest.py` to build it)")
+            return
+        for key, entry in sorted(_manifest["assets"].items()):
+            if entry["status"] in BAD_STATUSES:
+                print(f"[{entry['status'].upper()}] {key}" + (f": {entry['error']}" if "error" in entry else ""))
+
+    def load_sprite(self, sprites, sprite_id, path):
+        """Returns the atlas subsurface for `sprite_id`, or loads `path` if it isn't packed."""
+        if sprite_id in sprites:
+            return sprites[sprite_id]
+        return load_image_safely(path, sprite_id + "_img")
+
+    def prefetch_fish(self, species_id):
+        """Starts loading a species' art in the background."""
+        self.fish_art.prefetch(species_id)
+
+    def get_fish_image(self, species_id):
+        """Returns the surface for a species id, or None if it's missing."""
+        return self.fish_art.get(species_id)
+
+    def scaled(self, key, image, size, fit=False):
+        """Returns `image` scaled to `size` (or fitted inside it if `fit`), cached per resolution."""
+        if image is None:
+            return None
+        return self.scaled_cache.get(key, image, (int(size[0]), int(size[1])), fit)
+
+    def fishing_scene(self, overlay_key, size):
+        """Returns the fishing background with a progress overlay baked in, as one opaque surface.
+
+        the overlays are full-screen and per-pixel alpha, so blending them every
+        frame is the most expensive thing we draw. there are only three of them,
+        so each bg + overlay combination is blended once and then blitted opaque.
+        the vibration moves the whole composite (see go_fish.shake_blit), so
+        there's one composite per overlay and only for the current window size.
+        they're pinned outside the scaled cache: at 4k they're ~33 MB each, and
+        a one-per-offset set evicted itself every few frames.
+        """
+        size = (int(size[0]), int(size[1]))
+        scene = self.fishing_scenes.get((overlay_key, size))
+        if scene is not None:
+            return scene
+        if any(scene_size != size for _, scene_size in self.fishing_scenes):
+            self.fishing_scenes.clear() # window was resized
+        scene = pygame.Surface(size).convert()
+        scene.fill(settings.GREY)
+        background = self.scaled("fishing_bg", self.fishing_bg_img, size)
+        if background:
+            scene.blit(background, (0, 0))
+        overlay = self.scaled(overlay_key, getattr(self, overlay_key + "_img"), size, fit=True)
+        if overlay:
+            scene.blit(overlay, (0, 0))
+        self.fishing_scenes[(overlay_key, size)] = scene
+        return scene
+
+    def cutscene_frame(self, index, size):
+        """Returns cutscene frame `index` scaled for a `size` screen.
+
+        the frames have their own policy instead of going through the scaled
+        cache: 45 of them would push every other variant out on each play and
+        then get rescaled on the next one. each frame is scaled once per
+        resolution and kept, at most CUTSCENE_MAX_HEIGHT tall, so on bigger
+        screens the result is smaller than `size` and the caller stretches it.
+        """
+        width, height = int(size[0]), int(size[1])
+        if height > settings.CUTSCENE_MAX_HEIGHT:
+            width, height = max(1, round(width * settings.CUTSCENE_MAX_HEIGHT / height)), settings.CUTSCENE_MAX_HEIGHT
+        frames = self.cutscene_scaled.get((width, height))
+        if frames is None:
+            self.cutscene_scaled.clear() # window was resized
+            frames = self.cutscene_scaled[(width, height)] = [None] * len(self.cutscene_frames)
+        if frames[index] is None:
+            source, _ = self.cutscene_frames[index]
+            # opaque, in the display format, so it can be stretched straight onto the screen
+            frames[index] = _scale_surface(source, (width, height), False).convert()
+        return frames[index]
+
+    # ---- hot reload ----
+    def reload_for_settings(self, changed):
+        """Reloads the images/sounds whose settings changed and drops their scaled variants.
+
+        `changed` is the set of setting names from live_settings. returns the
+        image names that were invalidated.
+        """
+        invalidated = set()
+        for name, (attr, path_key, loader) in self._reloadable_images().items():
+            if path_key in changed:
+                setattr(self, attr, loader())
+                invalidated.add(name)
+        for species_id in settings.FISH_SPRITE_PATHS:
+            path_key = "FISH_" + species_id.upper() + "_PATH"
+            if path_key in changed:
+                self.fish_art.forget(species_id, getattr(settings, path_key))
+                invalidated.add("fish_" + species_id)
+        if changed & {"WIN_GIF_PATH", "GIF_SPEED_MULTIPLIER"}:
+            self.cutscene_frames = load_gif_frames(settings.WIN_GIF_PATH)
+            invalidated.add("cutscene")
+        if "cutscene" in invalidated or "CUTSCENE_MAX_HEIGHT" in changed:
+            self.cutscene_scaled.clear()
+        for attr, (path_key, volume) in self._reloadable_sounds().items():
+            if path_key in changed:
+                setattr(self, attr, self.load_sound(getattr(settings, path_key), volume))
+
+        if "FISH_ART_CACHE_MB" in changed:
+            self.fish_art.max_bytes = settings.FISH_ART_CACHE_MB * 1024 * 1024
+        if "SCALED_ASSET_CACHE_MB" in changed:
+            self.scaled_cache.max_bytes = settings.SCALED_ASSET_CACHE_MB * 1024 * 1024
+            self.scaled_cache.trim()
+        self.scaled_cache.invalidate(invalidated)
+        if invalidated & {"fishing_bg", "progress_high", "progress_mid", "progress_low"}:
+            self.fishing_scenes.clear()
+        return invalidated
+
+    def _reloadable_images(self):
+        # image name (as used for the scaled cache) -> (attribute, path setting, loader)
+        def image(path_key, name):
+            return lambda: load_image_safely(getattr(settings, path_key), name)
+        return {
+            "menu_bg": ("menu_bg_img", "MENU_BG_PATH", self.load_menu_bg),
+            "play_button": ("play_button_img", "PLAY_BUTTON_PATH", self.load_play_button),
+            "fishing_bg": ("fishing_bg_img", "FISHING_BG_PATH", self.load_fishing_bg),
+            "success": ("success_img", "SUCCESS_IMG_PATH", image("SUCCESS_IMG_PATH", "success_img")),
+            "lose": ("lose_img", "LOSE_IMG_PATH", image("LOSE_IMG_PATH", "lose_img")),
+            "waiting": ("waiting_img", "WAITING_IMG_PATH", image("WAITING_IMG_PATH", "waiting_img")),
+            "bite": ("bite_img", "BITE_IMG_PATH", image("BITE_IMG_PATH", "bite_img")),
+            "progress_high": ("progress_high_img", "PROGRESS_HIGH_IMG_PATH", image("PROGRESS_HIGH_IMG_PATH", "progress_high_img")),
+            "progress_mid": ("progress_mid_img", "PROGRESS_MID_IMG_PATH", image("PROGRESS_MID_IMG_PATH", "progress_mid_img")),
+            "progress_low": ("progress_low_img", "PROGRESS_LOW_IMG_PATH", image("PROGRESS_LOW_IMG_PATH", "progress_low_img")),
+        }
+
+    def _reloadable_sounds(self):
+        # attribute -> (path setting, volume)
+        return {
+            "casting_sound": ("CASTING_SOUND_PATH", 1.0),
+            "bite_sound": ("BITE_SOUND_PATH", 1.0),
+            "reeling_sound": ("REELING_SOUND_PATH", 0.5),
+            "success_sound": ("SUCCESS_SOUND_PATH", 1.0),
+            "lose_sound": ("LOSE_SOUND_PATH", 1.0),
+            "cutscene_sound_1": ("CUTSCENE_SOUND_1_PATH", 1.0),
+            "cutscene_sound_30": ("CUTSCENE_SOUND_30_PATH", 1.0),
+            "cutscene_sound_60": ("CUTSCENE_SOUND_60_PATH", 1.0),
+            "button_click_sound": ("BUTTON_CLICK_SOUND_PATH", 1.0),
+        }
 
 # ---- error handling for sound loading when it fails ----
     def load_sound(self, path, volume=1.0):
-        if not os.path.exists(path): return None
+        if not asset_exists(path): return None
         try:
             sound = pygame.mixer.Sound(path)
             sound.set_volume(volume)
@@ -123,39 +439,29 @@ class Assets:
             return None
 
     def load_menu_bg(self):
+        if manifest_status(settings.MENU_BG_PATH) in BAD_STATUSES:
+            return None
         try:
-            img = pygame.image.load(settings.MENU_BG_PATH).convert()
-            return pygame.transform.scale(img, (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+            return pygame.image.load(settings.MENU_BG_PATH).convert()
         except Exception as e:
             print(f"Error loading menu background: {e}")
             return None
 
     def load_play_button(self):
+        if manifest_status(settings.PLAY_BUTTON_PATH) in BAD_STATUSES:
+            return None
         try:
-            img = pygame.image.load(settings.PLAY_BUTTON_PATH).convert_alpha()
-            # Scale the button to be smaller
-            original_size = img.get_size()
-            scale_factor = 0.5 # 50% of original size
-            new_size = (int(original_size[0] * scale_factor), int(original_size[1] * scale_factor))
-            return pygame.transform.smoothscale(img, new_size)
+            # drawn at PLAY_BUTTON_SCALE of its size, see Layout.play_button_size()
+            return pygame.image.load(settings.PLAY_BUTTON_PATH).convert_alpha()
         except Exception as e:
             print(f"Error loading play button: {e}")
             return None
 
     def load_fishing_bg(self):
+        if manifest_status(settings.FISHING_BG_PATH) in BAD_STATUSES:
+            return None
         try:
-            img = pygame.image.load(settings.FISHING_BG_PATH).convert()
-            return pygame.transform.scale(img, (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+            return pygame.image.load(settings.FISHING_BG_PATH).convert()
         except Exception as e:
             print(f"Error loading fishing background: {e}")
             return None
-
-    def scale_images(self):
-        indicator_max_w = int(settings.SCREEN_WIDTH * 0.8)
-        indicator_max_h = int(settings.SCREEN_HEIGHT * 0.8)
-        self.waiting_img = _safe_scale_image(self.waiting_img, indicator_max_w, indicator_max_h)
-        self.bite_img = _safe_scale_image(self.bite_img, indicator_max_w, indicator_max_h)
-        self.progress_high_img = _safe_scale_image(self.progress_high_img, settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
-        self.progress_mid_img = _safe_scale_image(self.progress_mid_img, settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
-        self.progress_low_img = _safe_scale_image(self.progress_low_img, settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
-        self.progress_low_img = _safe_scale_image(self.progress_low_img, settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
\ No newline at end of file
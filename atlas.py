@@ -0,0 +1,120 @@
+import json
+import os
+import pygame
+import settings
+
+# texture atlas for the ui indicator sprites
+# build step (run once whenever the art changes):
+#     python atlas.py
+# packs every sprite in settings.ATLAS_SPRITES into one or a few png sheets and
+# writes an index of sub-rects next to them. at runtime load_atlas() opens the
+# sheets once and hands out subsurfaces by sprite id.
+
+# pixels between sprites. sprites are cut out with subsurface() before anything
+# scales them, so scaling never sees a neighbour. the gap is only for code that
+# samples the sheet itself (rotating or transforming a region of it)
+ATLAS_PADDING = 2
+
+# ---- shelf packing ----
+def pack_rects(sizes, max_w, max_h, padding=ATLAS_PADDING):
+    """Packs (id, w, h) entries into shelves. Returns (placements, sheet_sizes).
+
+    placements maps id -> (sheet_index, x, y, w, h). tallest sprites go first so
+    each shelf wastes as little height as possible.
+    """
+    placements = {}
+    sheet_sizes = []
+    sheet = -1
+    x = y = shelf_h = used_w = 0
+
+    for sprite_id, w, h in sorted(sizes, key=lambda s: (-s[2], -s[1])):
+        if w + padding > max_w or h + padding > max_h:
+            raise ValueError(f"Sprite '{sprite_id}' ({w}x{h}) does not fit in a {max_w}x{max_h} sheet")
+        # start a new shelf when this row is full
+        if sheet >= 0 and x + w + padding > max_w:
+            x = 0
+            y += shelf_h
+            shelf_h = 0
+        # start a new sheet when there are no shelves left
+        if sheet < 0 or y + h + padding > max_h:
+            if sheet >= 0:
+                sheet_sizes.append((used_w, y + shelf_h))
+            sheet += 1
+            x = y = shelf_h = used_w = 0
+
+        placements[sprite_id] = (sheet, x, y, w, h)
+        x += w + padding
+        shelf_h = max(shelf_h, h + padding)
+        used_w = max(used_w, x)
+
+    if sheet >= 0:
+        sheet_sizes.append((used_w, y + shelf_h))
+    return placements, sheet_sizes
+
+# ---- build step ----
+def build_atlas(sprites=None, out_dir=None, max_size=None):
+    """Loads the source pngs, packs them and writes the sheets plus the json index."""
+    sprites = sprites if sprites is not None else settings.ATLAS_SPRITES
+    out_dir = out_dir or os.path.dirname(settings.ATLAS_INDEX_PATH)
+    max_size = max_size or settings.ATLAS_MAX_SHEET_SIZE
+
+    images = {}
+    for sprite_id, path in sprites.items():
+        try:
+            images[sprite_id] = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"[SKIP] {sprite_id}: {path} ({e})")
+
+    placements, sheet_sizes = pack_rects(
+        [(sprite_id, *img.get_size()) for sprite_id, img in images.items()], max_size, max_size
+    )
+
+    sheets = [pygame.Surface(size, pygame.SRCALPHA) for size in sheet_sizes]
+    for sheet in sheets:
+        sheet.fill((0, 0, 0, 0))
+    for sprite_id, (sheet_index, x, y, _, _) in placements.items():
+        sheets[sheet_index].blit(images[sprite_id], (x, y))
+
+    sheet_files = []
+    for i, sheet in enumerate(sheets):
+        filename = f"atlas_{i}.png"
+        pygame.image.save(sheet, os.path.join(out_dir, filename))
+        sheet_files.append(filename)
+
+    index = {
+        "sheets": sheet_files,
+        "sprites": {sprite_id: list(rect) for sprite_id, rect in placements.items()},
+    }
+    with open(os.path.join(out_dir, os.path.basename(settings.ATLAS_INDEX_PATH)), "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+
+    print(f"Packed {len(placements)} sprites into {len(sheets)} sheet(s) in {out_dir}")
+    return index
+
+# ---- runtime loading ----
+def load_atlas(index_path=None):
+    """Loads the atlas sheets and returns a dict of sprite id -> subsurface.
+
+    returns an empty dict if the atlas hasn't been built, so callers can fall back
+    to loading the individual files.
+    """
+    index_path = index_path or settings.ATLAS_INDEX_PATH
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        directory = os.path.dirname(index_path)
+        sheets = [pygame.image.load(os.path.join(directory, name)).convert_alpha() for name in index["sheets"]]
+    except (OSError, ValueError, KeyError, pygame.error) as e:
+        print(f"Error loading texture atlas {index_path}: {e}")
+        return {}
+
+    return {
+        sprite_id: sheets[sheet_index].subsurface(pygame.Rect(x, y, w, h))
+        for sprite_id, (sheet_index, x, y, w, h) in index["sprites"].items()
+    }
+
+if __name__ == "__main__":
+    pygame.init()
+    build_atlas()
@@ -0,0 +1,273 @@
+import collections
+import os
+import random
+import sys
+import time
+import pygame
+import settings
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+try:
+    import resource
+except ImportError: # windows
+    resource = None
+
+# scripted players for load and soak testing.
+# a bot decides the reel input for the catch minigame from what it can "see"
+# (catch bar and fish positions) and clicks its way through the rest of the
+# state machine by posting the same mouse events a player would.
+#
+# soak test, headless and as fast as the machine allows:
+#     python go_fish.py --headless --uncapped --bot pd --soak-minutes 180
+
+# ---- base bot ----
+class Bot:
+    """Base class for bot players. Subclasses implement wants_reel()."""
+    name = "bot"
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.state = None
+        self.state_entered_ticks = 0
+        self.think_time_ms = 0
+        self.bite_click_ticks = None
+
+        self.sessions = 0
+        self.wins = 0
+        self.losses = 0
+
+    def wants_reel(self, minigame, gs):
+        """Returns True to hold the reel for this frame."""
+        raise NotImplementedError("Subclasses must implement wants_reel()")
+
+    def on_new_catch(self, minigame):
+        """Called once when a new FishingMinigame starts."""
+        pass
+
+    # ---- state machine driving ----
+    def drive(self, gs, buttons):
+        """Posts input events for the non-fishing screens. Call once per frame.
+
+        `buttons` is the current scene's button rects by name ('play',
+        'try_again', 'exit', see scenes.Scene.buttons).
+        """
+        now = gs.ticks()
+        if gs.game_state != self.state:
+            self.enter_state(gs, gs.game_state, now)
+        if now - self.state_entered_ticks < self.think_time_ms:
+            return
+
+        if self.state == 'menu':
+            self.click(buttons.get('play'))
+        elif self.state == 'waiting_for_bite':
+            if gs.show_bite_indicator:
+                if self.bite_click_ticks is None:
+                    self.bite_click_ticks = now + self.bite_reaction_ms()
+                if now >= self.bite_click_ticks:
+                    self.click(pygame.Rect(0, 0, 1, 1))
+        elif self.state == 'won':
+            self.click(pygame.Rect(0, 0, 1, 1))
+        elif self.state == 'lost':
+            self.click(buttons.get('try_again') if self.rng.random() < 0.7 else buttons.get('exit'))
+
+    def enter_state(self, gs, state, now):
+        if state == 'fishing':
+            self.sessions += 1
+            self.on_new_catch(gs.minigame)
+        elif state == 'won':
+            self.wins += 1
+        elif state == 'lost':
+            self.losses += 1
+        self.state = state
+        self.state_entered_ticks = now
+        self.bite_click_ticks = None
+        # how long the bot "looks at" a screen before clicking
+        if state == 'waiting_for_bite':
+            self.think_time_ms = 0 # reaction time is measured from the bite instead
+        else:
+            self.think_time_ms = self.rng.randint(*settings.BOT_THINK_TIME_MS)
+
+    def bite_reaction_ms(self):
+        """How long after the bite indicator shows up the bot clicks."""
+        return 0
+
+    def click(self, rect):
+        if rect is None:
+            return
+        # press and release, like a player. reel_input tracks the mouse button, so a
+        # lone press would leave it held into the catch
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=rect.center))
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=rect.center))
+        # make sure the bot only clicks once per screen
+        self.think_time_ms = float("inf")
+
+# ---- reel controllers ----
+class PDBot(Bot):
+    """Proportional-derivative controller on the catch bar / fish offset."""
+    name = "pd"
+
+    def __init__(self, seed=None, kp=1.0, kd=8.0):
+        super().__init__(seed)
+        self.kp = kp
+        self.kd = kd
+
+    def control(self, bar_center, bar_vel, fish_center, fish_vel):
+        # positive error = bar is below the fish, so reel up
+        error = bar_center - fish_center
+        error_rate = bar_vel - fish_vel
+        return self.kp * error + self.kd * error_rate > 0
+
+    def wants_reel(self, minigame, gs):
+        bar_center = minigame.catch_bar_y + gs.catch_bar_h / 2
+        fish_center = minigame.fish_y + gs.fish_h / 2
+        return self.control(bar_center, minigame.catch_bar_vel, fish_center, minigame.fish_vel)
+
+class HumanBot(PDBot):
+    """A PD controller that sees the game late and noisily, and sometimes zones out."""
+    name = "human"
+
+    def __init__(self, seed=None, reaction_frames=12, position_noise=6.0, lapse_chance=0.005):
+        super().__init__(seed, kp=0.8, kd=5.0)
+        self.reaction_frames = reaction_frames
+        self.position_noise = position_noise
+        self.lapse_chance = lapse_chance
+        self.observations = collections.deque(maxlen=reaction_frames + 1)
+        self.lapse_frames = 0
+        self.last_decision = False
+
+    def on_new_catch(self, minigame):
+        self.observations.clear()
+        self.lapse_frames = 0
+
+    def bite_reaction_ms(self):
+        return self.rng.randint(200, 450)
+
+    def wants_reel(self, minigame, gs):
+        noise = self.position_noise * gs.physics_scale
+        self.observations.append((
+            minigame.catch_bar_y + gs.catch_bar_h / 2 + self.rng.gauss(0, noise),
+            minigame.catch_bar_vel,
+            minigame.fish_y + gs.fish_h / 2 + self.rng.gauss(0, noise),
+            minigame.fish_vel,
+        ))
+        # attention lapse: keep doing whatever we were doing
+        if self.lapse_frames > 0:
+            self.lapse_frames -= 1
+            return self.last_decision
+        if self.rng.random() < self.lapse_chance:
+            self.lapse_frames = self.rng.randint(10, 40)
+
+        # act on what we saw `reaction_frames` ago
+        self.last_decision = self.control(*self.observations[0])
+        return self.last_decision
+
+class RandomMasherBot(Bot):
+    """Holds and releases the reel for random stretches, ignoring the fish."""
+    name = "random"
+
+    def __init__(self, seed=None, hold_chance=0.5):
+        super().__init__(seed)
+        self.hold_chance = hold_chance
+        self.frames_left = 0
+        self.holding = False
+
+    def wants_reel(self, minigame, gs):
+        if self.frames_left <= 0:
+            self.holding = self.rng.random() < self.hold_chance
+            self.frames_left = self.rng.randint(1, 20)
+        self.frames_left -= 1
+        return self.holding
+
+BOT_TYPES = {bot.name: bot for bot in (PDBot, HumanBot, RandomMasherBot)}
+
+def make_bot(name, seed=None):
+    return BOT_TYPES[name](seed=seed)
+
+# ---- soak monitoring ----
+def _rss_mb():
+    """Resident memory of this process in MB, peak RSS if that's all there is, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f: # linux
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    if resource is not None:
+        # kilobytes on linux, bytes on macos
+        divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor
+    return None
+
+class SoakMonitor:
+    """Samples frame times and memory per interval, to spot leaks and slowdowns."""
+    def __init__(self, bot, assets, duration_s=None, interval_s=None, csv_path=None):
+        self.bot = bot
+        self.assets = assets
+        self.duration_s = duration_s
+        self.interval_s = interval_s or settings.SOAK_REPORT_INTERVAL_S
+        self.csv_path = csv_path
+
+        self.start = time.perf_counter()
+        self.last_frame = self.start
+        self.interval_start = self.start
+        self.frame_times = []
+        self.samples = []
+
+        if self.csv_path:
+            with open(self.csv_path, "w") as f:
+                f.write("elapsed_s,frames,mean_ms,p99_ms,max_ms,rss_mb,cache_mb,sessions,wins,losses\n")
+
+    def end_frame(self):
+        """Call once per frame. Returns False once the soak duration is over."""
+        now = time.perf_counter()
+        self.frame_times.append(now - self.last_frame)
+        self.last_frame = now
+        if now - self.interval_start >= self.interval_s:
+            self.sample(now)
+        return self.duration_s is None or now - self.start < self.duration_s
+
+    def sample(self, now):
+        times = sorted(self.frame_times)
+        rss_mb = _rss_mb()
+        sample = {
+            "elapsed_s": round(now - self.start, 1),
+            "frames": len(times),
+            "mean_ms": round(1000 * sum(times) / len(times), 3) if times else 0.0,
+            "p99_ms": round(1000 * times[int(len(times) * 0.99)], 3) if times else 0.0,
+            "max_ms": round(1000 * times[-1], 3) if times else 0.0,
+            "rss_mb": round(rss_mb, 1) if rss_mb is not None else None,
+            "cache_mb": round(self.assets.scaled_cache.total_bytes / (1024 * 1024), 1),
+            "sessions": self.bot.sessions,
+            "wins": self.bot.wins,
+            "losses": self.bot.losses,
+        }
+        self.samples.append(sample)
+        self.frame_times = []
+        self.interval_start = now
+
+        print("[soak] " + " ".join(f"{k}={v}" for k, v in sample.items()))
+        if self.csv_path:
+            with open(self.csv_path, "a") as f:
+                f.write(",".join("" if v is None else str(v) for v in sample.values()) + "\n")
+
+    def report(self):
+        if self.frame_times:
+            self.sample(time.perf_counter())
+        print("--- Soak Report ---")
+        print(f"bot: {self.bot.name}, sessions: {self.bot.sessions} "
+              f"(won {self.bot.wins}, lost {self.bot.losses})")
+        if len(self.samples) >= 2:
+            # skip the first interval, it includes warm-up (asset scaling etc)
+            first = self.samples[1] if len(self.samples) > 2 else self.samples[0]
+            last = self.samples[-1]
+            if first["rss_mb"] is not None and last["rss_mb"] is not None:
+                print(f"memory: {first['rss_mb']} MB -> {last['rss_mb']} MB "
+                      f"({last['rss_mb'] - first['rss_mb']:+.1f} MB)")
+            if first["mean_ms"] > 0:
+                drift = 100.0 * (last["mean_ms"] - first["mean_ms"]) / first["mean_ms"]
+                print(f"frame time: {first['mean_ms']} ms -> {last['mean_ms']} ms ({drift:+.1f}%)")
+        print("-------------------")
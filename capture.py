@@ -0,0 +1,272 @@
+import glob
+import json
+import multiprocessing
+import os
+import queue
+import struct
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+import settings
+
+# gameplay recording, for trailers and for reproducing rendering bugs.
+#     python go_fish.py --capture out/                     # png sequence, real time
+#     python go_fish.py --capture out/ --capture-format raw
+#     python go_fish.py --headless --bot pd --capture out/ --capture-fps 60 --capture-frames 3600
+# the game thread only copies the flipped screen into a free shared memory slot
+# (well under a millisecond at 720p) and queues the slot number. worker
+# processes do the pixel swizzling, png encoding and disk writes, so none of
+# that holds the game's GIL. if every slot is still busy the frame is dropped
+# and counted, the game loop never waits for the encoder.
+# with --capture-fps the game runs on a FixedStepClock instead: every frame is
+# exactly 1000/fps ms of game time, nothing is dropped (the loop waits for a
+# slot instead), and headless bot runs record faster than real time.
+# the workers are forked (see FrameCapture), so recording needs a platform with
+# fork. on windows --capture is refused up front.
+
+# spawn would re-run go_fish.py, game and all, in every worker
+CAPTURE_SUPPORTED = "fork" in multiprocessing.get_all_start_methods()
+
+# ---- fixed timestep ----
+class FixedStepClock:
+    """Game time that advances by exactly one frame per advance() call."""
+    def __init__(self, fps):
+        self.fps = fps
+        self.frame = 0
+
+    def ticks(self):
+        """Stands in for pygame.time.get_ticks()."""
+        return int(self.frame * 1000 / self.fps)
+
+    def advance(self):
+        self.frame += 1
+
+# ---- encoding (worker side) ----
+def unpadded(pixels, width, height, pitch):
+    """A 32 bit surface buffer without the padding at the end of each row (if there is any)."""
+    if pitch == width * 4:
+        return pixels
+    return b"".join(pixels[y * pitch:y * pitch + width * 4] for y in range(height))
+
+def _png_chunk(tag, body):
+    return struct.pack(">I", len(body)) + tag + body + struct.pack(">I", zlib.crc32(tag + body))
+
+def encode_png(pixels, width, height, pitch, shifts, level):
+    """Encodes a 32 bit surface buffer as an 8 bit rgb png."""
+    rgb = bytearray(width * height * 3)
+    pixels = unpadded(pixels, width, height, pitch)
+    # little endian, so a channel shifted by n bits is byte n / 8 of each pixel
+    for channel, shift in enumerate(shifts[:3]):
+        rgb[channel::3] = pixels[shift // 8::4]
+
+    stride = width * 3
+    scanlines = bytearray((stride + 1) * height) # each row starts with filter type 0 (none)
+    for y in range(height):
+        start = y * (stride + 1) + 1
+        scanlines[start:start + stride] = rgb[y * stride:(y + 1) * stride]
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(scanlines, level)) + _png_chunk(b"IEND", b""))
+
+def _capture_worker(jobs, done, out_dir, fmt, level):
+    """Worker process: encodes and writes the frames named by `jobs` until it gets None."""
+    slots = {} # shared memory name -> SharedMemory, attached on first use
+    raw_file = None
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            slot, shm_name, frame_no, index, size, pitch, shifts = job
+            if shm_name not in slots:
+                slots[shm_name] = shared_memory.SharedMemory(name=shm_name)
+                # only the game process owns the slots. without this the worker's own
+                # resource tracker unlinks them when the worker exits
+                resource_tracker.unregister(slots[shm_name]._name, "shared_memory")
+            width, height = size
+            pixels = slots[shm_name].buf[:pitch * height]
+            try:
+                if fmt == "png":
+                    data = encode_png(pixels, width, height, pitch, shifts, level)
+                    with open(os.path.join(out_dir, f"frame_{frame_no:06d}.png"), "wb") as f:
+                        f.write(data)
+                    nbytes = len(data)
+                else:
+                    # raw frames land at their own offset, so workers can write in any order.
+                    # rawvideo has no row padding, so the stream is width * 4 bytes per row
+                    frame = unpadded(pixels, width, height, pitch)
+                    if raw_file is None:
+                        raw_file = os.open(os.path.join(out_dir, "capture.raw"),
+                                           os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+                    os.lseek(raw_file, index * width * height * 4, os.SEEK_SET)
+                    nbytes = 0
+                    while nbytes < len(frame):
+                        nbytes += os.write(raw_file, frame[nbytes:])
+                    del frame # may be a view of the shared memory, which has to be released below
+            finally:
+                pixels.release()
+            done.put((slot, nbytes))
+    finally:
+        if raw_file is not None:
+            os.close(raw_file)
+        for shm in slots.values():
+            shm.close()
+
+# ---- capture (game side) ----
+class FrameCapture:
+    """Copies flipped frames into shared memory slots for the worker processes."""
+    def __init__(self, out_dir, fmt="png", workers=None, slots=None, fixed_fps=None):
+        if fmt not in ("png", "raw"):
+            raise ValueError(f"Unknown capture format '{fmt}'")
+        if not CAPTURE_SUPPORTED:
+            raise RuntimeError("Capture needs the fork start method, which this platform doesn't have")
+        os.makedirs(out_dir, exist_ok=True)
+        # a shorter recording into the same folder would otherwise leave the old
+        # run's later frames (or raw bytes) after the new ones
+        stale = glob.glob(os.path.join(out_dir, "frame_*.png"))
+        stale += [path for path in (os.path.join(out_dir, "capture.raw"), os.path.join(out_dir, "capture.json"))
+                  if os.path.exists(path)]
+        for path in stale:
+            os.remove(path)
+        if stale:
+            print(f"Capture: removed {len(stale)} file(s) of an earlier recording from {out_dir}")
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.fixed_fps = fixed_fps
+        self.slot_count = slots or settings.CAPTURE_SLOTS
+        worker_count = workers or settings.CAPTURE_WORKERS or max(1, min(4, (os.cpu_count() or 2) - 1))
+
+        # fork, not spawn: go_fish.py runs the game at import time. FrameCapture is
+        # created before pygame.init() so nothing but this thread exists yet.
+        context = multiprocessing.get_context("fork")
+        self.jobs = context.Queue()
+        self.done = context.Queue()
+        self.workers = [
+            context.Process(target=_capture_worker, name=f"capture-{i}", daemon=True,
+                            args=(self.jobs, self.done, out_dir, fmt, settings.CAPTURE_PNG_LEVEL))
+            for i in range(worker_count)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+        self.shm = [] # allocated on the first frame, once the screen size is known
+        self.free_slots = []
+        self.size = None
+        self.pitch = None
+        self.shifts = None
+        self.masks = None
+
+        # --- metrics ---
+        self.frame_no = 0 # every frame offered, captured or not
+        self.captured = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.dropped = 0
+        self.dropped_resized = 0
+        self.frame_ticks = [] # game time of each captured frame
+        self.max_in_flight = 0
+
+    def _allocate(self, surface):
+        self.size = surface.get_size()
+        self.pitch = surface.get_pitch()
+        self.shifts = surface.get_shifts()
+        self.masks = surface.get_masks()
+        for _ in range(self.slot_count):
+            self.shm.append(shared_memory.SharedMemory(create=True, size=self.pitch * self.size[1]))
+        self.free_slots = list(range(self.slot_count))
+
+    def _collect_done(self, block=False):
+        try:
+            while True:
+                slot, nbytes = self.done.get(block)
+                block = False
+                self.free_slots.append(slot)
+                self.written += 1
+                self.bytes_written += nbytes
+        except queue.Empty:
+            pass
+
+    def capture(self, surface, ticks):
+        """Call right after pygame.display.flip(). Never blocks unless running at a fixed step."""
+        frame_no = self.frame_no
+        self.frame_no += 1
+        if not self.shm:
+            if surface.get_bitsize() != 32:
+                if not self.dropped:
+                    print(f"Capture needs a 32 bit display surface, got {surface.get_bitsize()} bit")
+                self.dropped += 1
+                return False
+            self._allocate(surface)
+        if surface.get_size() != self.size or surface.get_pitch() != self.pitch:
+            # the slots (and a raw stream) are sized for the first frame
+            if not self.dropped_resized:
+                print(f"Capture: window resized from {self.size[0]}x{self.size[1]}, dropping frames until it is back")
+            self.dropped_resized += 1
+            self.dropped += 1
+            return False
+
+        self._collect_done()
+        if not self.free_slots and self.fixed_fps:
+            self._collect_done(block=True) # game time is simulated, so waiting costs nothing
+        if not self.free_slots:
+            self.dropped += 1
+            return False
+
+        slot = self.free_slots.pop()
+        pixels = surface.get_buffer() # locks the surface until released
+        try:
+            self.shm[slot].buf[:self.pitch * self.size[1]] = memoryview(pixels)
+        finally:
+            del pixels
+        self.jobs.put((slot, self.shm[slot].name, frame_no, self.captured, self.size, self.pitch, self.shifts))
+        self.captured += 1
+        self.frame_ticks.append(ticks)
+        self.max_in_flight = max(self.max_in_flight, self.slot_count - len(self.free_slots))
+        return True
+
+    def close(self):
+        """Waits for the workers to finish the queued frames and writes capture.json."""
+        for _ in self.workers:
+            self.jobs.put(None)
+        while self.written < self.captured and any(worker.is_alive() for worker in self.workers):
+            try:
+                slot, nbytes = self.done.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            self.written += 1
+            self.bytes_written += nbytes
+        for worker in self.workers:
+            worker.join()
+        for shm in self.shm:
+            shm.close()
+            shm.unlink()
+
+        manifest = {
+            "format": self.fmt,
+            "size": list(self.size) if self.size else None,
+            "fps": self.fixed_fps, # None: real time, see frame_ticks
+            "frames": self.written,
+            "dropped": self.dropped,
+            "dropped_resized": self.dropped_resized,
+            "frame_ticks": self.frame_ticks,
+        }
+        if self.fmt == "raw" and self.size:
+            # byte order of a 32 bit pixel, as ffmpeg names it (e.g. bgr0)
+            channels = ["0"] * 4
+            for shift, name in zip(self.shifts[:3], "rgb"):
+                channels[shift // 8] = name
+            if self.masks[3]:
+                channels[self.shifts[3] // 8] = "a"
+            manifest["pix_fmt"] = "".join(channels)
+        with open(os.path.join(self.out_dir, "capture.json"), "w") as f:
+            json.dump(manifest, f)
+        self.report(manifest)
+
+    def report(self, manifest):
+        print("--- Capture ---")
+        print(f"{self.written} frames ({self.bytes_written / (1024 * 1024):.1f} MB) written to {self.out_dir}, "
+              f"{self.dropped} dropped, at most {self.max_in_flight}/{self.slot_count} slots in flight")
+        if self.fmt == "raw" and self.size:
+            print(f"ffmpeg -f rawvideo -pix_fmt {manifest['pix_fmt']} -s {self.size[0]}x{self.size[1]} "
+                  f"-r {self.fixed_fps or settings.MAX_FRAME_RATE} -i {os.path.join(self.out_dir, 'capture.raw')} out.mp4")
+        print("---------------")
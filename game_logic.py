@@ -14,58 +14,61 @@ class Minigame:
 # ---- inheritance (parent)----
 class Fish:
     """Base class for all fish types."""
-    def __init__(self, name, difficulty, base_score, weight_mult, asset_attr):
+    def __init__(self, name, difficulty, base_score, weight_mult, species_id):
         self.name = name
         self.difficulty = difficulty
         self.base_score = base_score
         self.weight_mult = weight_mult
-        self.asset_attr = asset_attr
+        self.species_id = species_id # key into settings.FISH_SPRITE_PATHS / Assets.fish_art
         
         # stats randomization based on difficulty
         base_weight = 2.0 * difficulty
         self.weight = round(random.uniform(base_weight * 0.8, base_weight * 1.5), 2)
         self.size = round(random.uniform(5.0 * difficulty, 8.0 * difficulty), 1)
         
-        # physics modifiers based on difficulty
-        self.speed_modifier = 0.5 + (difficulty * 0.15)
-        self.progress_gain_modifier = max(0.5, 1.5 - (difficulty * 0.1))
-        self.progress_loss_modifier = 0.5 + (difficulty * 0.1)
+        # physics modifiers based on difficulty (base + difficulty * per level, see settings)
+        self.speed_modifier = settings.FISH_SPEED_MOD_BASE + (difficulty * settings.FISH_SPEED_MOD_PER_LEVEL)
+        self.progress_gain_modifier = max(settings.FISH_GAIN_MOD_MIN,
+                                          settings.FISH_GAIN_MOD_BASE + (difficulty * settings.FISH_GAIN_MOD_PER_LEVEL))
+        self.progress_loss_modifier = settings.FISH_LOSS_MOD_BASE + (difficulty * settings.FISH_LOSS_MOD_PER_LEVEL)
 
     def get_score(self):
         return int(self.base_score + (self.weight * self.weight_mult))
 
 # --- fish types (childrens) ---
 class Carp(Fish):
-    def __init__(self): super().__init__("Carp", 1, 50, 10, "fish_carp_img")
+    def __init__(self): super().__init__("Carp", 1, 50, 10, "carp")
 class Sardine(Fish):
-    def __init__(self): super().__init__("Sardine", 1, 60, 12, "fish_sardine_img")
+    def __init__(self): super().__init__("Sardine", 1, 60, 12, "sardine")
 class Bream(Fish):
-    def __init__(self): super().__init__("Bream", 2, 80, 15, "fish_bream_img")
+    def __init__(self): super().__init__("Bream", 2, 80, 15, "bream")
 class Bass(Fish):
-    def __init__(self): super().__init__("Bass", 3, 120, 20, "fish_bass_img")
+    def __init__(self): super().__init__("Bass", 3, 120, 20, "bass")
 class Trout(Fish):
-    def __init__(self): super().__init__("Trout", 3, 130, 22, "fish_trout_img")
+    def __init__(self): super().__init__("Trout", 3, 130, 22, "trout")
 class Salmon(Fish):
-    def __init__(self): super().__init__("Salmon", 4, 200, 25, "fih")
+    def __init__(self): super().__init__("Salmon", 4, 200, 25, "salmon")
 class Tuna(Fish):
-    def __init__(self): super().__init__("Tuna", 5, 300, 30, "fish_tuna_img")
+    def __init__(self): super().__init__("Tuna", 5, 300, 30, "tuna")
 class Pufferfish(Fish):
     def __init__(self): super().__init__("Pufferfish", 6, 400, 35, "pufferfish")
 class Shark(Fish):
-    def __init__(self): super().__init__("Shark", 8, 800, 50, "fish_shark_img")
+    def __init__(self): super().__init__("Shark", 8, 800, 50, "shark")
 class Legend(Fish):
-    def __init__(self): super().__init__("Legend", 10, 2000, 100, "fish_legend_img")
+    def __init__(self): super().__init__("Legend", 10, 2000, 100, "legend")
 
 ALL_FISH_CLASSES = [Carp, Sardine, Bream, Bass, Trout, Salmon, Tuna, Pufferfish, Shark, Legend]
 
 # ----- polymorphism -----
 class FishingMinigame(Minigame):
-    def __init__(self, gs):
+    def __init__(self, gs, fish_class=None):
         super().__init__(gs)
         # the part where polyqmorphism happens (choosing a fish randomly from the list of fish classes)
-        FishClass = random.choice(ALL_FISH_CLASSES)
+        FishClass = fish_class or random.choice(ALL_FISH_CLASSES)
         
         self.fish = FishClass()
+        # start loading the art now so it's ready for the won screen
+        gs.assets.prefetch_fish(self.fish.species_id)
         
         # fish stats to minigame variables
         self.current_fish_tier = "Difficulty " + str(self.fish.difficulty)
@@ -87,17 +90,31 @@ class FishingMinigame(Minigame):
         self.catch_progress = 10 # starting progress bar
         self.first_hit_made = False
 
+    def rescale(self, old_layout, gs):
+        """Moves the bar and fish onto the new track after the window was resized."""
+        ratio = gs.track_h / old_layout.track_h
+        self.catch_bar_y = gs.track_y + (self.catch_bar_y - old_layout.track_y) * ratio
+        self.fish_y = gs.track_y + (self.fish_y - old_layout.track_y) * ratio
+        self.fish_target_y = gs.track_y + (self.fish_target_y - old_layout.track_y) * ratio
+        self.catch_bar_vel *= ratio
+        self.fish_vel *= ratio
+
     def update(self, gs):
         """Handles all game logic for the 'fishing' state."""
-        # player input
-        keys = pygame.key.get_pressed()
-        mouse_pressed = pygame.mouse.get_pressed()[0]
+        # player input (or a bot, see bots.py): how much of this tick the reel was held
+        if gs.bot is not None:
+            reel_fraction = 1.0 if gs.bot.wants_reel(self, gs) else 0.0
+        else:
+            reel_fraction = gs.reel_input.tick()
         
-        if keys[pygame.K_SPACE] or mouse_pressed:
-            self.catch_bar_vel += settings.CATCH_BAR_SPEED_UP
+        # physics constants are tuned for 720p, scale them to the current track
+        scale = gs.physics_scale
+
+        # thrust in proportion to how long the reel was held, so short taps still count
+        self.catch_bar_vel += settings.CATCH_BAR_SPEED_UP * scale * reel_fraction
         
         # apply physics to the catch bar (gravity)
-        self.catch_bar_vel += settings.CATCH_BAR_GRAVITY
+        self.catch_bar_vel += settings.CATCH_BAR_GRAVITY * scale
         self.catch_bar_y += self.catch_bar_vel
 
         # keep catch bar within the track
@@ -118,9 +135,9 @@ class FishingMinigame(Minigame):
 
             # accelerate towards the target
             if self.fish_y < self.fish_target_y:
-                self.fish_vel += settings.FISH_ACCEL * self.current_fish_speed_modifier
+                self.fish_vel += settings.FISH_ACCEL * self.current_fish_speed_modifier * scale
             else:
-                self.fish_vel -= settings.FISH_ACCEL * self.current_fish_speed_modifier
+                self.fish_vel -= settings.FISH_ACCEL * self.current_fish_speed_modifier * scale
 
         # check for collision (overlap)
         catch_bar_rect = pygame.Rect(gs.track_x, self.catch_bar_y, gs.track_w, gs.catch_bar_h)
@@ -167,21 +184,16 @@ class FishingMinigame(Minigame):
             if gs.assets.lose_sound:
                 gs.assets.lose_sound.play()
             # stop background music
-            pygame.mixer.music.stop()
-            gs.current_music = None
+            gs.stop_bgm()
 
         if self.catch_progress >= 100:
             if gs.assets.cutscene_frames:
-                gs.game_state = 'cutscene'
-                gs.cutscene_frame_index = 0
-                gs.cutscene_last_frame_time = pygame.time.get_ticks()
                 if gs.assets.reeling_sound:
                     gs.assets.reeling_sound.stop()
-                if gs.assets.cutscene_sound_1:
-                    gs.assets.cutscene_sound_1.play()
                 # stop music during cutscene
-                pygame.mixer.music.stop()
-                gs.current_music = None
+                gs.stop_bgm()
+                # frames and sound cues run on the scheduler from here
+                gs.start_cutscene()
             else:
                 gs.game_state = 'won'
                 if gs.assets.success_sound:
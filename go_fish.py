@@ -1,60 +1,132 @@
 import pygame
-import sys
 import random
 import os
 import settings
-import traceback
-from assets import Assets, _GIF_SUPPORT
+import argparse
+from assets import Assets, asset_exists, _GIF_SUPPORT
 from game_logic import FishingMinigame
+from layout import Layout, parse_resolution
+from pacing import FramePacer
+from reel_input import ReelInput
+from scheduler import Scheduler
+from scenes import Scene, SceneManager
+from water import WaterEffects
+import bots
+import live_settings
+from telemetry import Telemetry
+from capture import CAPTURE_SUPPORTED, FrameCapture, FixedStepClock
+import savestate
+
+# --- command line ---
+arg_parser = argparse.ArgumentParser(description="Go Fish")
+arg_parser.add_argument("--resolution", help="window size as WxH, e.g. 3840x2160 or 800x480")
+arg_parser.add_argument("--fullscreen", action="store_true", default=settings.FULLSCREEN)
+arg_parser.add_argument("--settings-profile",
+                        help="json file of setting overrides (e.g. from tuner.py), reloaded when it changes")
+# bots / soak testing
+arg_parser.add_argument("--bot", choices=sorted(bots.BOT_TYPES), help="let a bot play (see bots.py)")
+arg_parser.add_argument("--bot-seed", type=int, default=None)
+arg_parser.add_argument("--headless", action="store_true", help="use the SDL dummy video/audio drivers")
+arg_parser.add_argument("--uncapped", action="store_true", help="no frame rate cap or idle waits in any state")
+arg_parser.add_argument("--soak-minutes", type=float, default=None, help="quit after this long")
+arg_parser.add_argument("--soak-csv", default=None, help="write per-interval soak samples to this csv")
+# telemetry and save states are off unless asked for here or in settings.py
+arg_parser.add_argument("--telemetry", action="store_true", help="record session telemetry (see telemetry.py)")
+arg_parser.add_argument("--telemetry-db", default=None, help="sqlite file for session telemetry (implies --telemetry)")
+arg_parser.add_argument("--no-telemetry", action="store_true", help="even if settings.TELEMETRY_ENABLED is set")
+# save states (see savestate.py)
+arg_parser.add_argument("--resume", action="store_true", help="carry on from the last save state (and keep writing them)")
+arg_parser.add_argument("--save-state", default=None,
+                        help="write save states to this file while playing (default: settings.SAVE_STATE_PATH)")
+arg_parser.add_argument("--no-save-state", action="store_true", help="even if settings.SAVE_STATES_ENABLED is set")
+# recording (see capture.py)
+arg_parser.add_argument("--capture", metavar="DIR", help="record every frame into this directory")
+arg_parser.add_argument("--capture-format", choices=["png", "raw"], default="png")
+arg_parser.add_argument("--capture-fps", type=int, default=None,
+                        help="run game time at a fixed step of 1000/fps ms per frame (as fast as possible, no drops)")
+arg_parser.add_argument("--capture-frames", type=int, default=None, help="quit after recording this many frames")
+args, _ = arg_parser.parse_known_args()
+if args.capture and not CAPTURE_SUPPORTED:
+    arg_parser.error("--capture needs the fork start method, which this platform doesn't have (try WSL)")
+
+if args.headless:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+if args.uncapped or args.capture_fps:
+    settings.STATE_FRAME_RATES = {state: 0 for state in settings.STATE_FRAME_RATES}
+
+# the profile is applied on top of the command line and then watched for edits
+settings_watcher = None
+if args.settings_profile:
+    settings_watcher = live_settings.SettingsWatcher(args.settings_profile)
+    settings_watcher.load()
+
+# after the profile (so its CAPTURE_* values count) but before pygame.init(), so
+# the encoder processes fork from a single-threaded process
+frame_capture = None
+if args.capture:
+    frame_capture = FrameCapture(args.capture, args.capture_format, fixed_fps=args.capture_fps)
+fixed_clock = FixedStepClock(args.capture_fps) if args.capture_fps else None
 
 # --- initialization ---
 pygame.init()
 pygame.mixer.init() # initialize the sound mixer
 
-# fishing minigame settings
-# fake the minigame size relative to the screen height for better scaling.
-TRACK_H = int(settings.SCREEN_HEIGHT * settings.TRACK_H_RATIO)
-TRACK_W = int(TRACK_H * settings.TRACK_W_RATIO)
-TRACK_X = int(settings.SCREEN_WIDTH * settings.TRACK_X_RATIO)
-TRACK_Y = (settings.SCREEN_HEIGHT - TRACK_H) // 2
+# --- resolution selection ---
+# `--resolution 800x480` > GO_FISH_RESOLUTION=800x480 > settings.SCREEN_WIDTH/HEIGHT
 
-CATCH_BAR_H = int(TRACK_H * settings.CATCH_BAR_H_RATIO)
-FISH_H = int(TRACK_H * settings.FISH_H_RATIO)
+requested = args.resolution or os.environ.get("GO_FISH_RESOLUTION")
+screen_size = parse_resolution(requested) if requested else None
+if requested and not screen_size:
+    print(f"Invalid resolution '{requested}', using {settings.SCREEN_WIDTH}x{settings.SCREEN_HEIGHT}")
+screen_size = screen_size or (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
 
-PROGRESS_BAR_W = int(TRACK_W * settings.PROGRESS_BAR_W_RATIO)
-PROGRESS_BAR_H = TRACK_H
-PROGRESS_BAR_X = TRACK_X + TRACK_W + 15
-PROGRESS_BAR_Y = TRACK_Y
+display_flags = 0
+if args.fullscreen:
+    display_flags |= pygame.FULLSCREEN
+elif settings.RESIZABLE_WINDOW:
+    display_flags |= pygame.RESIZABLE
 
 # --- game setup ---
-screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+screen = pygame.display.set_mode(screen_size, display_flags)
 pygame.display.set_caption("Go Fish")
 clock = pygame.time.Clock()
-
-try:
-    font = pygame.font.Font(settings.FONT_PATH, 40)
-except Exception:
-    font = pygame.font.Font(None, 36)
-
+# the pacer timestamps every event as it is dequeued, the reel input keeps the ones it cares about
+if fixed_clock:
+    # game time for recordings: the reel stamps events itself, see reel_input.py
+    reel_input = ReelInput(clock=fixed_clock.ticks)
+    pacer = FramePacer(clock, on_event=lambda event, stamp: reel_input.handle_event(event))
+else:
+    reel_input = ReelInput()
+    pacer = FramePacer(clock, on_event=reel_input.handle_event)
+water = WaterEffects()
+
+def load_font(size, fallback_size):
+    if not asset_exists(settings.FONT_PATH):
+        return pygame.font.Font(None, fallback_size)
+    try:
+        return pygame.font.Font(settings.FONT_PATH, size)
+    except Exception:
+        return pygame.font.Font(None, fallback_size)
+
+# loads the asset manifest too, so everything below can skip probing files
 assets = Assets()
 
+# geometry + font for the current window size (rebuilt in apply_resolution)
+layout = Layout(*screen.get_size())
+font = load_font(layout.font_size, layout.fallback_font_size)
+
 # --- debug: check loaded assets ---
 # --- error handling for missing fish assets ----
 print("--- Checking Fish Assets ---")
-fish_assets = ["fish_carp_img", "fish_sardine_img", "fish_bream_img", "fish_bass_img", 
-               "fish_trout_img", "fih", "fish_tuna_img", "pufferfish", "fish_shark_img", "fish_legend_img"]
-for attr in fish_assets:
-    if getattr(assets, attr, None) is None:
-        print(f"[MISSING] {attr}")
+# fish art is loaded on demand, so only check that the files are there (the manifest knows without a stat)
+for species_id, path in assets.fish_art.paths.items():
+    if not asset_exists(path):
+        print(f"[MISSING] {species_id}")
     else:
-        print(f"[OK] {attr}")
+        print(f"[OK] {species_id}")
 print("----------------------------")
 
-play_button_rect = None
-debug_button_rect = None
-try_again_button_rect = None
-exit_button_rect = None
-
 # --- block transfer (blit) functions (centering and positioning some of the pngs) ---
 def center_blit(surface, image):
     """Helper function to blit an image to the center of a surface."""
@@ -62,10 +134,17 @@ def center_blit(surface, image):
         rect = image.get_rect(center=(surface.get_width() // 2, surface.get_height() // 2))
         surface.blit(image, rect)
 
-def position_blit(surface, image, x_pos, y_pos):
-    """Helper function to blit an image at a specific position."""
-    if image: # only blit if the image loaded successfully
-        surface.blit(image, (x_pos, y_pos))
+def shake_blit(surface, image, offset):
+    """Blits a full-screen image moved by `offset`, filling the uncovered edges from the unmoved image."""
+    dx, dy = offset
+    surface.blit(image, (dx, dy))
+    w, h = image.get_size()
+    if dx:
+        strip = pygame.Rect(0 if dx > 0 else w + dx, 0, abs(dx), h)
+        surface.blit(image, strip, strip)
+    if dy:
+        strip = pygame.Rect(0, 0 if dy > 0 else h + dy, w, abs(dy))
+        surface.blit(image, strip, strip)
 # --------decorator----- (used for highscore announcements) -----
 def new_highscore_announcer(func):
     def wrapper(instance, new_score):
@@ -89,7 +168,12 @@ class GameState:
         # cutscene variables
         self.cutscene_frames = assets.cutscene_frames
         self.cutscene_frame_index = 0
-        self.cutscene_last_frame_time = 0
+        self.cutscene_frame_start = 0
+
+        # timed events (bite, cutscene frames and sound cues), see scheduler.py
+        self.scheduler = Scheduler()
+        # game time in ms. a capture.FixedStepClock replaces it for fixed timestep recording
+        self.ticks = fixed_clock.ticks if fixed_clock else pygame.time.get_ticks
 
         self.highscore = 0.0
 
@@ -99,19 +183,34 @@ class GameState:
         }
 
         # store constants for easy access in game_logic
-        self.track_x, self.track_y, self.track_w, self.track_h = TRACK_X, TRACK_Y, TRACK_W, TRACK_H
-        self.catch_bar_h, self.fish_h = CATCH_BAR_H, FISH_H
+        self.set_layout(layout)
         self.assets = assets
+
+        # timestamped keyboard/mouse reel input, see reel_input.py
+        self.reel_input = reel_input
+        # a bots.Bot supplies the reel input instead of the keyboard/mouse when set
+        self.bot = None
+        # telemetry.Telemetry records per-session metrics when set
+        self.telemetry = None
         
         self.current_music = None
 
+    def set_layout(self, new_layout):
+        """Copies the geometry game_logic needs from a Layout."""
+        self.layout = new_layout
+        self.track_x, self.track_y, self.track_w, self.track_h = (
+            new_layout.track_x, new_layout.track_y, new_layout.track_w, new_layout.track_h)
+        self.catch_bar_h, self.fish_h = new_layout.catch_bar_h, new_layout.fish_h
+        # physics constants are in 720p pixels per frame
+        self.physics_scale = new_layout.scale
+
     # ---error handling for bgm loading when it fails ----
     def play_bgm(self, track_path):
         """Plays background music, only if it's not already playing."""
         if self.current_music == track_path:
             return
         
-        if not os.path.exists(track_path):
+        if not asset_exists(track_path):
             print(f"Music not found: {track_path}")
             return
 
@@ -122,6 +221,59 @@ class GameState:
         except Exception as e:
             print(f"Error playing music {track_path}: {e}")
 
+    def stop_bgm(self):
+        pygame.mixer.music.stop()
+        self.current_music = None
+
+    # ---- cutscene (runs on the scheduler) ----
+    def start_cutscene(self, frame_index=0, into_frame_ms=0):
+        """Switches to the cutscene and schedules every frame change and sound cue.
+
+        a restored save state resumes `into_frame_ms` into frame `frame_index`.
+        """
+        self.scheduler.cancel_group('cutscene')
+        self.game_state = 'cutscene'
+        frame_index = min(frame_index, len(self.cutscene_frames) - 1)
+        self.cutscene_frame_index = frame_index
+        now = self.ticks()
+        self.cutscene_frame_start = now - into_frame_ms
+
+        # cues are scheduled up front at the time their frame starts
+        frame_start = self.cutscene_frame_start
+        for index, (_, duration) in enumerate(self.cutscene_frames[frame_index:], frame_index):
+            sound_name = settings.CUTSCENE_SOUND_CUES.get(index)
+            if sound_name and (index > frame_index or into_frame_ms == 0):
+                self.scheduler.schedule(frame_start, self.play_cutscene_cue, sound_name, group='cutscene')
+            frame_start += duration
+
+        _, duration = self.cutscene_frames[frame_index]
+        self.scheduler.schedule(self.cutscene_frame_start + duration, self.advance_cutscene, group='cutscene')
+
+    def play_cutscene_cue(self, sound_name, when):
+        sound = getattr(self.assets, sound_name, None)
+        if sound:
+            sound.play()
+
+    def advance_cutscene(self, when):
+        self.cutscene_frame_index += 1
+        self.cutscene_frame_start = when
+        if self.cutscene_frame_index < len(self.cutscene_frames):
+            _, duration = self.cutscene_frames[self.cutscene_frame_index]
+            self.scheduler.schedule(when + duration, self.advance_cutscene, group='cutscene')
+            return
+
+        self.scheduler.cancel_group('cutscene')
+        # stop any cutscene sounds that might still be playing
+        for sound_name in settings.CUTSCENE_SOUND_CUES.values():
+            sound = getattr(self.assets, sound_name, None)
+            if sound and sound.get_num_channels() > 0:
+                sound.stop()
+
+        self.game_state = 'won'
+        if self.assets.success_sound:
+            self.assets.success_sound.play()
+        self.play_bgm(settings.MAIN_BGM_PATH)
+
     @new_highscore_announcer
     def update_highscore(self, new_score):
         """Updates the highscore if the new score is higher."""
@@ -130,20 +282,106 @@ class GameState:
 
 gs = GameState()
 
+if (settings.TELEMETRY_ENABLED or args.telemetry or args.telemetry_db) and not args.no_telemetry:
+    gs.telemetry = Telemetry(db_path=args.telemetry_db)
+
+soak = None
+if args.bot:
+    gs.bot = bots.make_bot(args.bot, seed=args.bot_seed)
+    soak = bots.SoakMonitor(gs.bot, assets,
+                            duration_s=args.soak_minutes * 60 if args.soak_minutes else None,
+                            csv_path=args.soak_csv)
+
 def reset_minigame():
     gs.minigame = FishingMinigame(gs)
+    reel_input.reset()
     gs.play_bgm(settings.MAIN_BGM_PATH)
 
+def apply_resolution(size):
+    """Rebuilds geometry and fonts for a new window size. Scaled images follow lazily."""
+    global layout, font
+    old_layout = layout
+    layout = Layout(*size)
+    font = load_font(layout.font_size, layout.fallback_font_size)
+    gs.set_layout(layout)
+    if gs.minigame:
+        gs.minigame.rescale(old_layout, gs)
+    scenes.relayout()
+
+def apply_settings_changes(changed):
+    """Rebuilds only what depends on settings that were just hot-reloaded."""
+    if not changed:
+        return
+    if changed & live_settings.LAYOUT_KEYS:
+        apply_resolution(layout.size)
+    assets.reload_for_settings(changed)
+    scenes.relayout() # reloaded images or text settings
+    if gs.cutscene_frames is not assets.cutscene_frames:
+        gs.cutscene_frames = assets.cutscene_frames
+        gs.cutscene_frame_index = 0
+        if gs.game_state == 'cutscene':
+            gs.scheduler.cancel_group('cutscene')
+            if gs.cutscene_frames:
+                gs.start_cutscene() # restart on the new frames
+            else:
+                gs.game_state = 'won'
+    pacer.request_redraw()
+
 def start_waiting_for_bite():
     """Sets up the state to wait for a fish to bite."""
     gs.game_state = 'waiting_for_bite'
-    gs.waiting_start_time = pygame.time.get_ticks()
+    gs.waiting_start_time = gs.ticks()
     # fish will bite in 2 to 7 seconds
     gs.bite_time = gs.waiting_start_time + random.randint(2000, 7000)
     gs.show_bite_indicator = False
+    gs.scheduler.cancel_group('bite')
+    gs.scheduler.schedule(gs.bite_time, fish_bites, group='bite')
     if assets.casting_sound:
         assets.casting_sound.play()
 
+def fish_bites(when):
+    """Scheduled by start_waiting_for_bite."""
+    if gs.game_state != 'waiting_for_bite':
+        return
+    gs.show_bite_indicator = True
+    if assets.bite_sound:
+        assets.bite_sound.play()
+
+def save_snapshot():
+    try:
+        savestate.save(gs, save_state_path)
+    except OSError as e:
+        print(f"Could not write save state {save_state_path}: {e}")
+
+def resume_from_snapshot(path):
+    """Restores a save state and restarts the timers and music that go with it."""
+    try:
+        fields = savestate.load(path)
+    except savestate.SaveStateError as e:
+        print(e)
+        return False
+    gs.scheduler.cancel_group('bite')
+    gs.scheduler.cancel_group('cutscene')
+    savestate.restore(gs, fields)
+    reel_input.reset()
+
+    if gs.game_state == 'waiting_for_bite' and not gs.show_bite_indicator:
+        gs.scheduler.schedule(gs.bite_time, fish_bites, group='bite')
+    if gs.game_state == 'cutscene':
+        if gs.cutscene_frames:
+            gs.start_cutscene(fields["cutscene_frame_index"], fields["cutscene_into_frame_ms"])
+        else:
+            gs.game_state = 'won'
+
+    if gs.game_state == 'cutscene':
+        gs.stop_bgm()
+    elif gs.game_state == 'fishing' and gs.minigame.first_hit_made:
+        gs.play_bgm(settings.TENSION_BGM_PATH)
+    elif gs.game_state != 'lost':
+        gs.play_bgm(settings.MAIN_BGM_PATH)
+    print(f"Resumed '{gs.game_state}' from {path}")
+    return True
+
 def start_fishing_minigame():
     """Starts the main fishing minigame."""
     reset_minigame()
@@ -151,383 +389,432 @@ def start_fishing_minigame():
 
 def draw_fishing_minigame(is_catching, vibration_offset=(0, 0)):
     """Draws all elements for the fishing minigame state."""
-    if assets.fishing_bg_img:
-        screen.blit(assets.fishing_bg_img, (0, 0))
-    else:
-        screen.fill(settings.GREY)
-
-    progress_overlay_img = None
     if not gs.minigame.first_hit_made:
-        progress_overlay_img = assets.progress_mid_img
+        progress_overlay_key = "progress_mid"
     else:
         # after the first hit, show high for catching, low for losing.
         if is_catching:
-            progress_overlay_img = assets.progress_high_img
+            progress_overlay_key = "progress_high"
         else:
-            progress_overlay_img = assets.progress_low_img
-            
-    # for pngs on top of png, make it semi-transparent.
-    if progress_overlay_img:
-        # draw the overlay normally. preserves its original colors.
-        screen.blit(progress_overlay_img, vibration_offset)
+            progress_overlay_key = "progress_low"
+
+    # background + overlay are pre-composited, so this is one opaque blit
+    # instead of the background plus a full-screen alpha blend.
+    scene = assets.fishing_scene(progress_overlay_key, layout.size)
+    shake_blit(screen, scene, vibration_offset)
+
+    # ripples around the line, only inside layout.water_rect (see water.py)
+    water.draw(screen, scene, vibration_offset, layout, gs.minigame, is_catching)
 
     # draw fishing track
-    pygame.draw.rect(screen, settings.BLACK, (TRACK_X, TRACK_Y, TRACK_W, TRACK_H))
+    pygame.draw.rect(screen, settings.BLACK, (layout.track_x, layout.track_y, layout.track_w, layout.track_h))
 
     # draw fish
-    pygame.draw.rect(screen, settings.BLUE, (TRACK_X, gs.minigame.fish_y, TRACK_W, FISH_H))
+    pygame.draw.rect(screen, settings.BLUE, (layout.track_x, gs.minigame.fish_y, layout.track_w, layout.fish_h))
 
     # draw player's catch bar
-    pygame.draw.rect(screen, settings.GREEN, (TRACK_X, gs.minigame.catch_bar_y, TRACK_W, CATCH_BAR_H), 4)
+    pygame.draw.rect(screen, settings.GREEN, (layout.track_x, gs.minigame.catch_bar_y, layout.track_w, layout.catch_bar_h), layout.px(4))
 
     # --- draw functional progress bar ---
     #  draw black background for the bar
-    pygame.draw.rect(screen, settings.BLACK, (PROGRESS_BAR_X, PROGRESS_BAR_Y, PROGRESS_BAR_W, PROGRESS_BAR_H))
+    pygame.draw.rect(screen, settings.BLACK, (layout.progress_bar_x, layout.progress_bar_y, layout.progress_bar_w, layout.progress_bar_h))
 
     #  draw yellow fill rectangle that shows current progress
-    progress_height = int(PROGRESS_BAR_H * (gs.minigame.catch_progress / 100.0))
+    progress_height = int(layout.progress_bar_h * (gs.minigame.catch_progress / 100.0))
     if progress_height > 0:
         pygame.draw.rect(screen, settings.YELLOW,
-            (PROGRESS_BAR_X, PROGRESS_BAR_Y + PROGRESS_BAR_H - progress_height, PROGRESS_BAR_W, progress_height))
+            (layout.progress_bar_x, layout.progress_bar_y + layout.progress_bar_h - progress_height, layout.progress_bar_w, progress_height))
 
     #  debug outlines to verify UI element positions
     if settings.DEBUG_UI_OUTLINES:
-        pygame.draw.rect(screen, (255, 0, 255), (TRACK_X, TRACK_Y, TRACK_W, TRACK_H), 1)
-        pygame.draw.rect(screen, (0, 255, 255), (TRACK_X, gs.minigame.catch_bar_y, TRACK_W, CATCH_BAR_H), 1)
-        pygame.draw.rect(screen, (255, 255, 255), (TRACK_X, gs.minigame.fish_y, TRACK_W, FISH_H), 1)
-        pygame.draw.rect(screen, (255, 0, 0), (PROGRESS_BAR_X, PROGRESS_BAR_Y, PROGRESS_BAR_W, PROGRESS_BAR_H), 1)
-
-def show_crash_screen(error_message):
-    """Displays a crash screen with the error and a close button."""
-    crash_font = pygame.font.Font(None, 24)
-    close_button_rect = pygame.Rect(0, 0, 150, 50)
-    close_button_rect.center = (settings.SCREEN_WIDTH // 2, settings.SCREEN_HEIGHT - 50)
-
-    # Split the error message into lines
-    error_lines = error_message.strip().split('\n')
-
-    crash_screen_running = True
-    while crash_screen_running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                crash_screen_running = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1 and close_button_rect.collidepoint(event.pos):
-                    crash_screen_running = False
-
-        screen.fill(settings.GREY)
-
-        # Draw the error message
-        y_offset = 20
-        for line in error_lines:
-            error_surf = crash_font.render(line, True, settings.WHITE)
-            screen.blit(error_surf, (20, y_offset))
-            y_offset += 25
-
-        # Draw the close button
-        pygame.draw.rect(screen, settings.RED, close_button_rect)
-        close_text_surf = font.render("Close", True, settings.WHITE)
-        screen.blit(close_text_surf, close_text_surf.get_rect(center=close_button_rect.center))
-
-        pygame.display.flip()
-        clock.tick(30)
+        pygame.draw.rect(screen, (255, 0, 255), (layout.track_x, layout.track_y, layout.track_w, layout.track_h), 1)
+        pygame.draw.rect(screen, (0, 255, 255), (layout.track_x, gs.minigame.catch_bar_y, layout.track_w, layout.catch_bar_h), 1)
+        pygame.draw.rect(screen, (255, 255, 255), (layout.track_x, gs.minigame.fish_y, layout.track_w, layout.fish_h), 1)
+        pygame.draw.rect(screen, (255, 0, 0), (layout.progress_bar_x, layout.progress_bar_y, layout.progress_bar_w, layout.progress_bar_h), 1)
 
-# --- main game loop ---
-# start main bgm
-gs.play_bgm(settings.MAIN_BGM_PATH)
+def play_click_sound():
+    if assets.button_click_sound:
+        assets.button_click_sound.play()
 
-running = True
-while running:
-    # --- Event Handling ---
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                running = False
-            # r to restart the minigame at any time
-            if event.key == pygame.K_r:
-                reset_minigame()
-        
-        if gs.game_state == 'menu':
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1 and play_button_rect and play_button_rect.collidepoint(event.pos):
-                    if assets.button_click_sound:
-                        assets.button_click_sound.play()
-                    start_waiting_for_bite()
-                
-                # for the debug button
-                if event.button == 1 and debug_button_rect and debug_button_rect.collidepoint(event.pos):
-                    if assets.button_click_sound:
-                        assets.button_click_sound.play()
-                    # toggle cheats (for testing)
-                    gs.cheats["fast_catch"] = not gs.cheats["fast_catch"]
-        
-        if gs.game_state == 'lost':
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if try_again_button_rect and try_again_button_rect.collidepoint(event.pos):
-                    if assets.button_click_sound:
-                        assets.button_click_sound.play()
-                    if assets.lose_sound:
-                        assets.lose_sound.stop()
-                    gs.play_bgm(settings.MAIN_BGM_PATH)
-                    start_waiting_for_bite() # restart to the start
-                elif exit_button_rect and exit_button_rect.collidepoint(event.pos):
-                    if assets.button_click_sound:
-                        assets.button_click_sound.play()
-                    if assets.lose_sound:
-                        assets.lose_sound.stop()
-                    gs.play_bgm(settings.MAIN_BGM_PATH)
-                    gs.game_state = 'menu' # back to menu
-                    if not pygame.mouse.get_visible():
-                        pygame.mouse.set_visible(True)
-
-        if gs.game_state == 'waiting_for_bite':
-             # click to start the game ( forgot to add timer to 
-             # the bite indicator so technically you can just wait forever without losing bait)
-            if gs.show_bite_indicator and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                start_fishing_minigame()
-        #when the cutscene is over, a click or key press will restart to the game
-        if gs.game_state == 'won' and (event.type == pygame.MOUSEBUTTONDOWN or event.type == pygame.KEYDOWN):
-             if event.type == pygame.MOUSEBUTTONDOWN and assets.button_click_sound:
-                 assets.button_click_sound.play()
-             if assets.reeling_sound:
-                assets.reeling_sound.stop()
-             if not pygame.mouse.get_visible():
-                pygame.mouse.set_visible(True) # for cursor to be visible on menu
-             gs.game_state = 'menu'
-             gs.show_bite_indicator = False
-
-    # --- game logic ---
-    if gs.game_state == 'menu':
-        pass # no logic needed for menu, only drawing
-    elif gs.game_state == 'fishing':
-        # we need to know if we are catching to draw the correct overlay.
-        catch_bar_rect = pygame.Rect(TRACK_X, gs.minigame.catch_bar_y, TRACK_W, CATCH_BAR_H)
-        fish_rect = pygame.Rect(TRACK_X, gs.minigame.fish_y, TRACK_W, FISH_H)
-        is_currently_catching = catch_bar_rect.colliderect(fish_rect)
+# --- scenes (one per game state, see scenes.py) ---
+# layout() reads the module's current layout and font, apply_resolution() calls it again after a resize
+class MenuScene(Scene):
+    name = 'menu'
 
-        # calculate vibration offset for the progress_high image
-        vibration_offset = (0, 0)
-        if is_currently_catching and gs.minigame.first_hit_made:
-            vibration_intensity = 2 # pixels (reduced from 4)
-            vibration_offset = (random.randint(-vibration_intensity, vibration_intensity), 
-                                random.randint(-vibration_intensity, vibration_intensity))
-
-    elif gs.game_state == 'waiting_for_bite':
-        now = pygame.time.get_ticks()
-        if not gs.show_bite_indicator and now >= gs.bite_time:
-            gs.show_bite_indicator = True
-            if assets.bite_sound:
-                assets.bite_sound.play()
-
-    elif gs.game_state == 'cutscene':
-        _, current_frame_duration = gs.cutscene_frames[gs.cutscene_frame_index]
-        now = pygame.time.get_ticks()
-        if now - gs.cutscene_last_frame_time > current_frame_duration:
-            gs.cutscene_frame_index += 1
-            gs.cutscene_last_frame_time = now
-            if gs.cutscene_frame_index >= len(gs.cutscene_frames):
-                # stop any cutscene sounds that might still be playing
-                if assets.cutscene_sound_1 and assets.cutscene_sound_1.get_num_channels() > 0: assets.cutscene_sound_1.stop()
-                if assets.cutscene_sound_30 and assets.cutscene_sound_30.get_num_channels() > 0: assets.cutscene_sound_30.stop()
-                if assets.cutscene_sound_60 and assets.cutscene_sound_60.get_num_channels() > 0: assets.cutscene_sound_60.stop()
-                
-                gs.game_state = 'won'
-                if assets.success_sound:
-                    assets.success_sound.play()
-                gs.play_bgm(settings.MAIN_BGM_PATH)
-            else:
-                # play sounds at specific frames
-                if gs.cutscene_frame_index == 19 and assets.cutscene_sound_30: assets.cutscene_sound_30.play() # frame 20 (index 19)
-                if gs.cutscene_frame_index == 39 and assets.cutscene_sound_60: assets.cutscene_sound_60.play() # frame 40 (index 39)
+    def __init__(self):
+        super().__init__()
+        self.handlers[pygame.MOUSEBUTTONDOWN] = self.on_click
 
-    # --- drawing ---
-    screen.fill(settings.GREY)
+    def enter(self, previous):
+        if not pygame.mouse.get_visible():
+            pygame.mouse.set_visible(True) # for cursor to be visible on menu
 
-    if gs.game_state == 'menu':
-        if assets.menu_bg_img:
-            screen.blit(assets.menu_bg_img, (0, 0))
-        else:
+    def layout(self):
+        self.background = assets.scaled("menu_bg", assets.menu_bg_img, layout.size)
+        if not self.background:
             # fallback text if background image is missing
-            menu_text = font.render("Main Menu", True, settings.WHITE)
-            screen.blit(menu_text, menu_text.get_rect(center=(settings.SCREEN_WIDTH // 2, settings.SCREEN_HEIGHT // 3)))
+            self.title_text = font.render("Main Menu", True, settings.WHITE)
+            self.title_rect = self.title_text.get_rect(center=(layout.width // 2, layout.height // 3))
 
         if assets.play_button_img:
-            pos_x = int(settings.SCREEN_WIDTH * settings.PLAY_BUTTON_POS_X)
-            pos_y = int(settings.SCREEN_HEIGHT * settings.PLAY_BUTTON_POS_Y)
-            play_button_rect = assets.play_button_img.get_rect(center=(pos_x, pos_y))
-            screen.blit(assets.play_button_img, play_button_rect)
+            self.play_button_img = assets.scaled("play_button", assets.play_button_img, layout.play_button_size(assets.play_button_img))
         else:
             # fallback text if play button image is missing
-            play_text = font.render("Click to Play", True, settings.WHITE)
-            play_button_rect = play_text.get_rect(center=(int(settings.SCREEN_WIDTH * settings.PLAY_BUTTON_POS_X), int(settings.SCREEN_HEIGHT * settings.PLAY_BUTTON_POS_Y)))
-            screen.blit(play_text, play_button_rect)
+            self.play_button_img = font.render("Click to Play", True, settings.WHITE)
+        self.buttons['play'] = self.play_button_img.get_rect(center=layout.play_button_center)
+
+        debug_button_rect = pygame.Rect((0, 0), layout.button_size)
+        debug_button_rect.bottomright = (layout.width - layout.px(20), layout.height - layout.px(20))
+        self.buttons['cheats'] = debug_button_rect
+        self.layout_cheats()
+
+    def layout_cheats(self):
+        """The cheats button changes with the cheat, so it gets rebuilt on its own when toggled."""
+        active = gs.cheats["fast_catch"]
+        self.debug_button_color = settings.GREEN if active else settings.RED
+        self.debug_text = font.render("Cheats ON" if active else "Cheats OFF", True, settings.WHITE)
+        self.cheat_status_text = font.render("Fast Catch Active", True, settings.YELLOW) if active else None
+
+    def on_click(self, event):
+        if event.button != 1:
+            return
+        if self.buttons['play'].collidepoint(event.pos):
+            play_click_sound()
+            start_waiting_for_bite()
+
+        # for the debug button
+        if self.buttons['cheats'].collidepoint(event.pos):
+            play_click_sound()
+            # toggle cheats (for testing)
+            gs.cheats["fast_catch"] = not gs.cheats["fast_catch"]
+            self.layout_cheats()
+
+    def draw(self, screen):
+        if self.background:
+            screen.blit(self.background, (0, 0))
+        else:
+            screen.blit(self.title_text, self.title_rect)
+        screen.blit(self.play_button_img, self.buttons['play'])
 
         # --- draw debug/cheats button ---
-        debug_button_color = settings.GREEN if gs.cheats["fast_catch"] else settings.RED
-        debug_button_text = "Cheats ON" if gs.cheats["fast_catch"] else "Cheats OFF"
-        debug_text_surf = font.render(debug_button_text, True, settings.WHITE)
-        
-        debug_button_rect = pygame.Rect(0, 0, 200, 50)
-        debug_button_rect.bottomright = (settings.SCREEN_WIDTH - 20, settings.SCREEN_HEIGHT - 20)
-        
-        pygame.draw.rect(screen, debug_button_color, debug_button_rect)
-        screen.blit(debug_text_surf, debug_text_surf.get_rect(center=debug_button_rect.center))
+        debug_button_rect = self.buttons['cheats']
+        pygame.draw.rect(screen, self.debug_button_color, debug_button_rect)
+        screen.blit(self.debug_text, self.debug_text.get_rect(center=debug_button_rect.center))
 
         # display cheat status
-        if gs.cheats["fast_catch"]:
-            cheat_status_text = font.render("Fast Catch Active", True, settings.YELLOW)
-            screen.blit(cheat_status_text, (debug_button_rect.left, debug_button_rect.top - 40))
+        if self.cheat_status_text:
+            screen.blit(self.cheat_status_text, (debug_button_rect.left, debug_button_rect.top - layout.px(40)))
 
-    elif gs.game_state == 'waiting_for_bite': # no change
-        # use the same background as the fishing minigame
-        if assets.fishing_bg_img:
-            screen.blit(assets.fishing_bg_img, (0, 0))
-        else:
-            screen.fill(settings.GREY)
+class WaitingScene(Scene):
+    name = 'waiting_for_bite'
 
-        if not gs.show_bite_indicator: # waiting state
-            if assets.waiting_img:
-                center_blit(screen, assets.waiting_img)
-            else: # fallback text
-                wait_text = font.render("Waiting for a bite...", True, settings.WHITE)
-                screen.blit(wait_text, wait_text.get_rect(center=(settings.SCREEN_WIDTH // 2, settings.SCREEN_HEIGHT // 2)))
-        else: # bite state
-            if assets.bite_img:
-                center_blit(screen, assets.bite_img)
+    def __init__(self):
+        super().__init__()
+        self.handlers[pygame.MOUSEBUTTONDOWN] = self.on_click
+
+    def layout(self):
+        # use the same background as the fishing minigame
+        self.background = assets.scaled("fishing_bg", assets.fishing_bg_img, layout.size)
+        # show_bite_indicator -> (surface, rect)
+        self.indicators = {}
+        for bite, key, image, text, color in ((False, "waiting", assets.waiting_img, "Waiting for a bite...", settings.WHITE),
+                                              (True, "bite", assets.bite_img, "BITE! CLICK NOW!", settings.YELLOW)):
+            if image:
+                surface = assets.scaled(key, image, layout.indicator_max_size, fit=True)
             else: # fallback text
-                bite_text = font.render("BITE! CLICK NOW!", True, settings.YELLOW)
-                screen.blit(bite_text, bite_text.get_rect(center=(settings.SCREEN_WIDTH // 2, settings.SCREEN_HEIGHT // 2)))
+                surface = font.render(text, True, color)
+            self.indicators[bite] = (surface, surface.get_rect(center=layout.center))
+
+    def on_click(self, event):
+        # click to start the game ( forgot to add timer to
+        # the bite indicator so technically you can just wait forever without losing bait)
+        if gs.show_bite_indicator and event.button == 1:
+            start_fishing_minigame()
 
-    elif gs.game_state == 'fishing': # no change
-        gs.minigame.update(gs) # update logic first
-        draw_fishing_minigame(is_currently_catching, vibration_offset) # then draw with the correct state
+    def draw(self, screen):
+        if self.background:
+            screen.blit(self.background, (0, 0))
+        screen.blit(*self.indicators[gs.show_bite_indicator])
 
-        instructions_text = font.render("Hold [SPACE] or Left-Click to reel up", True, settings.WHITE)        
-        screen.blit(instructions_text, (instructions_text.get_rect(centerx=settings.SCREEN_WIDTH // 2).x, 20))
-        restart_text = font.render("Press [R] to restart", True, settings.WHITE)        
-        screen.blit(restart_text, (restart_text.get_rect(centerx=settings.SCREEN_WIDTH // 2).x, 50))
+class FishingScene(Scene):
+    name = 'fishing'
+
+    def __init__(self):
+        super().__init__()
+        self.is_catching = False
+        self.vibration_offset = (0, 0)
+
+    def layout(self):
+        instructions_text = font.render("Hold [SPACE] or Left-Click to reel up", True, settings.WHITE)
+        restart_text = font.render("Press [R] to restart", True, settings.WHITE)
+        self.texts = [
+            (instructions_text, (instructions_text.get_rect(centerx=layout.width // 2).x, layout.px(20))),
+            (restart_text, (restart_text.get_rect(centerx=layout.width // 2).x, layout.px(50))),
+        ]
+
+    def update(self):
+        # we need to know if we are catching to draw the correct overlay.
+        catch_bar_rect = pygame.Rect(layout.track_x, gs.minigame.catch_bar_y, layout.track_w, layout.catch_bar_h)
+        fish_rect = pygame.Rect(layout.track_x, gs.minigame.fish_y, layout.track_w, layout.fish_h)
+        self.is_catching = catch_bar_rect.colliderect(fish_rect)
 
-    elif gs.game_state == 'cutscene': # no change
+        # calculate vibration offset for the progress_high image
+        self.vibration_offset = (0, 0)
+        if self.is_catching and gs.minigame.first_hit_made:
+            # the whole scene shakes by one of a few small offsets, see shake_blit()
+            self.vibration_offset = random.choice(layout.vibration_offsets)
+
+        gs.minigame.update(gs) # may switch to won/lost, this frame still draws the catch
+
+    def draw(self, screen):
+        draw_fishing_minigame(self.is_catching, self.vibration_offset)
+        screen.blits(self.texts)
+
+class CutsceneScene(Scene):
+    name = 'cutscene'
+
+    def draw(self, screen):
         if gs.cutscene_frames:
             safe_index = gs.cutscene_frame_index % len(gs.cutscene_frames)
-            frame_to_draw, _ = gs.cutscene_frames[safe_index]
-            # Since the frame is the same size as the screen, blit it at (0, 0)
-            screen.blit(frame_to_draw, (0, 0))
+            frame = assets.cutscene_frame(safe_index, layout.size)
+            if frame.get_size() == layout.size:
+                screen.blit(frame, (0, 0))
+            else:
+                # capped at settings.CUTSCENE_MAX_HEIGHT, stretch it over the screen
+                pygame.transform.scale(frame, layout.size, screen)
 
-    elif gs.game_state == 'won': # display fish stats here
-        # draw the specific fish image centered on the screen
-        attr_name = gs.minigame.fish.asset_attr
-        fish_img = getattr(gs.assets, attr_name, None)
+class WonScene(Scene):
+    name = 'won'
 
+    def __init__(self):
+        super().__init__()
+        # when the cutscene is over, a click or key press will restart to the game
+        self.handlers[pygame.MOUSEBUTTONDOWN] = self.on_input
+        self.handlers[pygame.KEYDOWN] = self.on_input
+
+    def enter(self, previous):
+        gs.update_highscore(gs.minigame.fish.get_score())
+
+    def layout(self):
+        self.background = assets.scaled("success", assets.success_img, layout.size)
+        game = gs.minigame
+        species_id = game.fish.species_id
+        score = game.fish.get_score()
+
+        # the fish image itself is looked up every frame, it's loaded on demand (see Assets.fish_art)
+        self.fish_center = (layout.width // 2, layout.height // 2 - layout.px(100))
+        # fallback: a placeholder rectangle if image is missing so it's not invisible
+        self.placeholder_rect = pygame.Rect((0, 0), layout.fish_trophy_size)
+        self.placeholder_rect.center = self.fish_center
+        self.missing_text = font.render(f"Missing: {species_id}", True, settings.WHITE)
+
+        # victory message and fish stats
+        fish_info = f"{game.current_fish_type} - {game.current_fish_weight} lbs | Score: {score}"
+        if not gs.cutscene_frames:
+            if not _GIF_SUPPORT:
+                sub_text = "Pillow not installed for GIF support."
+            else:
+                sub_text = f"'{settings.WIN_GIF_PATH}' not found."
+            lines = [("You caught the fish!", settings.YELLOW), (fish_info, settings.WHITE), (sub_text, settings.WHITE)]
+        else:
+            lines = [("Success!", settings.YELLOW), (fish_info, settings.WHITE)]
+
+        text_center_x = layout.width // 2
+        text_top_y = layout.px(50)
+        self.texts = []
+        for i, (text, color) in enumerate(lines):
+            surface = font.render(text, True, color)
+            self.texts.append((surface, surface.get_rect(center=(text_center_x, text_top_y + layout.px(40 * i)))))
+        restart_text = font.render("Click or press any key to fish again.", True, settings.WHITE)
+        self.texts.append((restart_text, restart_text.get_rect(center=(text_center_x, layout.height - layout.px(50)))))
+
+    def on_input(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            play_click_sound()
+        if assets.reeling_sound:
+            assets.reeling_sound.stop()
+        gs.game_state = 'menu'
+        gs.show_bite_indicator = False
+
+    def draw(self, screen):
         # draw background first (using success img as bg or fallback)
-        if gs.assets.success_img:
-             scaled_bg = pygame.transform.scale(gs.assets.success_img, (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
-             screen.blit(scaled_bg, (0, 0))
+        if self.background:
+            screen.blit(self.background, (0, 0))
         else:
-             screen.fill((34, 139, 34))
+            screen.fill((34, 139, 34))
 
         # draw the fish overlay
+        species_id = gs.minigame.fish.species_id
+        fish_img = assets.get_fish_image(species_id)
         if fish_img:
-            # scale it up a bit if it's small
-            scaled_fish = pygame.transform.scale(fish_img, (210, 210))
-            fish_rect = scaled_fish.get_rect(center=(settings.SCREEN_WIDTH // 2, settings.SCREEN_HEIGHT // 2 - 100))
-            screen.blit(scaled_fish, fish_rect)
+            scaled_fish = assets.scaled("fish_" + species_id, fish_img, layout.fish_trophy_size)
+            screen.blit(scaled_fish, scaled_fish.get_rect(center=self.fish_center))
         else:
-            # fallback: draw a placeholder rectangle if image is missing so it's not invisible
-            placeholder_rect = pygame.Rect(0, 0, 210, 210)
-            placeholder_rect.center = (settings.SCREEN_WIDTH // 2, settings.SCREEN_HEIGHT // 2 - 100)
-            pygame.draw.rect(screen, settings.BLUE, placeholder_rect)
-            pygame.draw.rect(screen, settings.WHITE, placeholder_rect, 2)
-            
-            # draw text indicating missing asset
-            missing_text = font.render(f"Missing: {attr_name}", True, settings.WHITE)
-            text_rect = missing_text.get_rect(center=placeholder_rect.center)
-            screen.blit(missing_text, text_rect)
-
-        score = gs.minigame.fish.get_score()
-        # update highscore
-        gs.update_highscore(score)
-
-        # display victory message
-        text_center_x = settings.SCREEN_WIDTH // 2
-        text_top_y = 50
+            pygame.draw.rect(screen, settings.BLUE, self.placeholder_rect)
+            pygame.draw.rect(screen, settings.WHITE, self.placeholder_rect, 2)
+            screen.blit(self.missing_text, self.missing_text.get_rect(center=self.placeholder_rect.center))
 
-        if not gs.cutscene_frames:
-            win_text = font.render("You caught the fish!", True, settings.YELLOW)
-            win_rect = win_text.get_rect(center=(text_center_x, text_top_y))
-            screen.blit(win_text, win_rect)
-
-            # display fish stats
-            fish_info_text = font.render(
-                f"{gs.minigame.current_fish_type} - {gs.minigame.current_fish_weight} lbs | Score: {score}",
-                True, settings.WHITE
-            )
-            fish_info_rect = fish_info_text.get_rect(center=(text_center_x, text_top_y + 40))
-            screen.blit(fish_info_text, fish_info_rect)
-
-            
-            if not assets._GIF_SUPPORT:
-                sub_text = font.render("Pillow not installed for GIF support.", True, settings.WHITE)
-            else:
-                sub_text = font.render(f"'{settings.WIN_GIF_PATH}' not found.", True, settings.WHITE)
-            sub_rect = sub_text.get_rect(center=(text_center_x, text_top_y + 80))
-            screen.blit(sub_text, sub_rect)
-        else:
-            win_text = font.render("Success!", True, settings.YELLOW)
-            win_rect = win_text.get_rect(center=(text_center_x, text_top_y))
-            screen.blit(win_text, win_rect)
-
-            # display fish stats below "Success!"
-            fish_info_text = font.render(
-                f"{gs.minigame.current_fish_type} - {gs.minigame.current_fish_weight} lbs | Score: {score}",
-                True, settings.WHITE
-            )
-            fish_info_rect = fish_info_text.get_rect(center=(text_center_x, text_top_y + 40))
-            screen.blit(fish_info_text, fish_info_rect)
+        screen.blits(self.texts)
 
-        restart_text = font.render("Click or press any key to fish again.", True, settings.WHITE)
-        restart_rect = restart_text.get_rect(center=(text_center_x, settings.SCREEN_HEIGHT - 50))
-        screen.blit(restart_text, restart_rect)
-    
-    elif gs.game_state == 'lost':
+class LostScene(Scene):
+    name = 'lost'
+
+    def __init__(self):
+        super().__init__()
+        self.handlers[pygame.MOUSEBUTTONDOWN] = self.on_click
+
+    def enter(self, previous):
+        # ensure mouse is visible on lose screen
+        if not pygame.mouse.get_visible():
+            pygame.mouse.set_visible(True)
+
+    def layout(self):
+        self.background = assets.scaled("lose", assets.lose_img, layout.size)
+        lose_text = font.render("The fish got away...", True, settings.RED)
+        self.texts = [(lose_text, lose_text.get_rect(center=(layout.width // 2, layout.px(50))))]
+
+        # "Try Again" and "Exit" buttons
+        self.button_colors = {}
+        for name, label, color, dx in (('try_again', "Try Again", settings.GREEN, -120),
+                                       ('exit', "Exit to Menu", settings.RED, 120)):
+            rect = pygame.Rect((0, 0), layout.button_size)
+            rect.center = (layout.width // 2 + layout.px(dx), layout.height - layout.px(80))
+            self.buttons[name] = rect
+            self.button_colors[name] = color
+            text = font.render(label, True, settings.WHITE)
+            self.texts.append((text, text.get_rect(center=rect.center)))
+
+    def on_click(self, event):
+        if event.button != 1:
+            return
+        if self.buttons['try_again'].collidepoint(event.pos):
+            self.leave()
+            start_waiting_for_bite() # restart to the start
+        elif self.buttons['exit'].collidepoint(event.pos):
+            self.leave()
+            gs.game_state = 'menu' # back to menu
+
+    def leave(self):
+        play_click_sound()
+        if assets.lose_sound:
+            assets.lose_sound.stop()
+        gs.play_bgm(settings.MAIN_BGM_PATH)
+
+    def draw(self, screen):
         # draw lose image if available
-        if gs.assets.lose_img:
-            scaled_lose = pygame.transform.scale(gs.assets.lose_img, (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
-            screen.blit(scaled_lose, (0, 0))
+        if self.background:
+            screen.blit(self.background, (0, 0))
         else:
             # fallback if image is missing
             screen.fill((139, 0, 0)) # dark red
+        for name, rect in self.buttons.items():
+            pygame.draw.rect(screen, self.button_colors[name], rect)
+        screen.blits(self.texts)
+
+# --- events every scene handles ---
+def quit_game(event):
+    global running
+    running = False
+
+def resize_window(event):
+    global screen
+    min_w, min_h = settings.MIN_SCREEN_SIZE
+    new_size = (max(event.w, min_w), max(event.h, min_h))
+    if new_size != layout.size:
+        screen = pygame.display.set_mode(new_size, display_flags)
+        apply_resolution(new_size)
+
+def handle_global_keys(event):
+    global running
+    if event.key == pygame.K_ESCAPE:
+        running = False
+    # r to restart the minigame at any time
+    if event.key == pygame.K_r:
+        reset_minigame()
+
+scenes = SceneManager(gs, [MenuScene(), WaitingScene(), FishingScene(), CutsceneScene(), WonScene(), LostScene()],
+                      handlers={
+                          pygame.QUIT: quit_game,
+                          pygame.VIDEORESIZE: resize_window,
+                          pygame.KEYDOWN: handle_global_keys,
+                      })
+
+# --- save states ---
+save_state_path = args.save_state or settings.SAVE_STATE_PATH
+save_states_enabled = (settings.SAVE_STATES_ENABLED or args.save_state or args.resume) and not args.no_save_state
+next_save_ticks = gs.ticks() + settings.SAVE_STATE_INTERVAL_MS
 
-        lose_text = font.render("The fish got away...", True, settings.RED)
-        # ensure mouse is visible on lose screen
-        if not pygame.mouse.get_visible():
-            pygame.mouse.set_visible(True)
+# --- main game loop ---
+# start main bgm (or pick up where the last session left off)
+if not (args.resume and resume_from_snapshot(save_state_path)):
+    gs.play_bgm(settings.MAIN_BGM_PATH)
 
-        lose_rect = lose_text.get_rect(center=(settings.SCREEN_WIDTH // 2, 50))
-        screen.blit(lose_text, lose_rect)
+running = True
+while running:
+    # hot reload happens here, between frames, so a frame never sees half a profile
+    if settings_watcher:
+        apply_settings_changes(settings_watcher.poll())
+
+    if gs.bot:
+        gs.bot.drive(gs, scenes.sync().buttons)
+
+    # --- Event Handling ---
+    # idle screens block here until something happens, see pacing.py
+    events, redraw = pacer.wait_for_events(gs.game_state, gs.scheduler.next_deadline())
+    for event in events:
+        scenes.dispatch(event)
+
+    if not running or not redraw:
+        continue
 
-        # draw "Try Again" button
-        try_again_button_rect = pygame.Rect(0, 0, 200, 50)
-        try_again_button_rect.center = (settings.SCREEN_WIDTH // 2 - 120, settings.SCREEN_HEIGHT - 80)
-        pygame.draw.rect(screen, settings.GREEN, try_again_button_rect)
-        try_again_text = font.render("Try Again", True, settings.WHITE)
-        screen.blit(try_again_text, try_again_text.get_rect(center=try_again_button_rect.center))
+    # --- game logic ---
+    # timed events (bite, cutscene frames, sound cues) fire here, before drawing
+    gs.scheduler.run_due(gs.ticks())
+    scene = scenes.sync()
+    scene.update()
 
-        # draw "Exit" button
-        exit_button_rect = pygame.Rect(0, 0, 200, 50)
-        exit_button_rect.center = (settings.SCREEN_WIDTH // 2 + 120, settings.SCREEN_HEIGHT - 80)
-        pygame.draw.rect(screen, settings.RED, exit_button_rect)
-        exit_text = font.render("Exit to Menu", True, settings.WHITE)
-        screen.blit(exit_text, exit_text.get_rect(center=exit_button_rect.center))
+    # --- drawing ---
+    screen.fill(settings.GREY)
+    scene.draw(screen)
 
     # draw highscore (always on top)
     highscore_surf = font.render(f"Highscore: {int(gs.highscore)}", True, settings.WHITE)
-    screen.blit(highscore_surf, (20, 20))
+    screen.blit(highscore_surf, (layout.px(20), layout.px(20)))
+
+    if gs.telemetry:
+        gs.telemetry.observe(gs, gs.ticks())
+
+    # a few kb, so writing it every few seconds doesn't cost a frame
+    if save_states_enabled and settings.SAVE_STATE_INTERVAL_MS and gs.ticks() >= next_save_ticks:
+        save_snapshot()
+        next_save_ticks = gs.ticks() + settings.SAVE_STATE_INTERVAL_MS
 
     # update the display
     pygame.display.flip()
 
-    # cap the frame rate
-    clock.tick(60)
\ No newline at end of file
+    if frame_capture:
+        frame_capture.capture(screen, gs.ticks())
+        if args.capture_frames and frame_capture.captured >= args.capture_frames:
+            running = False
+    if fixed_clock:
+        fixed_clock.advance()
+
+    # cap the frame rate (per state)
+    pacer.end_frame(gs.game_state)
+
+    if soak and not soak.end_frame():
+        running = False
+
+if save_states_enabled:
+    save_snapshot()
+if gs.telemetry:
+    gs.telemetry.close(gs.ticks())
+if frame_capture:
+    frame_capture.close()
+if settings.PRINT_PACING_STATS:
+    pacer.report()
+    water.report()
+if settings.PRINT_INPUT_STATS and not gs.bot:
+    reel_input.report()
+if soak:
+    soak.report()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import settings
+
+# screen-size dependent geometry. one Layout gets built per window size and
+# rebuilt whenever the window is resized or the resolution changes.
+
+class Layout:
+    """All the positions and sizes the game draws with, for one screen size."""
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = (width, height)
+        # pixel sizes from the 720p design get multiplied by this
+        self.scale = height / settings.LAYOUT_REFERENCE_HEIGHT
+
+        # fishing minigame geometry
+        # fake the minigame size relative to the screen height for better scaling.
+        self.track_h = int(height * settings.TRACK_H_RATIO)
+        self.track_w = int(self.track_h * settings.TRACK_W_RATIO)
+        self.track_x = int(width * settings.TRACK_X_RATIO)
+        self.track_y = (height - self.track_h) // 2
+
+        self.catch_bar_h = int(self.track_h * settings.CATCH_BAR_H_RATIO)
+        self.fish_h = int(self.track_h * settings.FISH_H_RATIO)
+
+        self.progress_bar_w = int(self.track_w * settings.PROGRESS_BAR_W_RATIO)
+        self.progress_bar_h = self.track_h
+        self.progress_bar_x = self.track_x + self.track_w + self.px(15)
+        self.progress_bar_y = self.track_y
+
+        # animated water around the track, the only part of the scene water.py redraws (x, y, w, h)
+        margin_x = int(self.track_h * settings.WATER_MARGIN_RATIO)
+        margin_y = margin_x // 4
+        water_left = max(0, self.track_x - margin_x)
+        water_top = max(0, self.track_y - margin_y)
+        water_right = min(width, self.track_x + self.track_w + margin_x)
+        water_bottom = min(height, self.track_y + self.track_h + margin_y)
+        self.water_rect = (water_left, water_top, water_right - water_left, water_bottom - water_top)
+
+        # ui
+        self.center = (width // 2, height // 2)
+        self.indicator_max_size = (int(width * 0.8), int(height * 0.8))
+        self.play_button_center = (int(width * settings.PLAY_BUTTON_POS_X), int(height * settings.PLAY_BUTTON_POS_Y))
+        self.button_size = (self.px(200), self.px(50))
+        self.fish_trophy_size = (self.px(210), self.px(210))
+        # the fishing scene shakes by picking one of these per frame, see go_fish.shake_blit()
+        self.vibration_offsets = [(int(round(x * self.scale)), int(round(y * self.scale)))
+                                  for x, y in settings.VIBRATION_OFFSETS]
+        self.font_size = self.px(40)
+        self.fallback_font_size = self.px(36)
+
+    def px(self, value):
+        """Scales a pixel size from the 720p design to this screen."""
+        return max(1, int(round(value * self.scale)))
+
+    def play_button_size(self, image):
+        w, h = image.get_size()
+        factor = settings.PLAY_BUTTON_SCALE * self.scale
+        return (max(1, int(w * factor)), max(1, int(h * factor)))
+
+def parse_resolution(text):
+    """Parses 'WxH' into (w, h). Returns None if it isn't a valid resolution."""
+    try:
+        w, h = (int(part) for part in text.lower().split("x"))
+    except (AttributeError, ValueError):
+        return None
+    min_w, min_h = settings.MIN_SCREEN_SIZE
+    if w < min_w or h < min_h:
+        return None
+    return (w, h)
@@ -0,0 +1,138 @@
+import json
+import os
+import time
+import settings
+
+# hot-reloadable settings.
+# a settings profile is a json file of overrides for names in settings.py, e.g.
+#     {"CATCH_BAR_GRAVITY": 0.3, "TRACK_H_RATIO": 0.8, "FISHING_BG_PATH": "night.png"}
+# SettingsWatcher polls its mtime (cheap, no extra dependencies) and applies a
+# changed file all at once between frames. the caller then rebuilds only what
+# depends on the changed names, see the groups below.
+# keys starting with '_' are metadata (tuner.py writes '_tuner') and are skipped.
+
+# settings that Layout reads. changing any of them rebuilds the layout and font.
+LAYOUT_KEYS = {
+    "TRACK_H_RATIO", "TRACK_W_RATIO", "TRACK_X_RATIO", "CATCH_BAR_H_RATIO", "FISH_H_RATIO",
+    "PROGRESS_BAR_W_RATIO", "LAYOUT_REFERENCE_HEIGHT", "PLAY_BUTTON_POS_X", "PLAY_BUTTON_POS_Y",
+    "PLAY_BUTTON_SCALE", "VIBRATION_OFFSETS", "FONT_PATH", "WATER_MARGIN_RATIO",
+}
+# everything else (physics, colors, frame rates, ...) is read live every frame.
+# asset paths and cache budgets are handled by Assets.reload_for_settings().
+
+class SettingsError(ValueError):
+    pass
+
+def snapshot_settings():
+    """Current value of every setting. removing a key from a profile restores this value."""
+    return {name: value for name, value in vars(settings).items()
+            if name.isupper() and not name.startswith("_")}
+
+def _coerce(name, value, default):
+    """Checks `value` against the type of the default and converts json types back."""
+    if default is None:
+        return value
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            raise SettingsError(f"{name} must be true/false, got {value!r}")
+        return value
+    if isinstance(default, (int, float)):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise SettingsError(f"{name} must be a number, got {value!r}")
+        return float(value) if isinstance(default, float) else value
+    if isinstance(default, str):
+        if not isinstance(value, str):
+            raise SettingsError(f"{name} must be a string, got {value!r}")
+        if name.endswith("_PATH") and not os.path.isabs(value):
+            value = settings.get_asset_path(value)
+        return value
+    if isinstance(default, tuple):
+        if not isinstance(value, list):
+            raise SettingsError(f"{name} must be a list, got {value!r}")
+        return tuple(value)
+    if isinstance(default, list):
+        if not isinstance(value, list):
+            raise SettingsError(f"{name} must be a list, got {value!r}")
+        return [tuple(item) if isinstance(item, list) else item for item in value]
+    if isinstance(default, dict):
+        if not isinstance(value, dict):
+            raise SettingsError(f"{name} must be an object, got {value!r}")
+        if default and all(isinstance(key, int) for key in default):
+            # json object keys are always strings
+            try:
+                return {int(key): item for key, item in value.items()}
+            except ValueError:
+                raise SettingsError(f"{name} keys must be whole numbers, got {list(value)!r}")
+        return value
+    return value
+
+def load_profile(path, defaults):
+    """Parses and validates a profile against `defaults`. Returns {name: value}, raises SettingsError."""
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        raise SettingsError(f"Could not read settings profile {path}: {e}")
+    if not isinstance(profile, dict):
+        raise SettingsError(f"Settings profile {path} must be a json object")
+
+    overrides = {}
+    for name, value in profile.items():
+        if name.startswith("_"):
+            continue
+        if name not in defaults:
+            raise SettingsError(f"Unknown setting in {path}: {name}")
+        overrides[name] = _coerce(name, value, defaults[name])
+    return overrides
+
+def apply_overrides(overrides, defaults):
+    """Sets every override (and restores defaults for the rest). Returns the names that changed."""
+    changed = set()
+    for name, default in defaults.items():
+        value = overrides.get(name, default)
+        if getattr(settings, name) != value:
+            setattr(settings, name, value)
+            changed.add(name)
+    return changed
+
+class SettingsWatcher:
+    """Polls a settings profile for changes and applies it between frames."""
+    def __init__(self, path, poll_interval_ms=None):
+        self.path = path
+        self.defaults = snapshot_settings()
+        self.poll_interval = (poll_interval_ms or settings.SETTINGS_POLL_INTERVAL_MS) / 1000.0
+        self.last_poll = 0.0
+        self.last_mtime = None
+        self.reloads = 0
+
+    def _mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self):
+        """Applies the profile now. Returns the changed names (empty on error)."""
+        self.last_mtime = self._mtime()
+        try:
+            overrides = load_profile(self.path, self.defaults)
+        except SettingsError as e:
+            # keep running with the previous values until the file is fixed
+            print(e)
+            return set()
+        changed = apply_overrides(overrides, self.defaults)
+        self.reloads += 1
+        if changed:
+            print(f"Settings reloaded from {self.path}: {', '.join(sorted(changed))}")
+        return changed
+
+    def poll(self):
+        """Cheap check, call once per frame. Returns the changed names (usually empty)."""
+        now = time.monotonic()
+        if now - self.last_poll < self.poll_interval:
+            return set()
+        self.last_poll = now
+        mtime = self._mtime()
+        if mtime is None or mtime == self.last_mtime:
+            return set()
+        return self.load()
@@ -0,0 +1,138 @@
+import math
+import time
+import pygame
+import settings
+from reel_input import now_ms
+
+# frame pacing per game state.
+# interactive states (fishing, cutscene) render at their fps cap every frame.
+# idle states (menu, waiting, won, lost) block in pygame.event.wait() and only
+# redraw when an event arrives, the state changes, or a scheduled change (like
+# the bite timer) is due. that's what keeps fanless kiosks cool on the menu.
+# capped states sleep out the frame in pygame.event.wait() rather than
+# clock.tick(), so input that arrives mid-sleep is timestamped when it happens
+# (see reel_input.py) and handed to the game loop on the next frame.
+
+# events that never change what's on screen, so they don't cause an idle redraw
+_IGNORED_IDLE_EVENTS = {pygame.MOUSEMOTION, pygame.ACTIVEEVENT, pygame.WINDOWMOVED}
+
+class FramePacer:
+    """Decides when to wait, when to render and how long to sleep between frames."""
+    def __init__(self, clock, on_event=None):
+        self.clock = clock
+        self.on_event = on_event # called with (event, now_ms()) as each event is dequeued
+        self.pending_events = [] # dequeued while sleeping, returned next frame
+        self.last_drawn_state = None
+        self.last_draw_ticks = 0
+        self.last_frame_ms = now_ms()
+
+        # --- metrics ---
+        self.start_time = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.frames_rendered = 0
+        self.idle_wakeups = 0
+        self.idle_seconds = 0.0
+        self.frames_by_state = {}
+
+    def frame_rate(self, state):
+        """Returns the fps cap for a state (0 = uncapped) or None if the state is idle."""
+        return settings.STATE_FRAME_RATES.get(state, settings.MAX_FRAME_RATE)
+
+    def wait_for_events(self, state, next_deadline=None):
+        """Collects this frame's events. Returns (events, should_redraw).
+
+        for idle states this blocks until an event arrives, `next_deadline`
+        (in pygame ticks) passes, or IDLE_REDRAW_INTERVAL_MS has gone by.
+        """
+        if self.frame_rate(state) is not None or state != self.last_drawn_state:
+            return self._collect(), True
+
+        now = pygame.time.get_ticks()
+        timeout = settings.IDLE_REDRAW_INTERVAL_MS - (now - self.last_draw_ticks)
+        if next_deadline is not None:
+            timeout = min(timeout, next_deadline - now)
+        if timeout <= 0 or self.pending_events:
+            return self._collect(), True
+
+        wait_start = time.perf_counter()
+        event = pygame.event.wait(timeout)
+        self.idle_seconds += time.perf_counter() - wait_start
+        self.idle_wakeups += 1
+
+        if event.type == pygame.NOEVENT: # timed out, so something is due
+            return self._collect(), True
+        self._stamp(event)
+        events = self._collect()
+        return events, any(e.type not in _IGNORED_IDLE_EVENTS for e in events)
+
+    def _stamp(self, event):
+        self.pending_events.append(event)
+        if self.on_event:
+            self.on_event(event, now_ms())
+
+    def _collect(self):
+        """Everything dequeued so far plus whatever is waiting in the queue now."""
+        for event in pygame.event.get():
+            self._stamp(event)
+        events, self.pending_events = self.pending_events, []
+        return events
+
+    def request_redraw(self):
+        """Makes the next frame render even if the current state is idle."""
+        self.last_drawn_state = None
+
+    def end_frame(self, state):
+        """Call after display.flip(). Sleeps to the state's fps cap."""
+        self.last_drawn_state = state
+        self.last_draw_ticks = pygame.time.get_ticks()
+        self.frames_rendered += 1
+        self.frames_by_state[state] = self.frames_by_state.get(state, 0) + 1
+        rate = self.frame_rate(state)
+        now = now_ms()
+        if rate:
+            period = 1000.0 / rate
+            deadline = self.last_frame_ms + period
+            self._sleep_until(deadline)
+            now = now_ms()
+            # wakeups overshoot by up to a ms, schedule from the deadline so that doesn't add up
+            if now - deadline < period:
+                now = deadline
+        self.last_frame_ms = now
+        # the sleep already happened (or the state is idle/uncapped), just keep the clock ticking
+        self.clock.tick()
+
+    def _sleep_until(self, deadline_ms):
+        """Sleeps like clock.tick(), but wakes for every event to timestamp it."""
+        while True:
+            remaining = deadline_ms - now_ms()
+            if remaining <= 0:
+                return
+            event = pygame.event.wait(math.ceil(remaining))
+            if event.type != pygame.NOEVENT:
+                self._stamp(event)
+
+    def stats(self):
+        wall = time.perf_counter() - self.start_time
+        cpu = time.process_time() - self.start_cpu
+        fixed_rate_frames = int(wall * settings.MAX_FRAME_RATE)
+        return {
+            "wall_seconds": round(wall, 2),
+            "cpu_seconds": round(cpu, 2),
+            "cpu_percent": round(100.0 * cpu / wall, 1) if wall > 0 else 0.0,
+            "idle_seconds": round(self.idle_seconds, 2),
+            "idle_wakeups": self.idle_wakeups,
+            "frames_rendered": self.frames_rendered,
+            # what a fixed clock.tick(MAX_FRAME_RATE) loop would have drawn
+            "frames_skipped": max(0, fixed_rate_frames - self.frames_rendered),
+            "frames_by_state": dict(self.frames_by_state),
+        }
+
+    def report(self):
+        s = self.stats()
+        print("--- Frame Pacing ---")
+        print(f"{s['frames_rendered']} frames in {s['wall_seconds']}s, "
+              f"{s['frames_skipped']} skipped vs a fixed {settings.MAX_FRAME_RATE} fps loop")
+        print(f"CPU {s['cpu_seconds']}s ({s['cpu_percent']}%), idle {s['idle_seconds']}s over {s['idle_wakeups']} waits")
+        for state, frames in sorted(s["frames_by_state"].items()):
+            print(f"  {state}: {frames} frames")
+        print("--------------------")
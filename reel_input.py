@@ -0,0 +1,145 @@
+import collections
+import time
+import pygame
+import settings
+
+# event-timestamped reel input for the catch minigame.
+# instead of sampling key.get_pressed() once per frame (which loses taps shorter
+# than a frame and adds up to a frame of latency), every press/release is
+# recorded with the time it was dequeued. FramePacer dequeues events while it
+# sleeps out the frame cap, so the stamps are accurate to about a millisecond.
+# each physics tick then asks for the fraction of the last tick the reel was
+# held and applies that much thrust.
+# with --capture-fps the game runs on a capture.FixedStepClock, and the reel is
+# given that clock instead: events are stamped with the game time of the frame
+# they arrive in, so a recording doesn't depend on how fast it was made.
+
+def now_ms():
+    """High resolution timestamp in ms (same clock for events and ticks)."""
+    return time.perf_counter() * 1000.0
+
+class ReelInput:
+    """Tracks the reel button (space or left mouse) from timestamped events."""
+    def __init__(self, latency_samples=None, clock=None):
+        self.clock = clock or now_ms # ms timestamps for events and ticks
+        self.held_by = set() # 'key' and/or 'mouse'
+        self.transitions = [] # (timestamp, held) since the last tick
+        self.held_at_last_tick = False
+        self.last_tick = None
+        self.pending_presses = [] # press timestamps not applied by a tick yet
+
+        # --- metrics ---
+        self.latencies = collections.deque(maxlen=latency_samples or settings.INPUT_LATENCY_SAMPLES)
+        self.new_latencies = [] # drained by telemetry
+        self.taps_saved = 0 # presses released before the tick that would have sampled them
+
+    @property
+    def held(self):
+        return bool(self.held_by)
+
+    def handle_event(self, event, stamp=None):
+        """Call for every event as it is dequeued, with now_ms() at that moment (or leave it to the clock)."""
+        stamp = self.clock() if stamp is None else stamp
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+            self._set('key', True, stamp)
+        elif event.type == pygame.KEYUP and event.key == pygame.K_SPACE:
+            self._set('key', False, stamp)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self._set('mouse', True, stamp)
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self._set('mouse', False, stamp)
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            # the release would go to another window, don't reel forever
+            self.held_by.clear()
+            self._push(False, stamp)
+
+    def _set(self, source, down, stamp):
+        was_held = self.held
+        if down:
+            self.held_by.add(source)
+        else:
+            self.held_by.discard(source)
+        if self.held != was_held:
+            self._push(self.held, stamp)
+            if self.held:
+                self.pending_presses.append(stamp)
+
+    def _push(self, held, stamp):
+        if not self.transitions or self.transitions[-1][1] != held:
+            self.transitions.append((stamp, held))
+
+    def tick(self, now=None):
+        """Fraction (0-1) of the time since the previous tick that the reel was held."""
+        now = self.clock() if now is None else now
+        # the first tick of a catch (or one after a long stall) only looks back one max-length tick
+        start = now - settings.INPUT_MAX_TICK_MS
+        if self.last_tick is not None:
+            start = max(start, self.last_tick)
+
+        held_ms = 0.0
+        held, since = self.held_at_last_tick, start
+        for stamp, new_held in self.transitions:
+            stamp = min(max(stamp, start), now)
+            if held:
+                held_ms += stamp - since
+            held, since = new_held, stamp
+        if held:
+            held_ms += now - since
+
+        # presses released again before this tick, each one a tap per-frame polling would have missed
+        pressed = False
+        for _, new_held in self.transitions:
+            if new_held:
+                pressed = True
+            elif pressed:
+                self.taps_saved += 1
+                pressed = False
+
+        if self.pending_presses:
+            for press in self.pending_presses:
+                latency = max(0.0, now - press)
+                self.latencies.append(latency)
+                self.new_latencies.append(latency)
+            self.pending_presses.clear()
+
+        self.transitions.clear()
+        self.held_at_last_tick = self.held
+        self.last_tick = now
+        span = now - start
+        if span <= 0:
+            return 1.0 if held else 0.0
+        return min(1.0, held_ms / span)
+
+    def reset(self):
+        """Forgets the tick history (new catch). The held state is kept."""
+        self.transitions.clear()
+        self.pending_presses.clear()
+        self.held_at_last_tick = self.held
+        self.last_tick = None
+
+    def drain_latencies(self):
+        latencies, self.new_latencies = self.new_latencies, []
+        return latencies
+
+    def stats(self):
+        samples = sorted(self.latencies)
+        if not samples:
+            return {"presses": 0, "taps_saved": self.taps_saved}
+        return {
+            "presses": len(samples),
+            "taps_saved": self.taps_saved,
+            "mean_ms": round(sum(samples) / len(samples), 2),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+            "max_ms": round(samples[-1], 2),
+        }
+
+    def report(self):
+        s = self.stats()
+        print("--- Reel Input ---")
+        if not s["presses"]:
+            print("no reel presses during a catch")
+        else:
+            print(f"input to physics latency over the last {s['presses']} presses: "
+                  f"mean {s['mean_ms']}ms, p95 {s['p95_ms']}ms, max {s['max_ms']}ms")
+            print(f"{s['taps_saved']} sub-frame taps applied that per-frame polling would have missed")
+        print("------------------")
@@ -0,0 +1,230 @@
+import argparse
+import os
+import random
+import struct
+import settings
+from game_logic import FishingMinigame, ALL_FISH_CLASSES
+
+# save state snapshots, so an interrupted kiosk session can carry on where it was.
+# a snapshot is a few fixed-size struct records (about 2.6 KB, nearly all of it
+# the random module's mersenne twister state), so encoding and decoding take
+# microseconds and writing one every few seconds never shows up as a hitch.
+#     python go_fish.py --save-state savestate.bin  # write snapshots while playing
+#     python go_fish.py --resume                    # restore the last snapshot and carry on
+#     python savestate.py show savestate.bin
+#     python savestate.py edit savestate.bin test.bin catch_progress=95 species=8
+# snapshots are only written when asked for (those flags, or SAVE_STATES_ENABLED).
+# times are stored relative to the moment of the snapshot (pygame ticks restart
+# with every process) and positions together with the track they were on, so a
+# snapshot restores on a different window size too.
+
+SAVE_MAGIC = b"GFSV"
+SAVE_VERSION = 1
+
+STATES = ('menu', 'waiting_for_bite', 'fishing', 'won', 'lost', 'cutscene')
+
+# magic, version, state, has minigame, fast catch cheat, bite indicator shown,
+# highscore, ms until the bite, ms spent waiting, cutscene frame, ms into that frame
+HEADER = struct.Struct("<4sHB???diiHi")
+# species, first hit made, fish move timer, weight, size, catch bar y/vel,
+# fish y/vel/target y, catch progress, track y, track h
+MINIGAME = struct.Struct("<B?idddddddddd")
+# random.getstate(): version, 625 words of twister state, has gauss_next, gauss_next
+RNG = struct.Struct("<i625I?d")
+
+HEADER_FIELDS = ("magic", "version", "state", "has_minigame", "fast_catch", "show_bite_indicator",
+                 "highscore", "bite_in_ms", "waiting_ms", "cutscene_frame_index", "cutscene_into_frame_ms")
+MINIGAME_FIELDS = ("species", "first_hit_made", "fish_move_timer", "weight", "size", "catch_bar_y",
+                   "catch_bar_vel", "fish_y", "fish_vel", "fish_target_y", "catch_progress", "track_y", "track_h")
+
+class SaveStateError(ValueError):
+    pass
+
+# ---- encode / decode ----
+def snapshot(gs):
+    """Reads the game state into a flat dict of snapshot fields."""
+    now = gs.ticks()
+    fields = {
+        "magic": SAVE_MAGIC,
+        "version": SAVE_VERSION,
+        "state": STATES.index(gs.game_state),
+        "has_minigame": gs.minigame is not None,
+        "fast_catch": gs.cheats["fast_catch"],
+        "show_bite_indicator": gs.show_bite_indicator,
+        "highscore": gs.highscore,
+        "bite_in_ms": max(0, gs.bite_time - now) if gs.game_state == 'waiting_for_bite' else 0,
+        "waiting_ms": now - gs.waiting_start_time if gs.game_state == 'waiting_for_bite' else 0,
+        "cutscene_frame_index": gs.cutscene_frame_index if gs.game_state == 'cutscene' else 0,
+        "cutscene_into_frame_ms": now - gs.cutscene_frame_start if gs.game_state == 'cutscene' else 0,
+        "rng": random.getstate(),
+    }
+    game = gs.minigame
+    if game is not None:
+        fields.update({
+            "species": ALL_FISH_CLASSES.index(type(game.fish)),
+            "first_hit_made": game.first_hit_made,
+            "fish_move_timer": game.fish_move_timer,
+            "weight": game.fish.weight,
+            "size": game.fish.size,
+            "catch_bar_y": game.catch_bar_y,
+            "catch_bar_vel": game.catch_bar_vel,
+            "fish_y": game.fish_y,
+            "fish_vel": game.fish_vel,
+            "fish_target_y": game.fish_target_y,
+            "catch_progress": game.catch_progress,
+            "track_y": gs.track_y,
+            "track_h": gs.track_h,
+        })
+    return fields
+
+def encode(fields):
+    """Packs snapshot fields into bytes. Raises SaveStateError for a missing or out of range field."""
+    try:
+        parts = [HEADER.pack(*(fields[name] for name in HEADER_FIELDS))]
+        if fields["has_minigame"]:
+            parts.append(MINIGAME.pack(*(fields[name] for name in MINIGAME_FIELDS)))
+        version, state, gauss_next = fields["rng"]
+        parts.append(RNG.pack(version, *state, gauss_next is not None, gauss_next or 0.0))
+    except KeyError as e:
+        raise SaveStateError(f"Save state has no {e} field")
+    except struct.error as e:
+        raise SaveStateError(f"Can't encode save state: {e}")
+    return b"".join(parts)
+
+def decode(data):
+    """Unpacks bytes from encode(). Raises SaveStateError for anything that isn't a v1 snapshot."""
+    if len(data) < HEADER.size:
+        raise SaveStateError("Save state is truncated")
+    fields = dict(zip(HEADER_FIELDS, HEADER.unpack_from(data)))
+    if fields["magic"] != SAVE_MAGIC:
+        raise SaveStateError("Not a save state file")
+    if fields["version"] != SAVE_VERSION:
+        raise SaveStateError(f"Unsupported save state version {fields['version']} (expected {SAVE_VERSION})")
+    if fields["state"] >= len(STATES):
+        raise SaveStateError(f"Unknown game state {fields['state']} in save state")
+
+    offset = HEADER.size
+    expected = offset + (MINIGAME.size if fields["has_minigame"] else 0) + RNG.size
+    if len(data) != expected:
+        raise SaveStateError(f"Save state is {len(data)} bytes, expected {expected}")
+    if fields["has_minigame"]:
+        fields.update(zip(MINIGAME_FIELDS, MINIGAME.unpack_from(data, offset)))
+        offset += MINIGAME.size
+        if fields["species"] >= len(ALL_FISH_CLASSES):
+            raise SaveStateError(f"Unknown species {fields['species']} in save state")
+    elif STATES[fields["state"]] in ('fishing', 'won', 'cutscene'):
+        raise SaveStateError(f"Save state in '{STATES[fields['state']]}' has no catch")
+
+    rng = RNG.unpack_from(data, offset)
+    fields["rng"] = (rng[0], tuple(rng[1:626]), rng[627] if rng[626] else None)
+    return fields
+
+# ---- apply ----
+def restore(gs, fields):
+    """Puts a decoded snapshot back into the game state.
+
+    timers are not touched: the caller reschedules the bite or the cutscene
+    from gs.bite_time / cutscene_frame_index (see go_fish.resume_from_snapshot).
+    """
+    now = gs.ticks()
+    gs.game_state = STATES[fields["state"]]
+    gs.cheats["fast_catch"] = fields["fast_catch"]
+    gs.show_bite_indicator = fields["show_bite_indicator"]
+    gs.highscore = fields["highscore"]
+    gs.waiting_start_time = now - fields["waiting_ms"]
+    gs.bite_time = now + fields["bite_in_ms"]
+    gs.cutscene_frame_index = fields["cutscene_frame_index"]
+
+    gs.minigame = None
+    if fields["has_minigame"]:
+        # the constructor rolls a new fish, so the rng is restored afterwards
+        game = FishingMinigame(gs, fish_class=ALL_FISH_CLASSES[fields["species"]])
+        game.fish.weight = game.current_fish_weight = fields["weight"]
+        game.fish.size = game.current_fish_size = fields["size"]
+        game.first_hit_made = fields["first_hit_made"]
+        game.fish_move_timer = fields["fish_move_timer"]
+        game.catch_bar_vel = fields["catch_bar_vel"]
+        game.fish_vel = fields["fish_vel"]
+        game.catch_progress = fields["catch_progress"]
+        # positions are relative to the track they were saved on
+        ratio = gs.track_h / fields["track_h"] if fields["track_h"] else 1.0
+        game.catch_bar_y = gs.track_y + (fields["catch_bar_y"] - fields["track_y"]) * ratio
+        game.fish_y = gs.track_y + (fields["fish_y"] - fields["track_y"]) * ratio
+        game.fish_target_y = gs.track_y + (fields["fish_target_y"] - fields["track_y"]) * ratio
+        game.catch_bar_vel *= ratio
+        game.fish_vel *= ratio
+        gs.minigame = game
+
+    random.setstate(fields["rng"])
+
+# ---- files ----
+def save(gs, path):
+    """Writes a snapshot atomically (a crash mid-write leaves the previous one)."""
+    data = encode(snapshot(gs))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+def load(path):
+    try:
+        with open(path, "rb") as f:
+            return decode(f.read())
+    except OSError as e:
+        raise SaveStateError(f"Could not read save state {path}: {e}")
+
+# ---- cli (inspect / make test states) ----
+def _parse_value(text):
+    if text in ("true", "false"):
+        return text == "true"
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    if text in STATES:
+        return STATES.index(text)
+    return text
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or edit go fish save states")
+    sub = parser.add_subparsers(dest="command", required=True)
+    show_parser = sub.add_parser("show")
+    show_parser.add_argument("path", nargs="?", default=settings.SAVE_STATE_PATH)
+    edit_parser = sub.add_parser("edit", help="copy a snapshot with some fields changed")
+    edit_parser.add_argument("path")
+    edit_parser.add_argument("out")
+    edit_parser.add_argument("changes", nargs="+", metavar="field=value")
+    cli = parser.parse_args()
+
+    try:
+        fields = load(cli.path)
+    except SaveStateError as e:
+        parser.exit(1, f"{e}\n")
+
+    if cli.command == "show":
+        for name in HEADER_FIELDS + (MINIGAME_FIELDS if fields["has_minigame"] else ()):
+            value = fields[name]
+            if name == "state":
+                value = STATES[value]
+            elif name == "species":
+                value = f"{value} ({ALL_FISH_CLASSES[value].__name__})"
+            print(f"{name}: {value}")
+    else:
+        for change in cli.changes:
+            name, _, text = change.partition("=")
+            if name not in fields or name in ("magic", "version", "rng"):
+                parser.error(f"Unknown or read-only field: {name}")
+            fields[name] = _parse_value(text)
+        try:
+            data = encode(fields)
+            decode(data) # same checks as loading it in the game
+        except SaveStateError as e:
+            parser.exit(1, f"Not writing {cli.out}: {e}\n")
+        with open(cli.out, "wb") as f:
+            f.write(data)
+        print(f"Wrote {len(data)} bytes to {cli.out}")
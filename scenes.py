@@ -0,0 +1,75 @@
+# scene system: one object per game state.
+# the main loop used to walk the same if/elif chain of state names for every
+# event, for the logic and again for drawing. now SceneManager looks up the
+# scene for gs.game_state once and hands it the frame. each scene maps event
+# types to handlers in a dict, so dispatching an event is one lookup.
+# enter()/exit() run when the state changes. layout() builds a scene's button
+# rects and static text. it runs on enter and after a resize instead of every
+# frame.
+# game code still switches states by setting gs.game_state (game_logic, the
+# scheduler callbacks and savestate.restore all do). sync() notices the change
+# and runs the hooks before the next event or frame reaches a scene.
+
+class Scene:
+    """Base class for a game state. Subclasses fill in handlers and override the hooks."""
+    name = None # the gs.game_state this scene handles
+
+    def __init__(self):
+        self.handlers = {} # event type -> handler(event)
+        self.buttons = {} # button name -> pygame.Rect, for clicks and the bots (see bots.Bot.drive)
+
+    def enter(self, previous):
+        """Called when the game switches to this scene (`previous` is the old state name or None)."""
+        pass
+
+    def exit(self, next_state):
+        """Called when the game leaves this scene."""
+        pass
+
+    def layout(self):
+        """Builds rects and pre-rendered text for the current Layout. Runs on enter and on resize."""
+        pass
+
+    def update(self):
+        """Per-frame logic, before drawing."""
+        pass
+
+    def draw(self, screen):
+        pass
+
+class SceneManager:
+    """Owns the scenes and keeps the current one in step with gs.game_state."""
+    def __init__(self, gs, scenes, handlers=None):
+        self.gs = gs
+        self.scenes = {scene.name: scene for scene in scenes}
+        self.handlers = handlers or {} # event type -> handler(event), for every scene
+        self.current = None
+        self.transitions = 0
+
+    def sync(self):
+        """Runs exit/enter if gs.game_state changed since the last call. Returns the current scene."""
+        state = self.gs.game_state
+        current = self.current
+        if current is not None and current.name == state:
+            return current
+        if current is not None:
+            current.exit(state)
+        self.current = self.scenes[state]
+        self.current.layout()
+        self.current.enter(current.name if current else None)
+        self.transitions += 1
+        return self.current
+
+    def dispatch(self, event):
+        handler = self.handlers.get(event.type)
+        if handler:
+            handler(event)
+        # a global handler (or the previous event) may have switched the state
+        handler = self.sync().handlers.get(event.type)
+        if handler:
+            handler(event)
+
+    def relayout(self):
+        """Call after the Layout changed. Other scenes rebuild theirs on enter anyway."""
+        if self.current is not None:
+            self.current.layout()
@@ -0,0 +1,74 @@
+import heapq
+import itertools
+
+# central scheduler for timed game events (bite timer, cutscene frames, sound cues).
+# states register callbacks at absolute pygame ticks instead of comparing
+# get_ticks() against their own timestamps every frame. the game loop runs
+# whatever is due once per frame and hands next_deadline() to the frame pacer,
+# so idle screens can sleep right up to the next timed change.
+# timers live in a binary heap; cancelling only flags a timer and it is dropped
+# when it reaches the top, so cancel() is O(1).
+
+class Timer:
+    """Handle for a scheduled callback. cancel() stops it from firing."""
+    __slots__ = ("when", "seq", "callback", "args", "group", "cancelled")
+
+    def __init__(self, when, seq, callback, args, group):
+        self.when = when
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.group = group
+        self.cancelled = False
+
+    def __lt__(self, other):
+        # same deadline fires in the order it was scheduled
+        return (self.when, self.seq) < (other.when, other.seq)
+
+    def cancel(self):
+        self.cancelled = True
+
+class Scheduler:
+    def __init__(self):
+        self.heap = []
+        self.counter = itertools.count()
+        self.fired = 0
+
+    def schedule(self, when, callback, *args, group=None):
+        """Calls callback(*args, when) once pygame ticks reach `when`. Returns a Timer."""
+        timer = Timer(when, next(self.counter), callback, args, group)
+        heapq.heappush(self.heap, timer)
+        return timer
+
+    def cancel_group(self, group):
+        """Cancels every pending timer registered with `group` (e.g. when a state is left)."""
+        for timer in self.heap:
+            if timer.group == group:
+                timer.cancelled = True
+
+    def _drop_cancelled(self):
+        while self.heap and self.heap[0].cancelled:
+            heapq.heappop(self.heap)
+
+    def next_deadline(self):
+        """Ticks of the earliest pending timer, or None."""
+        self._drop_cancelled()
+        return self.heap[0].when if self.heap else None
+
+    def run_due(self, now):
+        """Fires every timer due at `now`, earliest first. Returns how many fired.
+
+        callbacks get their own deadline as the last argument so follow-up
+        timers can be scheduled from it instead of from `now`, which keeps
+        chains (like cutscene frames) from drifting.
+        """
+        fired = 0
+        while True:
+            self._drop_cancelled()
+            if not self.heap or self.heap[0].when > now:
+                break
+            timer = heapq.heappop(self.heap)
+            timer.callback(*timer.args, timer.when)
+            fired += 1
+        self.fired += fired
+        return fired
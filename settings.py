@@ -31,6 +31,35 @@ PROGRESS_HIGH_IMG_PATH = get_asset_path("progress_high.png")
 PROGRESS_MID_IMG_PATH = get_asset_path("progress_mid.png")
 PROGRESS_LOW_IMG_PATH = get_asset_path("progress_low.png")
 
+# --- texture atlas ---
+# species id -> source png. the species id is what Fish.species_id refers to.
+FISH_SPRITE_PATHS = {
+    "carp": FISH_CARP_PATH,
+    "sardine": FISH_SARDINE_PATH,
+    "bream": FISH_BREAM_PATH,
+    "bass": FISH_BASS_PATH,
+    "trout": FISH_TROUT_PATH,
+    "salmon": FISH_SALMON_PATH,
+    "tuna": FISH_TUNA_PATH,
+    "pufferfish": FISH_PUFFERFISH_PATH,
+    "shark": FISH_SHARK_PATH,
+    "legend": FISH_LEGEND_PATH,
+}
+FISH_ART_CACHE_MB = 16 # fish art is loaded per species on demand and unloaded LRU past this
+
+INDICATOR_SPRITE_PATHS = {
+    "waiting": WAITING_IMG_PATH,
+    "bite": BITE_IMG_PATH,
+    "progress_high": PROGRESS_HIGH_IMG_PATH,
+    "progress_mid": PROGRESS_MID_IMG_PATH,
+    "progress_low": PROGRESS_LOW_IMG_PATH,
+}
+# everything that gets packed by `python atlas.py`. fish aren't packed, they're
+# loaded one species at a time (see assets.SpeciesArtCache).
+ATLAS_SPRITES = dict(INDICATOR_SPRITE_PATHS)
+ATLAS_INDEX_PATH = get_asset_path("atlas.json")
+ATLAS_MAX_SHEET_SIZE = 4096
+
 CASTING_SOUND_PATH = get_asset_path("casting.mp3")
 BITE_SOUND_PATH = get_asset_path("bite.mp3")
 REELING_SOUND_PATH = get_asset_path("reeling.mp3")
@@ -39,13 +68,96 @@ LOSE_SOUND_PATH = get_asset_path("lose.mp3")
 CUTSCENE_SOUND_1_PATH = get_asset_path("cutscene_sfx_1.mp3")
 CUTSCENE_SOUND_30_PATH = get_asset_path("cutscene_sfx_30.mp3")
 CUTSCENE_SOUND_60_PATH = get_asset_path("cutscene_sfx_60.mp3")
+# cutscene frame index -> Assets sound attribute played when that frame is shown
+CUTSCENE_SOUND_CUES = {
+    0: "cutscene_sound_1",
+    19: "cutscene_sound_30", # frame 20
+    39: "cutscene_sound_60", # frame 40
+}
 MAIN_BGM_PATH = get_asset_path("main_bgm.mp3")
 TENSION_BGM_PATH = get_asset_path("tension_bgm.mp3")
 BUTTON_CLICK_SOUND_PATH = get_asset_path("button_click.mp3")
+# written by the asset build step (`python asset_manifest.py`), read once at startup
+ASSET_MANIFEST_PATH = get_asset_path("manifest.json")
 
 # --- screen settings ---
+# default window size. can be overridden with `--resolution WxH` or the
+# GO_FISH_RESOLUTION environment variable, and the window can be resized.
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
+RESIZABLE_WINDOW = True
+FULLSCREEN = False
+MIN_SCREEN_SIZE = (320, 240)
+
+# --- frame pacing ---
+MAX_FRAME_RATE = 60
+# fps cap per game state (0 = uncapped). None makes a state idle: it only redraws
+# when an event arrives or something is scheduled to change (see pacing.py).
+STATE_FRAME_RATES = {
+    'menu': None,
+    'waiting_for_bite': None,
+    'won': None,
+    'lost': None,
+    'fishing': MAX_FRAME_RATE,
+    'cutscene': None, # frames advance on the scheduler, so it only redraws when one is due
+}
+IDLE_REDRAW_INTERVAL_MS = 1000 # idle screens still redraw at least this often
+PRINT_PACING_STATS = True # print frames drawn / cpu used when the game closes
+
+# --- reel input (see reel_input.py) ---
+INPUT_MAX_TICK_MS = 50.0 # the first tick of a catch (or one after a stall) looks back at most this far
+INPUT_LATENCY_SAMPLES = 1000 # presses kept for the latency stats
+PRINT_INPUT_STATS = True # print input latency when the game closes
+
+# --- hot reload (see live_settings.py) ---
+SETTINGS_POLL_INTERVAL_MS = 500 # how often the --settings-profile file's mtime is checked
+
+# --- telemetry (see telemetry.py) ---
+TELEMETRY_ENABLED = False # opt in (or --telemetry): writes TELEMETRY_DB_PATH and prints a summary at exit
+TELEMETRY_DB_PATH = os.path.join(os.path.dirname(__file__), "telemetry.db")
+TELEMETRY_BUFFER_RECORDS = 4096 # ring buffer size, records past this are dropped until the writer catches up
+TELEMETRY_FLUSH_INTERVAL_S = 2.0
+TELEMETRY_PROGRESS_SAMPLE_MS = 250
+
+# --- water effects (see water.py, needs numpy) ---
+WATER_EFFECTS_ENABLED = True
+WATER_BUDGET_MS = 2.0 # per frame. over budget the quality drops a level
+# quality levels from best to worst: (grid downscale factor, smooth upscale)
+WATER_QUALITY_LEVELS = [(2, True), (3, True), (4, True), (4, False), (6, False)]
+WATER_MARGIN_RATIO = 0.35 # water animates this far (x track height) either side of the track
+WATER_DAMPING = 0.94 # how much of a ripple survives each frame
+WATER_LINE_RIPPLE = 6.0 # push from the line each frame, more when the fish moves fast
+WATER_LINE_PERIOD = 8 # frames the line spends going up (then down) while it bobs
+WATER_SPLASH = 120.0 # push from the splash on the first hit
+WATER_DISPLACEMENT = 1.5 # background pixels shifted per unit of water slope, grows with catch progress
+WATER_SHADING = 1.5 # brightness added per unit of water slope
+WATER_ALPHA = 40.0 # layer opacity per unit of water slope (calm water is fully transparent)
+WATER_CALM_HEIGHT = 0.4 # water lower than this counts as calm and isn't redrawn
+
+# --- save states (see savestate.py) ---
+SAVE_STATES_ENABLED = False # opt in (or --save-state / --resume), e.g. for kiosks
+SAVE_STATE_PATH = os.path.join(os.path.dirname(__file__), "savestate.bin")
+SAVE_STATE_INTERVAL_MS = 5000 # how often a snapshot is written while playing (0 = only on exit)
+
+# --- frame capture (see capture.py) ---
+CAPTURE_WORKERS = 0 # encoder processes, 0 = one per spare core (up to 4)
+CAPTURE_SLOTS = 8 # frames that can wait for an encoder before new ones are dropped
+CAPTURE_PNG_LEVEL = 1 # zlib level, 1 keeps up with 60 fps on two cores at 720p
+
+# --- bots / soak testing (see bots.py) ---
+BOT_THINK_TIME_MS = (300, 1200) # how long a bot looks at a menu/result screen before clicking
+SOAK_REPORT_INTERVAL_S = 60
+
+# the ui was laid out at 720p. pixel sizes (buttons, fonts, margins) are scaled
+# by screen_height / LAYOUT_REFERENCE_HEIGHT.
+LAYOUT_REFERENCE_HEIGHT = 720
+
+# memory budget for the per-resolution scaled image variants (see assets.ScaledSurfaceCache)
+SCALED_ASSET_CACHE_MB = 192
+# cutscene frames are scaled once per resolution and kept (see Assets.cutscene_frame),
+# but never taller than this. bigger screens stretch them when drawn, so 4k
+# doesn't pin 45 full-screen frames (~1.5 GB). at 540 they take ~85 MB
+CUTSCENE_MAX_HEIGHT = 540
 
 # --- colors ---
 WHITE = (255, 255, 255)
@@ -76,6 +188,15 @@ FISH_ACCEL = 0.2
 FISH_DRAG = 0.95
 FISH_CAUGHT_SLOWDOWN = 0.5 # multiplier for fish speed when being caught (e.g., 0.5 = 50% slower)
 
+# per-difficulty fish modifiers (see Fish.__init__): base + difficulty * per_level
+FISH_SPEED_MOD_BASE = 0.5
+FISH_SPEED_MOD_PER_LEVEL = 0.15
+FISH_GAIN_MOD_BASE = 1.5
+FISH_GAIN_MOD_PER_LEVEL = -0.1
+FISH_GAIN_MOD_MIN = 0.5
+FISH_LOSS_MOD_BASE = 0.5
+FISH_LOSS_MOD_PER_LEVEL = 0.1
+
 # --- fish probabilities ---
 # chance to encounter a fish from a certain tier. must sum to 100.
 TIER_CHANCES = {
@@ -143,6 +264,11 @@ FISH_TYPES = {
 GIF_SPEED_MULTIPLIER = 0.75
 PLAY_BUTTON_POS_X = 0.33
 PLAY_BUTTON_POS_Y = 0.33
+PLAY_BUTTON_SCALE = 0.5 # size of the play button png at 720p
+# offsets (720p pixels) the fishing scene jumps between while reeling. the whole
+# composite (background and progress overlay) moves, see go_fish.shake_blit().
+# offsets are free, the list can be as long as you like.
+VIBRATION_OFFSETS = [(2, 1), (-2, -1), (1, -2), (-1, 2), (-2, 2), (2, -2)]
 
 # --- debug settings ---
 # set to true to draw outlines around ui elements
@@ -0,0 +1,265 @@
+import argparse
+import sqlite3
+import struct
+import threading
+import time
+import settings
+from game_logic import ALL_FISH_CLASSES
+
+# per-session gameplay telemetry.
+# the game thread only packs fixed-size records into a preallocated ring buffer
+# (no locks, no allocation, no io). a background thread drains the buffer and
+# writes batches to sqlite every TELEMETRY_FLUSH_INTERVAL_S. if the writer falls
+# behind and the buffer fills up, new records are dropped and counted.
+# off by default, record with:
+#     python go_fish.py --telemetry
+# (or TELEMETRY_ENABLED in settings.py / a settings profile)
+#
+# query the results:
+#     python telemetry.py summary
+#     python telemetry.py species
+#     python telemetry.py sql "select count(*) from events"
+
+# ---- record kinds ----
+SESSION_START = 1 # a cast (or a restarted catch). a, b, c unused
+BITE_REACTION = 2 # a = ms from the bite to the click
+FISH = 3          # a = species index in ALL_FISH_CLASSES, b = difficulty, c = weight
+FIRST_HIT = 4     # a = ms from the start of the catch to the first hit
+PROGRESS = 5      # a = catch progress (0-100), b = ms since the start of the catch
+OUTCOME = 6       # a = OUTCOME_* code, b = catch duration in ms, c = score (0 unless won)
+INPUT_LATENCY = 7 # a = ms from a reel press to the physics tick that applied it
+
+OUTCOME_LOST = 0
+OUTCOME_WON = 1
+OUTCOME_ABANDONED = 2 # restarted or left mid-catch
+
+# session id, kind, wall clock timestamp, three values
+RECORD = struct.Struct("<IB3xdddd")
+
+# ---- ring buffer ----
+class RecordRing:
+    """Single-producer / single-consumer ring of fixed-size records.
+
+    the game thread only ever moves `head` and the writer thread only ever moves
+    `tail`, so neither side needs a lock.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * RECORD.size)
+        self.head = 0 # total records written (producer)
+        self.tail = 0 # total records read (consumer)
+        self.dropped = 0
+
+    def push(self, session, kind, a=0.0, b=0.0, c=0.0):
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return False
+        RECORD.pack_into(self.buffer, (head % self.capacity) * RECORD.size, session, kind, time.time(), a, b, c)
+        self.head = head + 1 # publish after the record is fully written
+        return True
+
+    def drain(self, limit=None):
+        """Returns the records written since the last drain (oldest first)."""
+        tail, head = self.tail, self.head
+        if limit is not None:
+            head = min(head, tail + limit)
+        records = [RECORD.unpack_from(self.buffer, (i % self.capacity) * RECORD.size) for i in range(tail, head)]
+        self.tail = head
+        return records
+
+# ---- background writer ----
+SCHEMA = """
+create table if not exists events (
+    session integer not null,
+    kind integer not null,
+    ts real not null,
+    a real, b real, c real
+);
+create index if not exists events_session on events (session);
+create index if not exists events_kind on events (kind);
+create table if not exists writer_stats (
+    ts real not null,
+    written integer not null,
+    dropped integer not null
+);
+"""
+
+class TelemetryWriter(threading.Thread):
+    """Drains the ring into sqlite in batches, on its own thread."""
+    def __init__(self, ring, db_path, flush_interval_s):
+        super().__init__(name="telemetry-writer", daemon=True)
+        self.ring = ring
+        self.db_path = db_path
+        self.flush_interval_s = flush_interval_s
+        self.stopping = threading.Event()
+        self.written = 0
+        self.reported_dropped = 0
+
+    def run(self):
+        db = sqlite3.connect(self.db_path)
+        db.executescript(SCHEMA)
+        try:
+            while not self.stopping.wait(self.flush_interval_s):
+                self.flush(db)
+            self.flush(db)
+        finally:
+            db.close()
+
+    def flush(self, db):
+        records = self.ring.drain()
+        dropped = self.ring.dropped
+        if not records and dropped == self.reported_dropped:
+            return
+        with db: # one transaction per batch
+            db.executemany("insert into events values (?, ?, ?, ?, ?, ?)", records)
+            db.execute("insert into writer_stats values (?, ?, ?)",
+                       (time.time(), len(records), dropped - self.reported_dropped))
+        self.written += len(records)
+        self.reported_dropped = dropped
+
+    def stop(self):
+        self.stopping.set()
+        self.join()
+
+# ---- session tracking (game thread) ----
+class Telemetry:
+    """Watches the game state once per frame and emits records on transitions.
+
+    all the game loop has to do is call observe(gs) on every drawn frame.
+    """
+    def __init__(self, db_path=None, capacity=None, flush_interval_s=None):
+        self.ring = RecordRing(capacity or settings.TELEMETRY_BUFFER_RECORDS)
+        self.writer = TelemetryWriter(self.ring, db_path or settings.TELEMETRY_DB_PATH,
+                                      flush_interval_s or settings.TELEMETRY_FLUSH_INTERVAL_S)
+        self.writer.start()
+
+        # sessions keep counting across runs, so ids stay unique in one db
+        self.session = int(time.time() * 1000) & 0xFFFFFFFF
+        self.session_has_catch = False
+        self.last_state = None
+        self.minigame = None
+        self.catch_start = 0
+        self.first_hit_seen = False
+        self.next_progress_sample = 0
+
+    def observe(self, gs, now):
+        """Call once per drawn frame with pygame.time.get_ticks()."""
+        state = gs.game_state
+        if gs.minigame is not self.minigame and self.minigame is not None and self.last_state == 'fishing':
+            # 'r' replaced the catch while it was running
+            self.end_catch(OUTCOME_ABANDONED, now)
+
+        if state != self.last_state:
+            if state == 'waiting_for_bite':
+                self.new_session()
+            elif self.last_state == 'fishing' and self.minigame is not None:
+                if state in ('won', 'cutscene'):
+                    self.end_catch(OUTCOME_WON, now, gs.minigame.fish.get_score())
+                elif state == 'lost':
+                    self.end_catch(OUTCOME_LOST, now)
+                else:
+                    self.end_catch(OUTCOME_ABANDONED, now)
+            if state == 'fishing' and self.last_state == 'waiting_for_bite':
+                self.ring.push(self.session, BITE_REACTION, now - gs.bite_time)
+
+        if state == 'fishing' and gs.minigame is not self.minigame:
+            self.start_catch(gs.minigame, now)
+
+        if state == 'fishing' and self.minigame is not None:
+            if gs.minigame.first_hit_made and not self.first_hit_seen:
+                self.first_hit_seen = True
+                self.ring.push(self.session, FIRST_HIT, now - self.catch_start)
+            if now >= self.next_progress_sample:
+                self.ring.push(self.session, PROGRESS, gs.minigame.catch_progress, now - self.catch_start)
+                self.next_progress_sample = now + settings.TELEMETRY_PROGRESS_SAMPLE_MS
+
+        for latency in gs.reel_input.drain_latencies():
+            self.ring.push(self.session, INPUT_LATENCY, latency)
+
+        self.last_state = state
+
+    def new_session(self):
+        self.session = (self.session + 1) & 0xFFFFFFFF
+        self.session_has_catch = False
+        self.ring.push(self.session, SESSION_START)
+
+    def start_catch(self, minigame, now):
+        # one catch per session, so a restarted catch gets its own session
+        if self.session_has_catch:
+            self.new_session()
+        self.session_has_catch = True
+        self.minigame = minigame
+        self.catch_start = now
+        self.first_hit_seen = False
+        self.next_progress_sample = now
+        species = ALL_FISH_CLASSES.index(type(minigame.fish))
+        self.ring.push(self.session, FISH, species, minigame.fish.difficulty, minigame.fish.weight)
+
+    def end_catch(self, outcome, now, score=0):
+        self.ring.push(self.session, OUTCOME, outcome, now - self.catch_start, score)
+        self.minigame = None
+
+    def close(self, now):
+        """Stops the writer. A catch still running at quit is recorded as abandoned."""
+        if self.minigame is not None:
+            self.end_catch(OUTCOME_ABANDONED, now)
+        self.writer.stop()
+        print(f"Telemetry: {self.writer.written} records written, {self.ring.dropped} dropped")
+
+# ---- query cli ----
+def _print_rows(cursor):
+    columns = [d[0] for d in cursor.description]
+    rows = cursor.fetchall()
+    widths = [max(len(str(c)), *(len(_fmt(r[i])) for r in rows)) if rows else len(str(c))
+              for i, c in enumerate(columns)]
+    print("  ".join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(_fmt(v).ljust(w) for v, w in zip(row, widths)))
+
+def _fmt(value):
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+QUERIES = {
+    "summary": f"""
+        select
+            (select count(*) from events where kind = {SESSION_START}) as sessions,
+            (select count(*) from events where kind = {OUTCOME}) as catches,
+            (select avg(a = {OUTCOME_WON}) from events where kind = {OUTCOME} and a != {OUTCOME_ABANDONED}) as win_rate,
+            (select avg(a) from events where kind = {BITE_REACTION}) as bite_reaction_ms,
+            (select avg(a) from events where kind = {FIRST_HIT}) as first_hit_ms,
+            (select avg(a) from events where kind = {INPUT_LATENCY}) as input_latency_ms,
+            (select avg(b) from events where kind = {OUTCOME} and a = {OUTCOME_WON}) as win_duration_ms,
+            (select max(c) from events where kind = {OUTCOME}) as best_score,
+            (select coalesce(sum(dropped), 0) from writer_stats) as dropped
+    """,
+    "species": f"""
+        select cast(f.a as integer) as species, cast(f.b as integer) as difficulty, count(*) as catches,
+               avg(o.a = {OUTCOME_WON}) as win_rate, avg(o.b) as duration_ms, avg(f.c) as weight
+        from events f join events o on o.session = f.session and o.kind = {OUTCOME}
+        where f.kind = {FISH} and o.a != {OUTCOME_ABANDONED}
+        group by f.a order by f.b
+    """,
+    "progress": f"""
+        select cast(b / 1000 as integer) as second, count(*) as samples, avg(a) as avg_progress
+        from events where kind = {PROGRESS} group by second order by second
+    """,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query go fish telemetry")
+    parser.add_argument("query", choices=sorted(QUERIES) + ["sql"])
+    parser.add_argument("sql", nargs="?", help="raw sql for the 'sql' query")
+    parser.add_argument("--db", default=settings.TELEMETRY_DB_PATH)
+    cli = parser.parse_args()
+
+    db = sqlite3.connect(cli.db)
+    db.executescript(SCHEMA)
+    if cli.query == "sql":
+        if not cli.sql:
+            parser.error("the 'sql' query needs a statement")
+        _print_rows(db.execute(cli.sql))
+    else:
+        if cli.query == "species":
+            print("species: " + ", ".join(f"{i}={cls.__name__}" for i, cls in enumerate(ALL_FISH_CLASSES)))
+        _print_rows(db.execute(QUERIES[cli.query]))
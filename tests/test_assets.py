@@ -0,0 +1,208 @@
+import hashlib
+import io
+import os
+import pygame
+import pytest
+import asset_manifest
+import settings
+import assets
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    # convert_alpha() needs a display surface
+    pygame.display.init()
+    pygame.display.set_mode((16, 16))
+    yield
+    pygame.display.quit()
+
+def _png(tmp_path, name, size):
+    path = str(tmp_path / f"{name}.png")
+    pygame.image.save(pygame.Surface(size, pygame.SRCALPHA), path)
+    return path
+
+def _cache(tmp_path, max_bytes, species=("carp", "bass", "tuna")):
+    paths = {name: _png(tmp_path, name, (10, 10)) for name in species}
+    return assets.SpeciesArtCache(paths, max_bytes)
+
+def test_get_loads_once_then_hits(tmp_path):
+    cache = _cache(tmp_path, 10**6)
+    first = cache.get("carp")
+    assert first.get_size() == (10, 10)
+    assert cache.get("carp") is first
+    assert (cache.loads, cache.hits) == (1, 1)
+
+def test_unknown_species_is_none(tmp_path):
+    cache = _cache(tmp_path, 10**6)
+    assert cache.get("kraken") is None
+    cache.prefetch("kraken")
+    assert cache.pending == {}
+
+def test_least_recently_used_species_is_evicted(tmp_path):
+    one = 10 * 10 * 4
+    cache = _cache(tmp_path, 2 * one)
+    cache.get("carp")
+    cache.get("bass")
+    cache.get("carp") # bass is now the least recently used
+    cache.get("tuna")
+    assert list(cache.loaded) == ["carp", "tuna"]
+    assert cache.evictions == 1
+    assert cache.total_bytes == 2 * one
+
+def test_one_species_stays_even_over_budget(tmp_path):
+    cache = _cache(tmp_path, 1)
+    assert cache.get("carp") is not None
+    assert list(cache.loaded) == ["carp"]
+
+def test_prefetch_is_picked_up_by_get(tmp_path):
+    cache = _cache(tmp_path, 10**6)
+    cache.prefetch("bass")
+    assert "bass" in cache.pending
+    assert cache.get("bass").get_size() == (10, 10)
+    assert cache.pending == {}
+    assert cache.loads == 1
+
+def test_forget_with_a_new_path_reloads(tmp_path):
+    cache = _cache(tmp_path, 10**6)
+    cache.get("carp")
+    cache.forget("carp", _png(tmp_path, "big_carp", (20, 10)))
+    assert cache.total_bytes == 0
+    assert cache.get("carp").get_size() == (20, 10)
+    assert cache.loads == 2
+
+def test_missing_file_is_cached_as_none(tmp_path):
+    cache = assets.SpeciesArtCache({"carp": str(tmp_path / "nope.png")}, 10**6)
+    assert cache.get("carp") is None
+    assert cache.get("carp") is None
+    assert (cache.loads, cache.hits, cache.total_bytes) == (1, 1, 0)
+
+# ---- asset manifest ----
+def _stale_manifest(monkeypatch, *paths):
+    """A manifest that still lists `paths` as ok."""
+    entries = {asset_manifest.manifest_key(path): {"status": "ok"} for path in paths}
+    monkeypatch.setattr(assets, "_manifest", {"version": asset_manifest.MANIFEST_VERSION, "assets": entries})
+
+def test_file_deleted_after_the_manifest_was_built(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "deleted.png")
+    _stale_manifest(monkeypatch, path)
+    assert assets.asset_exists(path) # the manifest is trusted for the lookup
+    assert assets.decode_image_safely(path, "deleted_img") is None
+    assert "out of date" in capsys.readouterr().out
+
+def test_prefetched_fish_art_deleted_after_the_manifest_was_built(tmp_path, monkeypatch):
+    path = str(tmp_path / "carp.png")
+    _stale_manifest(monkeypatch, path)
+    cache = assets.SpeciesArtCache({"carp": path}, 10**6)
+    cache.prefetch("carp")
+    assert cache.get("carp") is None
+
+def _png_with_chunks(tmp_path, name, extra):
+    out = io.BytesIO()
+    pygame.image.save(pygame.Surface((4, 4)), out, "x.png")
+    chunks = asset_manifest.read_png_chunks(out.getvalue())
+    data = asset_manifest.write_png_chunks(chunks[:1] + extra + chunks[1:])
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path), data
+
+def test_clean_png_strips_only_the_colour_profile(tmp_path):
+    _, data = _png_with_chunks(tmp_path, "a.png", [(b"iCCP", b"profile\x00\x00x"), (b"tEXt", b"Author\x00me")])
+    cleaned, changes = asset_manifest.clean_png(data)
+    tags = [tag for tag, _ in asset_manifest.read_png_chunks(cleaned)]
+    assert b"iCCP" not in tags and b"tEXt" in tags
+    assert changes == ["strip iCCP"]
+
+def test_build_leaves_source_pngs_alone_by_default(tmp_path):
+    path, data = _png_with_chunks(tmp_path, "a.png", [(b"iCCP", b"profile\x00\x00x")])
+    entry = asset_manifest.build_entry(path, ["A_PATH"])
+    assert entry["status"] == "ok"
+    assert entry["fixable"] == ["strip iCCP"]
+    assert open(path, "rb").read() == data
+    assert not os.path.exists(path + ".bak")
+
+def test_build_fix_in_place_keeps_a_backup(tmp_path):
+    path, data = _png_with_chunks(tmp_path, "a.png", [(b"iCCP", b"profile\x00\x00x")])
+    entry = asset_manifest.build_entry(path, ["A_PATH"], fix_in_place=True)
+    assert entry["changes"] == ["strip iCCP"]
+    assert open(path + ".bak", "rb").read() == data
+    fixed = open(path, "rb").read()
+    assert entry["sha256"] == hashlib.sha256(fixed).hexdigest()
+    assert b"iCCP" not in [tag for tag, _ in asset_manifest.read_png_chunks(fixed)]
+
+# ---- scaled variants ----
+def _surface(size=(10, 10)):
+    return pygame.Surface(size, pygame.SRCALPHA, 32)
+
+def test_scaled_variant_is_built_once_per_size():
+    cache = assets.ScaledSurfaceCache(10**6)
+    source = _surface((20, 10))
+    small = cache.get("menu_bg", source, (10, 5))
+    assert small.get_size() == (10, 5)
+    assert cache.get("menu_bg", source, (10, 5)) is small
+    assert cache.get("menu_bg", source, (40, 20)).get_size() == (40, 20)
+    assert len(cache.entries) == 2
+
+def test_fit_keeps_the_aspect_ratio():
+    cache = assets.ScaledSurfaceCache(10**6)
+    assert cache.get("bite", _surface((20, 10)), (100, 100), fit=True).get_size() == (100, 50)
+
+def test_least_recently_drawn_variant_is_dropped():
+    one = 10 * 10 * 4
+    cache = assets.ScaledSurfaceCache(2 * one)
+    for name in ("a", "b"):
+        cache.get(name, _surface((5, 5)), (10, 10))
+    cache.get("a", None, (10, 10)) # a hit, the source isn't needed
+    cache.get("c", _surface((5, 5)), (10, 10))
+    assert [key[0] for key in cache.entries] == ["a", "c"]
+    assert cache.total_bytes == 2 * one
+    assert set(cache.dependencies) == set(cache.entries)
+
+def test_invalidate_drops_every_variant_of_a_source():
+    cache = assets.ScaledSurfaceCache(10**6)
+    source = _surface()
+    cache.get("lose", source, (20, 20))
+    cache.get("lose", source, (30, 30))
+    cache.get("menu_bg", source, (20, 20))
+    cache.invalidate({"lose"})
+    assert [key[0] for key in cache.entries] == ["menu_bg"]
+    assert cache.total_bytes == 20 * 20 * 4
+
+def test_built_variants_track_every_source_they_use():
+    cache = assets.ScaledSurfaceCache(10**6)
+    builds = []
+    def build():
+        builds.append(1)
+        return _surface()
+    cache.get_or_build("scene", build, ("fishing_bg", "progress_low"))
+    cache.get_or_build("scene", build, ("fishing_bg", "progress_low"))
+    assert len(builds) == 1
+    cache.invalidate({"progress_low"})
+    assert "scene" not in cache.entries
+    cache.invalidate({"menu_bg"}) # unrelated, nothing to drop
+    assert cache.total_bytes == 0
+
+def test_tuple_keys_depend_on_their_name():
+    cache = assets.ScaledSurfaceCache(10**6)
+    cache.get(("fish", 3), _surface(), (20, 20))
+    cache.invalidate({"fish"})
+    assert cache.entries == {}
+
+# ---- cutscene frames ----
+def _cutscene(count=3):
+    a = assets.Assets.__new__(assets.Assets) # skips loading every asset from disk
+    a.cutscene_frames = [(_surface((32, 18)), 100) for _ in range(count)]
+    a.cutscene_scaled = {}
+    return a
+
+def test_cutscene_frames_are_scaled_once_per_resolution():
+    a = _cutscene()
+    frame = a.cutscene_frame(1, (320, 180))
+    assert frame.get_size() == (320, 180)
+    assert a.cutscene_frame(1, (320, 180)) is frame
+    a.cutscene_frame(0, (640, 360))
+    assert list(a.cutscene_scaled) == [(640, 360)] # the old resolution is dropped
+
+def test_cutscene_frames_are_capped_in_height(monkeypatch):
+    monkeypatch.setattr(settings, "CUTSCENE_MAX_HEIGHT", 540)
+    a = _cutscene()
+    assert a.cutscene_frame(2, (3840, 2160)).get_size() == (960, 540)
+    assert a.cutscene_scaled[(960, 540)][0] is None # only what was drawn gets scaled
@@ -0,0 +1,39 @@
+import pytest
+from atlas import pack_rects
+
+def _overlaps(a, b, padding):
+    _, ax, ay, aw, ah = a
+    _, bx, by, bw, bh = b
+    return ax < bx + bw + padding and bx < ax + aw + padding and ay < by + bh + padding and by < ay + ah + padding
+
+def test_every_sprite_is_placed_inside_its_sheet():
+    sizes = [("a", 30, 20), ("b", 50, 10), ("c", 10, 40), ("d", 25, 25)]
+    placements, sheet_sizes = pack_rects(sizes, 64, 64, padding=2)
+    assert set(placements) == {"a", "b", "c", "d"}
+    for sprite_id, w, h in sizes:
+        sheet, x, y, pw, ph = placements[sprite_id]
+        assert (pw, ph) == (w, h)
+        sheet_w, sheet_h = sheet_sizes[sheet]
+        assert x + w <= sheet_w and y + h <= sheet_h
+        assert x + w <= 64 and y + h <= 64
+
+def test_sprites_on_the_same_sheet_keep_the_padding():
+    sizes = [(str(i), 12, 9 + i % 3) for i in range(20)]
+    placements, _ = pack_rects(sizes, 64, 64, padding=2)
+    rects = list(placements.values())
+    for i, a in enumerate(rects):
+        for b in rects[i + 1:]:
+            if a[0] == b[0]:
+                assert not _overlaps(a, b, 2)
+
+def test_starts_a_new_sheet_when_one_is_full():
+    placements, sheet_sizes = pack_rects([("a", 60, 60), ("b", 60, 60)], 64, 64, padding=2)
+    assert len(sheet_sizes) == 2
+    assert placements["a"][0] != placements["b"][0]
+
+def test_sprite_bigger_than_a_sheet_is_an_error():
+    with pytest.raises(ValueError):
+        pack_rects([("huge", 100, 10)], 64, 64)
+
+def test_nothing_to_pack():
+    assert pack_rects([], 64, 64) == ({}, [])
@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+import pygame
+import pytest
+import settings
+import bots
+
+@pytest.fixture
+def posted(monkeypatch):
+    events = []
+    monkeypatch.setattr(pygame.event, "post", events.append)
+    return events
+
+def _minigame(bar_y, fish_y, bar_vel=0.0, fish_vel=0.0):
+    return SimpleNamespace(catch_bar_y=bar_y, fish_y=fish_y, catch_bar_vel=bar_vel, fish_vel=fish_vel)
+
+GS = SimpleNamespace(catch_bar_h=40, fish_h=20, physics_scale=1.0)
+
+# ---- reel controllers ----
+def test_pd_reels_when_the_bar_is_below_the_fish():
+    bot = bots.PDBot()
+    # y grows downwards: the bar at 300 is under the fish at 100
+    assert bot.wants_reel(_minigame(bar_y=300, fish_y=100), GS)
+    assert not bot.wants_reel(_minigame(bar_y=100, fish_y=300), GS)
+
+def test_pd_derivative_term_brakes_early():
+    bot = bots.PDBot(kp=1.0, kd=8.0)
+    # slightly below the fish but already rising fast (negative velocity): let go
+    assert not bot.control(bar_center=110, bar_vel=-5.0, fish_center=100, fish_vel=0.0)
+    assert bot.control(bar_center=110, bar_vel=0.0, fish_center=100, fish_vel=0.0)
+
+def test_human_acts_on_what_it_saw_reaction_frames_ago():
+    bot = bots.HumanBot(seed=1, reaction_frames=3, position_noise=0.0, lapse_chance=0.0)
+    below, above = _minigame(bar_y=300, fish_y=100), _minigame(bar_y=100, fish_y=300)
+    decisions = [bot.wants_reel(m, GS) for m in [below] * 5 + [above] * 5]
+    assert decisions == [True] * 5 + [True] * 3 + [False] * 2
+
+def test_human_lapse_keeps_the_last_decision():
+    bot = bots.HumanBot(seed=1, reaction_frames=0, position_noise=0.0, lapse_chance=1.0)
+    assert bot.wants_reel(_minigame(bar_y=300, fish_y=100), GS)
+    lapse = bot.lapse_frames
+    assert 10 <= lapse <= 40
+    above = _minigame(bar_y=100, fish_y=300)
+    assert all(bot.wants_reel(above, GS) for _ in range(lapse))
+    assert not bot.wants_reel(above, GS)
+
+def test_new_catch_forgets_old_observations():
+    bot = bots.HumanBot(seed=1, reaction_frames=5, position_noise=0.0, lapse_chance=0.0)
+    for _ in range(5):
+        bot.wants_reel(_minigame(bar_y=300, fish_y=100), GS)
+    bot.on_new_catch(None)
+    assert not bot.wants_reel(_minigame(bar_y=100, fish_y=300), GS)
+
+def test_random_masher_holds_for_stretches():
+    bot = bots.RandomMasherBot(seed=3)
+    decisions = [bot.wants_reel(None, GS) for _ in range(500)]
+    assert True in decisions and False in decisions
+    changes = sum(a != b for a, b in zip(decisions, decisions[1:]))
+    assert changes < 250 # not a coin flip per frame
+
+def test_make_bot():
+    assert isinstance(bots.make_bot("human", seed=1), bots.HumanBot)
+    with pytest.raises(KeyError):
+        bots.make_bot("nobody")
+
+# ---- driving the screens ----
+def _game(state, ticks):
+    gs = SimpleNamespace(game_state=state, show_bite_indicator=False, minigame=None)
+    gs.ticks = lambda: ticks[0]
+    return gs
+
+def _clicks(posted):
+    return [(e.type, e.pos) for e in posted]
+
+def test_menu_click_is_a_press_and_release_after_thinking(posted, monkeypatch):
+    monkeypatch.setattr(settings, "BOT_THINK_TIME_MS", (500, 500))
+    ticks = [1000]
+    bot, gs = bots.PDBot(seed=1), _game('menu', ticks)
+    play = pygame.Rect(100, 100, 50, 20)
+    bot.drive(gs, {'play': play})
+    assert posted == []
+    ticks[0] = 1500
+    bot.drive(gs, {'play': play})
+    assert _clicks(posted) == [(pygame.MOUSEBUTTONDOWN, play.center), (pygame.MOUSEBUTTONUP, play.center)]
+    ticks[0] = 5000
+    bot.drive(gs, {'play': play}) # one click per screen
+    assert len(posted) == 2
+
+def test_bite_is_clicked_after_the_reaction_time(posted):
+    ticks = [0]
+    bot, gs = bots.HumanBot(seed=1), _game('waiting_for_bite', ticks)
+    bot.drive(gs, {})
+    gs.show_bite_indicator = True
+    bot.drive(gs, {})
+    click_at = bot.bite_click_ticks
+    assert 200 <= click_at <= 450
+    ticks[0] = click_at - 1
+    bot.drive(gs, {})
+    assert posted == []
+    ticks[0] = click_at
+    bot.drive(gs, {})
+    assert [e.type for e in posted] == [pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP]
+
+def test_state_changes_are_counted(posted):
+    ticks = [0]
+    bot = bots.PDBot(seed=1)
+    gs = _game('menu', ticks)
+    for state in ('fishing', 'won', 'fishing', 'lost', 'menu'):
+        gs.game_state = state
+        bot.drive(gs, {})
+    assert (bot.sessions, bot.wins, bot.losses) == (2, 1, 1)
+
+def test_lost_screen_picks_a_button(posted, monkeypatch):
+    monkeypatch.setattr(settings, "BOT_THINK_TIME_MS", (0, 0))
+    buttons = {'try_again': pygame.Rect(0, 0, 10, 10), 'exit': pygame.Rect(50, 50, 10, 10)}
+    bot, gs = bots.PDBot(seed=1), _game('lost', [0])
+    bot.drive(gs, buttons)
+    assert posted[0].pos in (buttons['try_again'].center, buttons['exit'].center)
+
+# ---- soak monitoring ----
+def test_rss_is_a_number_here():
+    rss = bots._rss_mb()
+    assert rss is None or rss > 0
+
+def test_rss_is_none_without_any_source(monkeypatch):
+    def no_proc(*args, **kwargs):
+        raise OSError("no /proc")
+    monkeypatch.setattr(bots, "open", no_proc, raising=False)
+    monkeypatch.setattr(bots, "psutil", None)
+    monkeypatch.setattr(bots, "resource", None)
+    assert bots._rss_mb() is None
+
+def test_rss_falls_back_to_peak_rss(monkeypatch):
+    def no_proc(*args, **kwargs):
+        raise OSError("no /proc")
+    usage = SimpleNamespace(ru_maxrss=2048 * 1024 * 1024) # bytes on macos
+    monkeypatch.setattr(bots, "open", no_proc, raising=False)
+    monkeypatch.setattr(bots, "psutil", None)
+    monkeypatch.setattr(bots, "resource", SimpleNamespace(RUSAGE_SELF=0, getrusage=lambda who: usage))
+    monkeypatch.setattr(bots.sys, "platform", "darwin")
+    assert bots._rss_mb() == 2048
+
+def test_soak_sample_without_memory(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(bots, "_rss_mb", lambda: None)
+    csv_path = tmp_path / "soak.csv"
+    assets = SimpleNamespace(scaled_cache=SimpleNamespace(total_bytes=0))
+    monitor = bots.SoakMonitor(bots.PDBot(), assets, interval_s=60, csv_path=str(csv_path))
+    for now in (1.0, 2.0, 3.0):
+        monitor.frame_times = [0.016, 0.017]
+        monitor.sample(now)
+    monitor.report()
+    assert monitor.samples[-1]["rss_mb"] is None
+    header, row = csv_path.read_text().splitlines()[:2]
+    assert row.split(",")[header.split(",").index("rss_mb")] == ""
+    out = capsys.readouterr().out
+    assert "memory:" not in out
+    assert "frame time:" in out
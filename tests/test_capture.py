@@ -0,0 +1,101 @@
+import io
+import json
+import os
+import queue
+from multiprocessing import resource_tracker, shared_memory
+import pygame
+import pytest
+import capture
+from capture import FixedStepClock, encode_png, unpadded
+
+def _pattern(size=(7, 5)):
+    """A 32 bit surface where every pixel has a different colour."""
+    surface = pygame.Surface(size, 0, 32)
+    for x in range(size[0]):
+        for y in range(size[1]):
+            surface.set_at((x, y), (x * 30, y * 40, (x + y) * 10))
+    return surface
+
+def _decode(data):
+    return pygame.image.load(io.BytesIO(data), "frame.png")
+
+def _same_pixels(a, b):
+    return a.get_size() == b.get_size() and all(
+        a.get_at((x, y))[:3] == b.get_at((x, y))[:3] for x in range(a.get_width()) for y in range(a.get_height()))
+
+def _padded(surface, extra=8):
+    """The surface's buffer with `extra` junk bytes after every row, and the padded pitch."""
+    width, height = surface.get_size()
+    rows = bytes(surface.get_buffer())
+    pitch = surface.get_pitch()
+    data = b"".join(rows[y * pitch:y * pitch + width * 4] + b"\xab" * extra for y in range(height))
+    return data, width * 4 + extra
+
+def test_fixed_step_clock():
+    clock = FixedStepClock(60)
+    assert clock.ticks() == 0
+    for _ in range(60):
+        clock.advance()
+    assert clock.ticks() == 1000
+    clock.advance()
+    assert clock.ticks() == 1016 # whole ms, like pygame.time.get_ticks()
+
+def test_encode_png_matches_the_surface():
+    surface = _pattern()
+    data = encode_png(surface.get_buffer().raw, *surface.get_size(), surface.get_pitch(), surface.get_shifts(), 1)
+    assert _same_pixels(_decode(data), surface)
+
+def test_encode_png_drops_row_padding():
+    surface = _pattern()
+    data, pitch = _padded(surface)
+    assert _same_pixels(_decode(encode_png(data, *surface.get_size(), pitch, surface.get_shifts(), 6)), surface)
+
+def test_unpadded():
+    assert unpadded(b"abcdXXefghXX", 1, 2, 6) == b"abcdefgh"
+    data = b"abcdefgh"
+    assert unpadded(data, 1, 2, 4) is data
+
+def test_raw_worker_writes_rows_without_padding(tmp_path):
+    surface = _pattern()
+    data, pitch = _padded(surface)
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        jobs, done = queue.Queue(), queue.Queue()
+        # second frame of the recording, so it lands one unpadded frame into the file
+        jobs.put((0, shm.name, 5, 1, surface.get_size(), pitch, surface.get_shifts()))
+        jobs.put(None)
+        capture._capture_worker(jobs, done, str(tmp_path), "raw", 1)
+        # the worker hands ownership to the game process by unregistering, which is this one here
+        resource_tracker.register(shm._name, "shared_memory")
+    finally:
+        shm.close()
+        shm.unlink()
+    frame_bytes = surface.get_width() * surface.get_height() * 4
+    assert done.get_nowait() == (0, frame_bytes)
+    raw = (tmp_path / "capture.raw").read_bytes()
+    assert len(raw) == 2 * frame_bytes
+    assert raw[frame_bytes:] == unpadded(bytes(surface.get_buffer()), *surface.get_size(), surface.get_pitch())
+
+@pytest.mark.skipif(not capture.CAPTURE_SUPPORTED, reason="capture needs fork")
+def test_capture_round_trip_and_stale_files(tmp_path, capsys):
+    for name in ("frame_000000.png", "frame_000099.png", "capture.raw", "capture.json"):
+        (tmp_path / name).write_bytes(b"old")
+    (tmp_path / "notes.txt").write_text("keep me")
+
+    recorder = capture.FrameCapture(str(tmp_path), workers=1, slots=2, fixed_fps=30)
+    assert sorted(os.listdir(tmp_path)) == ["notes.txt"]
+    surfaces = [_pattern(), _pattern((7, 5)), _pattern()]
+    surfaces[1].fill((255, 0, 0))
+    for i, surface in enumerate(surfaces):
+        assert recorder.capture(surface, i * 33)
+    recorder.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["capture.json", "frame_000000.png", "frame_000001.png",
+                                            "frame_000002.png", "notes.txt"]
+    for i, surface in enumerate(surfaces):
+        assert _same_pixels(pygame.image.load(str(tmp_path / f"frame_{i:06d}.png")), surface)
+    manifest = json.loads((tmp_path / "capture.json").read_text())
+    assert (manifest["frames"], manifest["dropped"], manifest["fps"]) == (3, 0, 30)
+    assert manifest["frame_ticks"] == [0, 33, 66]
+    assert "removed 4 file(s)" in capsys.readouterr().out
@@ -0,0 +1,41 @@
+import pytest
+import settings
+from layout import Layout, parse_resolution
+
+def test_parse_resolution():
+    assert parse_resolution("1280x720") == (1280, 720)
+    assert parse_resolution("3840X2160") == (3840, 2160)
+
+@pytest.mark.parametrize("text", ["", "1280", "1280x", "x720", "axb", "1280x720x2", None])
+def test_parse_resolution_rejects_garbage(text):
+    assert parse_resolution(text) is None
+
+def test_parse_resolution_rejects_too_small():
+    min_w, min_h = settings.MIN_SCREEN_SIZE
+    assert parse_resolution(f"{min_w - 1}x{min_h}") is None
+    assert parse_resolution(f"{min_w}x{min_h}") == (min_w, min_h)
+
+def test_reference_height_is_unscaled():
+    layout = Layout(1280, settings.LAYOUT_REFERENCE_HEIGHT)
+    assert layout.scale == 1.0
+    assert layout.px(200) == 200
+    assert layout.button_size == (200, 50)
+
+def test_pixel_sizes_scale_with_height():
+    small, big = Layout(1280, 720), Layout(2560, 1440)
+    assert big.px(40) == 2 * small.px(40)
+    assert big.track_h == 2 * small.track_h
+    assert big.vibration_offsets == [(2 * x, 2 * y) for x, y in small.vibration_offsets]
+    assert Layout(100, 10).px(1) == 1 # never rounds down to nothing
+
+def test_track_is_centred_vertically():
+    layout = Layout(1920, 1080)
+    assert layout.track_y * 2 + layout.track_h in (1080, 1079)
+
+def test_water_rect_covers_the_track_and_stays_on_screen():
+    for width, height in [(800, 480), (1280, 720), (3840, 2160), (1000, 1000)]:
+        layout = Layout(width, height)
+        x, y, w, h = layout.water_rect
+        assert x >= 0 and y >= 0 and x + w <= width and y + h <= height
+        assert x <= layout.track_x and x + w >= layout.track_x + layout.track_w
+        assert y <= layout.track_y and y + h >= layout.track_y + layout.track_h
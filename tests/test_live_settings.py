@@ -0,0 +1,116 @@
+import json
+import os
+import pytest
+import settings
+import live_settings
+from live_settings import SettingsError, SettingsWatcher, _coerce
+
+@pytest.fixture
+def profile(tmp_path):
+    """Path of a profile file. Every setting is put back afterwards."""
+    startup = live_settings.snapshot_settings()
+    path = tmp_path / "profile.json"
+    yield path
+    live_settings.apply_overrides({}, startup)
+
+def _write(path, data):
+    path.write_text(data if isinstance(data, str) else json.dumps(data))
+    # make sure the mtime moves even on coarse filesystem clocks
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+# ---- _coerce ----
+def test_coerce_numbers():
+    assert _coerce("X", 3, 1.5) == 3.0 and isinstance(_coerce("X", 3, 1.5), float)
+    assert _coerce("X", 3, 1) == 3
+    with pytest.raises(SettingsError):
+        _coerce("X", True, 1) # a bool isn't a number here
+    with pytest.raises(SettingsError):
+        _coerce("X", "3", 1)
+
+def test_coerce_bools():
+    assert _coerce("X", False, True) is False
+    with pytest.raises(SettingsError):
+        _coerce("X", 0, True)
+
+def test_coerce_relative_paths_point_into_the_assets():
+    assert _coerce("MENU_BG_PATH", "night.png", "menu.png") == settings.get_asset_path("night.png")
+    absolute = os.path.abspath("night.png")
+    assert _coerce("MENU_BG_PATH", absolute, "menu.png") == absolute
+    assert _coerce("TITLE", "night.png", "x") == "night.png" # only *_PATH names
+
+def test_coerce_lists_and_tuples():
+    assert _coerce("X", [1, 2], (0, 0)) == (1, 2)
+    assert _coerce("X", [[1, 2], [3, 4]], [(0, 0)]) == [(1, 2), (3, 4)]
+    with pytest.raises(SettingsError):
+        _coerce("X", 5, [(0, 0)])
+
+def test_coerce_dict_with_int_keys():
+    assert _coerce("CUTSCENE_SOUND_CUES", {"0": "a", "19": "b"}, {0: "x"}) == {0: "a", 19: "b"}
+    with pytest.raises(SettingsError, match="whole numbers"):
+        _coerce("CUTSCENE_SOUND_CUES", {"first": "a"}, {0: "x"})
+    assert _coerce("X", {"a": 1}, {"b": 2}) == {"a": 1} # string keys stay strings
+
+def test_coerce_without_a_default_type():
+    assert _coerce("X", [1], None) == [1]
+
+# ---- load_profile ----
+def test_bad_json_is_rejected(profile):
+    _write(profile, "{not json")
+    with pytest.raises(SettingsError, match="Could not read"):
+        live_settings.load_profile(str(profile), live_settings.snapshot_settings())
+
+def test_profile_must_be_an_object(profile):
+    _write(profile, [1, 2])
+    with pytest.raises(SettingsError, match="json object"):
+        live_settings.load_profile(str(profile), live_settings.snapshot_settings())
+
+def test_unknown_settings_are_rejected_metadata_is_skipped(profile):
+    defaults = live_settings.snapshot_settings()
+    _write(profile, {"_tuner": {"error": 0.1}})
+    assert live_settings.load_profile(str(profile), defaults) == {}
+    _write(profile, {"NOT_A_SETTING": 1})
+    with pytest.raises(SettingsError, match="NOT_A_SETTING"):
+        live_settings.load_profile(str(profile), defaults)
+
+def test_missing_profile_is_an_error(tmp_path):
+    with pytest.raises(SettingsError):
+        live_settings.load_profile(str(tmp_path / "nope.json"), {})
+
+# ---- SettingsWatcher ----
+def test_load_applies_and_reports_changes(profile):
+    gravity = settings.CATCH_BAR_GRAVITY
+    _write(profile, {"CATCH_BAR_GRAVITY": gravity * 2, "CUTSCENE_SOUND_CUES": {"5": "cutscene_sound_1"}})
+    changed = SettingsWatcher(str(profile)).load()
+    assert changed == {"CATCH_BAR_GRAVITY", "CUTSCENE_SOUND_CUES"}
+    assert settings.CATCH_BAR_GRAVITY == gravity * 2
+    assert settings.CUTSCENE_SOUND_CUES == {5: "cutscene_sound_1"}
+
+def test_removed_keys_go_back_to_their_startup_value(profile):
+    gravity, drag = settings.CATCH_BAR_GRAVITY, settings.FISH_DRAG
+    _write(profile, {"CATCH_BAR_GRAVITY": gravity * 2, "FISH_DRAG": drag / 2})
+    watcher = SettingsWatcher(str(profile))
+    watcher.load()
+    _write(profile, {"FISH_DRAG": drag / 2})
+    assert watcher.load() == {"CATCH_BAR_GRAVITY"}
+    assert settings.CATCH_BAR_GRAVITY == gravity
+    assert settings.FISH_DRAG == drag / 2
+
+def test_broken_edit_keeps_the_previous_values(profile, capsys):
+    gravity = settings.CATCH_BAR_GRAVITY
+    _write(profile, {"CATCH_BAR_GRAVITY": gravity * 2})
+    watcher = SettingsWatcher(str(profile))
+    watcher.load()
+    _write(profile, '{"CATCH_BAR_GRAVITY": ')
+    assert watcher.load() == set()
+    assert settings.CATCH_BAR_GRAVITY == gravity * 2
+    assert "Could not read" in capsys.readouterr().out
+
+def test_poll_only_reloads_after_the_file_changed(profile):
+    _write(profile, {"FISH_DRAG": settings.FISH_DRAG / 2})
+    watcher = SettingsWatcher(str(profile), poll_interval_ms=0.001)
+    watcher.load()
+    assert watcher.poll() == set()
+    _write(profile, {})
+    assert watcher.poll() == {"FISH_DRAG"}
+    assert watcher.reloads == 2
@@ -0,0 +1,135 @@
+import pygame
+import pytest
+import settings
+import pacing
+
+class FakeEvents:
+    """Stands in for pygame's event queue and clocks. Time only moves while waiting."""
+    def __init__(self):
+        self.ms = 10000.0
+        self.queue = [] # (arrival ms, event)
+        self.waits = [] # timeouts passed to wait()
+
+    def post(self, event_type, at=None, **attributes):
+        self.queue.append((self.ms if at is None else at, pygame.event.Event(event_type, **attributes)))
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        if self.queue and self.queue[0][0] <= self.ms + timeout:
+            at, event = self.queue.pop(0)
+            self.ms = max(self.ms, at)
+            return event
+        self.ms += timeout
+        return pygame.event.Event(pygame.NOEVENT)
+
+    def get(self):
+        due = [event for at, event in self.queue if at <= self.ms]
+        self.queue = [(at, event) for at, event in self.queue if at > self.ms]
+        return due
+
+@pytest.fixture
+def events(monkeypatch):
+    fake = FakeEvents()
+    monkeypatch.setattr(pygame.event, "wait", fake.wait)
+    monkeypatch.setattr(pygame.event, "get", fake.get)
+    monkeypatch.setattr(pygame.time, "get_ticks", lambda: int(fake.ms))
+    monkeypatch.setattr(pacing, "now_ms", lambda: fake.ms)
+    monkeypatch.setattr(settings, "STATE_FRAME_RATES", {"menu": None, "fishing": 60})
+    monkeypatch.setattr(settings, "IDLE_REDRAW_INTERVAL_MS", 1000)
+    return fake
+
+def _pacer(stamped=None):
+    clock = type("Clock", (), {"tick": lambda self: 0})()
+    on_event = (lambda event, stamp: stamped.append((event.type, stamp))) if stamped is not None else None
+    return pacing.FramePacer(clock, on_event)
+
+def _idle(events, pacer):
+    """A pacer that has just drawn the menu."""
+    pacer.wait_for_events("menu")
+    pacer.end_frame("menu")
+    events.waits.clear()
+    return pacer
+
+def test_capped_state_never_blocks(events):
+    pacer = _pacer()
+    pacer.end_frame("fishing")
+    events.waits.clear()
+    assert pacer.wait_for_events("fishing") == ([], True)
+    assert events.waits == []
+
+def test_new_idle_state_draws_right_away(events):
+    pacer = _pacer()
+    pacer.end_frame("fishing")
+    assert pacer.wait_for_events("menu") == ([], True)
+
+def test_idle_state_sleeps_until_the_redraw_interval(events):
+    pacer = _idle(events, _pacer())
+    start = events.ms
+    assert pacer.wait_for_events("menu") == ([], True)
+    assert events.ms - start == 1000
+    assert pacer.idle_wakeups == 1
+
+def test_idle_state_wakes_for_a_timer(events):
+    pacer = _idle(events, _pacer())
+    start = events.ms
+    _, redraw = pacer.wait_for_events("menu", next_deadline=int(start) + 250)
+    assert redraw
+    assert events.waits == [250]
+
+def test_overdue_timer_skips_the_wait(events):
+    pacer = _idle(events, _pacer())
+    assert pacer.wait_for_events("menu", next_deadline=int(events.ms) - 5) == ([], True)
+    assert events.waits == []
+
+def test_idle_state_wakes_for_input(events):
+    stamped = []
+    pacer = _idle(events, _pacer(stamped))
+    events.post(pygame.KEYDOWN, at=events.ms + 40, key=pygame.K_SPACE)
+    received, redraw = pacer.wait_for_events("menu")
+    assert [e.type for e in received] == [pygame.KEYDOWN]
+    assert redraw
+    assert stamped == [(pygame.KEYDOWN, 10040.0)]
+
+def test_mouse_motion_alone_does_not_redraw(events):
+    pacer = _idle(events, _pacer())
+    events.post(pygame.MOUSEMOTION, at=events.ms + 10, pos=(1, 1), rel=(1, 1), buttons=(0, 0, 0))
+    received, redraw = pacer.wait_for_events("menu")
+    assert len(received) == 1
+    assert not redraw
+
+def test_request_redraw(events):
+    pacer = _idle(events, _pacer())
+    pacer.request_redraw()
+    assert pacer.wait_for_events("menu") == ([], True)
+    assert events.waits == []
+
+def test_capped_frames_advance_by_exactly_one_period(events):
+    pacer = _pacer()
+    start = pacer.last_frame_ms
+    for frame in range(1, 4):
+        pacer.end_frame("fishing")
+        # the fake wait rounds up to whole ms, the deadline doesn't drift with it
+        assert pacer.last_frame_ms == pytest.approx(start + frame * 1000 / 60)
+
+def test_slow_frame_does_not_cause_a_catch_up_burst(events):
+    pacer = _pacer()
+    events.ms += 100 # a frame that took six periods
+    pacer.end_frame("fishing")
+    assert pacer.last_frame_ms == events.ms
+    assert events.waits == []
+
+def test_input_during_the_frame_sleep_is_stamped_and_kept(events):
+    stamped = []
+    pacer = _pacer(stamped)
+    events.post(pygame.KEYUP, at=events.ms + 5, key=pygame.K_SPACE)
+    pacer.end_frame("fishing")
+    assert stamped == [(pygame.KEYUP, 10005.0)]
+    received, _ = pacer.wait_for_events("fishing")
+    assert [e.type for e in received] == [pygame.KEYUP]
+
+def test_stats_count_frames_per_state(events):
+    pacer = _pacer()
+    pacer.end_frame("menu")
+    pacer.end_frame("fishing")
+    pacer.end_frame("fishing")
+    assert pacer.stats()["frames_by_state"] == {"menu": 1, "fishing": 2}
@@ -0,0 +1,117 @@
+import pygame
+import pytest
+import settings
+from reel_input import ReelInput
+
+def _key(down):
+    return pygame.event.Event(pygame.KEYDOWN if down else pygame.KEYUP, key=pygame.K_SPACE)
+
+def _mouse(down):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN if down else pygame.MOUSEBUTTONUP, button=1)
+
+def _ticked(reel, at):
+    """Starts the tick history at `at`, nothing held."""
+    reel.tick(at)
+    return reel
+
+def test_nothing_held_is_zero():
+    reel = _ticked(ReelInput(), 1000)
+    assert reel.tick(1016) == 0.0
+
+def test_held_through_the_tick_is_full_thrust():
+    reel = _ticked(ReelInput(), 1000)
+    reel.handle_event(_key(True), 990) # stamped before the last tick, counts from the tick on
+    assert reel.tick(1016) == 1.0
+    assert reel.tick(1032) == 1.0
+
+def test_press_mid_tick_is_fractional():
+    reel = _ticked(ReelInput(), 1000)
+    reel.handle_event(_key(True), 1004)
+    assert reel.tick(1016) == pytest.approx(0.75)
+
+def test_tap_shorter_than_a_tick_still_counts():
+    reel = _ticked(ReelInput(), 1000)
+    reel.handle_event(_key(True), 1002)
+    reel.handle_event(_key(False), 1006)
+    assert reel.tick(1016) == pytest.approx(0.25)
+    assert reel.taps_saved == 1
+    assert reel.drain_latencies() == [pytest.approx(14)]
+    assert reel.drain_latencies() == []
+
+def test_release_mid_tick():
+    reel = _ticked(ReelInput(), 1000)
+    reel.handle_event(_key(True), 1000)
+    reel.tick(1016)
+    reel.handle_event(_key(False), 1020)
+    assert reel.tick(1032) == pytest.approx(0.25)
+
+def test_key_and_mouse_together_count_once():
+    reel = _ticked(ReelInput(), 1000)
+    reel.handle_event(_key(True), 1000)
+    reel.handle_event(_mouse(True), 1004)
+    reel.handle_event(_key(False), 1008) # the mouse is still down
+    assert reel.held
+    assert reel.tick(1016) == 1.0
+    assert len(reel.latencies) == 1
+
+def test_focus_loss_releases():
+    reel = _ticked(ReelInput(), 1000)
+    reel.handle_event(_key(True), 1000)
+    reel.handle_event(pygame.event.Event(pygame.WINDOWFOCUSLOST), 1008)
+    assert not reel.held
+    assert reel.tick(1016) == pytest.approx(0.5)
+    assert reel.tick(1032) == 0.0
+
+def test_first_tick_only_looks_back_one_max_tick():
+    reel = ReelInput()
+    reel.handle_event(_key(True), 0)
+    assert reel.tick(10000) == 1.0
+    reel = ReelInput()
+    reel.handle_event(_key(True), 10000 - settings.INPUT_MAX_TICK_MS / 2)
+    assert reel.tick(10000) == pytest.approx(0.5)
+
+def test_reset_forgets_history_but_keeps_held():
+    reel = _ticked(ReelInput(), 1000)
+    reel.handle_event(_key(True), 1004)
+    reel.reset()
+    assert reel.held
+    assert reel.last_tick is None
+    assert reel.tick(1016) == 1.0
+    assert reel.drain_latencies() == []
+
+def test_stats():
+    reel = _ticked(ReelInput(), 1000)
+    assert reel.stats() == {"presses": 0, "taps_saved": 0}
+    reel.handle_event(_key(True), 1006)
+    reel.tick(1016)
+    stats = reel.stats()
+    assert stats["presses"] == 1
+    assert stats["max_ms"] == 10.0
+
+def test_every_sub_tick_tap_is_counted():
+    reel = _ticked(ReelInput(), 1000)
+    for start in (1001, 1005, 1009):
+        reel.handle_event(_key(True), start)
+        reel.handle_event(_key(False), start + 2)
+    assert reel.tick(1016) == pytest.approx(6 / 16)
+    assert reel.taps_saved == 3
+    assert len(reel.drain_latencies()) == 3
+
+def test_release_of_an_earlier_press_is_not_a_tap():
+    reel = _ticked(ReelInput(), 1000)
+    reel.handle_event(_key(True), 1004)
+    reel.tick(1016) # polling would have seen this one
+    reel.handle_event(_key(False), 1020)
+    reel.tick(1032)
+    assert reel.taps_saved == 0
+
+def test_game_clock_stamps_events_and_ticks():
+    game_ms = [0]
+    reel = ReelInput(clock=lambda: game_ms[0])
+    reel.tick()
+    game_ms[0] = 20
+    reel.handle_event(_key(True))
+    assert reel.tick() == 0.0 # pressed on this frame, counts from the next tick
+    game_ms[0] = 40
+    assert reel.tick() == 1.0
+    assert reel.drain_latencies() == [0]
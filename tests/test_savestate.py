@@ -0,0 +1,94 @@
+import random
+import subprocess
+import sys
+from types import SimpleNamespace
+import pytest
+import game_logic
+import savestate
+from savestate import SaveStateError, decode, encode
+
+def _game(state='fishing', track_y=100, track_h=400, now=50000):
+    gs = SimpleNamespace(
+        game_state=state, minigame=None, cheats={"fast_catch": False}, show_bite_indicator=False,
+        highscore=1234, bite_time=now + 1500, waiting_start_time=now - 2000,
+        cutscene_frame_index=0, cutscene_frame_start=now,
+        track_y=track_y, track_h=track_h, catch_bar_h=60, fish_h=30,
+        assets=SimpleNamespace(prefetch_fish=lambda species_id: None))
+    gs.ticks = lambda: now
+    if state == 'fishing':
+        gs.minigame = game_logic.FishingMinigame(gs, fish_class=game_logic.Bass)
+        gs.minigame.catch_progress = 42.5
+    return gs
+
+def test_round_trip_keeps_the_catch_and_the_rng():
+    gs = _game()
+    random.seed(3)
+    fields = decode(encode(savestate.snapshot(gs)))
+    expected_roll = random.random()
+
+    restored = _game('menu', now=900)
+    savestate.restore(restored, fields)
+    assert restored.game_state == 'fishing'
+    assert restored.highscore == 1234
+    assert type(restored.minigame.fish) is game_logic.Bass
+    assert restored.minigame.catch_progress == 42.5
+    assert restored.minigame.fish.weight == gs.minigame.fish.weight
+    assert random.random() == expected_roll
+
+def test_positions_follow_a_resized_track():
+    gs = _game(track_y=100, track_h=400)
+    gs.minigame.fish_y = 300 # halfway down the track
+    fields = decode(encode(savestate.snapshot(gs)))
+    restored = _game('menu', track_y=50, track_h=800)
+    savestate.restore(restored, fields)
+    assert restored.minigame.fish_y == pytest.approx(450)
+
+def test_waiting_times_are_relative():
+    fields = decode(encode(savestate.snapshot(_game('waiting_for_bite'))))
+    assert (fields["bite_in_ms"], fields["waiting_ms"]) == (1500, 2000)
+    restored = _game('menu', now=10)
+    savestate.restore(restored, fields)
+    assert (restored.bite_time, restored.waiting_start_time) == (1510, -1990)
+
+def test_rejects_other_versions():
+    data = bytearray(encode(savestate.snapshot(_game('menu'))))
+    data[4:6] = (savestate.SAVE_VERSION + 1).to_bytes(2, "little")
+    with pytest.raises(SaveStateError, match="version"):
+        decode(bytes(data))
+
+def test_rejects_other_files():
+    with pytest.raises(SaveStateError, match="Not a save state"):
+        decode(b"\x89PNG" + bytes(savestate.HEADER.size))
+
+def test_rejects_truncated_data():
+    data = encode(savestate.snapshot(_game()))
+    with pytest.raises(SaveStateError, match="truncated"):
+        decode(data[:10])
+    with pytest.raises(SaveStateError, match="bytes, expected"):
+        decode(data[:-1])
+
+def test_rejects_a_catch_state_without_a_catch():
+    fields = savestate.snapshot(_game('menu'))
+    fields["state"] = savestate.STATES.index('fishing')
+    with pytest.raises(SaveStateError, match="no catch"):
+        decode(encode(fields))
+
+def test_encode_rejects_out_of_range_fields():
+    fields = savestate.snapshot(_game('menu'))
+    fields["state"] = 300
+    with pytest.raises(SaveStateError):
+        encode(fields)
+    fields = savestate.snapshot(_game('menu'))
+    fields["has_minigame"] = True
+    with pytest.raises(SaveStateError, match="species"):
+        encode(fields)
+
+def test_cli_edit_refuses_an_invalid_state(tmp_path):
+    path, out = tmp_path / "save.bin", tmp_path / "edited.bin"
+    path.write_bytes(encode(savestate.snapshot(_game('menu'))))
+    result = subprocess.run([sys.executable, savestate.__file__, "edit", str(path), str(out), "state=fishing"],
+                            capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "has no catch" in result.stderr
+    assert "Traceback" not in result.stderr
+    assert not out.exists()
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+import pygame
+from scenes import Scene, SceneManager
+
+class Recording(Scene):
+    """A scene that logs its hooks and events to a shared list."""
+    def __init__(self, name, log):
+        super().__init__()
+        self.name = name
+        self.log = log
+        self.handlers = {pygame.KEYDOWN: lambda event: log.append((name, "key", event.key))}
+
+    def enter(self, previous):
+        self.log.append((self.name, "enter", previous))
+
+    def exit(self, next_state):
+        self.log.append((self.name, "exit", next_state))
+
+    def layout(self):
+        self.log.append((self.name, "layout"))
+
+def _manager():
+    log = []
+    gs = SimpleNamespace(game_state="menu")
+    scenes = SceneManager(gs, [Recording("menu", log), Recording("fishing", log)])
+    return gs, scenes, log
+
+def test_first_sync_lays_out_then_enters():
+    gs, scenes, log = _manager()
+    assert scenes.sync().name == "menu"
+    assert log == [("menu", "layout"), ("menu", "enter", None)]
+    assert scenes.transitions == 1
+
+def test_sync_only_acts_on_a_state_change():
+    gs, scenes, log = _manager()
+    scenes.sync()
+    log.clear()
+    scenes.sync()
+    assert log == [] and scenes.transitions == 1
+
+    gs.game_state = "fishing"
+    assert scenes.sync().name == "fishing"
+    assert log == [("menu", "exit", "fishing"), ("fishing", "layout"), ("fishing", "enter", "menu")]
+    assert scenes.transitions == 2
+
+def test_global_handler_runs_before_the_scene():
+    gs, scenes, log = _manager()
+    scenes.handlers[pygame.KEYDOWN] = lambda event: log.append(("global", "key", event.key))
+    scenes.sync()
+    log.clear()
+    scenes.dispatch(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+    assert log == [("global", "key", pygame.K_a), ("menu", "key", pygame.K_a)]
+
+def test_global_handler_can_switch_the_scene_mid_dispatch():
+    gs, scenes, log = _manager()
+    scenes.handlers[pygame.KEYDOWN] = lambda event: setattr(gs, "game_state", "fishing")
+    scenes.sync()
+    log.clear()
+    scenes.dispatch(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    # the event goes to the scene that is current after the global handler ran
+    assert log == [("menu", "exit", "fishing"), ("fishing", "layout"), ("fishing", "enter", "menu"),
+                   ("fishing", "key", pygame.K_SPACE)]
+
+def test_events_without_a_handler_are_ignored():
+    gs, scenes, log = _manager()
+    scenes.sync()
+    log.clear()
+    scenes.dispatch(pygame.event.Event(pygame.MOUSEMOTION, pos=(0, 0)))
+    assert log == []
+
+def test_relayout_only_touches_the_current_scene():
+    gs, scenes, log = _manager()
+    scenes.relayout() # nothing entered yet
+    assert log == []
+    scenes.sync()
+    log.clear()
+    scenes.relayout()
+    assert log == [("menu", "layout")]
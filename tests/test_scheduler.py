@@ -0,0 +1,79 @@
+from scheduler import Scheduler
+
+def _recorder():
+    calls = []
+    return calls, lambda *args: calls.append(args)
+
+def test_fires_in_deadline_order():
+    scheduler = Scheduler()
+    calls, record = _recorder()
+    scheduler.schedule(300, record, "c")
+    scheduler.schedule(100, record, "a")
+    scheduler.schedule(200, record, "b")
+    assert scheduler.run_due(250) == 2
+    assert calls == [("a", 100), ("b", 200)]
+    assert scheduler.run_due(300) == 1
+    assert scheduler.fired == 3
+
+def test_same_deadline_fires_in_schedule_order():
+    scheduler = Scheduler()
+    calls, record = _recorder()
+    for name in "xyz":
+        scheduler.schedule(100, record, name)
+    scheduler.run_due(100)
+    assert [c[0] for c in calls] == ["x", "y", "z"]
+
+def test_nothing_due():
+    scheduler = Scheduler()
+    calls, record = _recorder()
+    scheduler.schedule(100, record)
+    assert scheduler.run_due(99) == 0
+    assert calls == []
+
+def test_cancelled_timer_does_not_fire():
+    scheduler = Scheduler()
+    calls, record = _recorder()
+    timer = scheduler.schedule(100, record, "a")
+    scheduler.schedule(200, record, "b")
+    timer.cancel()
+    assert scheduler.next_deadline() == 200
+    scheduler.run_due(1000)
+    assert calls == [("b", 200)]
+
+def test_cancel_group():
+    scheduler = Scheduler()
+    calls, record = _recorder()
+    scheduler.schedule(100, record, "bite", group="waiting")
+    scheduler.schedule(150, record, "frame", group="cutscene")
+    scheduler.schedule(200, record, "splash", group="waiting")
+    scheduler.cancel_group("waiting")
+    scheduler.run_due(1000)
+    assert calls == [("frame", 150)]
+
+def test_next_deadline():
+    scheduler = Scheduler()
+    assert scheduler.next_deadline() is None
+    timer = scheduler.schedule(100, lambda when: None)
+    assert scheduler.next_deadline() == 100
+    timer.cancel()
+    assert scheduler.next_deadline() is None
+    assert scheduler.heap == []
+
+def test_chained_timers_follow_their_deadline_not_now():
+    scheduler = Scheduler()
+    fired = []
+    def frame(when):
+        fired.append(when)
+        if len(fired) < 4:
+            scheduler.schedule(when + 100, frame)
+    scheduler.schedule(100, frame)
+    # one late frame (at 450) catches up on everything due without drifting
+    scheduler.run_due(450)
+    assert fired == [100, 200, 300, 400]
+
+def test_timer_scheduled_for_now_from_a_callback_runs_the_same_frame():
+    scheduler = Scheduler()
+    calls, record = _recorder()
+    scheduler.schedule(100, lambda when: scheduler.schedule(when, record, "follow-up"))
+    assert scheduler.run_due(100) == 2
+    assert calls == [("follow-up", 100)]
@@ -0,0 +1,78 @@
+import sqlite3
+from types import SimpleNamespace
+import game_logic
+import telemetry
+from reel_input import ReelInput
+from telemetry import RECORD, RecordRing
+
+def test_ring_drains_in_order():
+    ring = RecordRing(4)
+    for i in range(3):
+        assert ring.push(7, telemetry.PROGRESS, i)
+    records = ring.drain()
+    assert [r[0] for r in records] == [7, 7, 7]
+    assert [r[3] for r in records] == [0.0, 1.0, 2.0]
+    assert ring.drain() == []
+
+def test_ring_drops_and_counts_when_full():
+    ring = RecordRing(3)
+    results = [ring.push(1, telemetry.PROGRESS, i) for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert ring.dropped == 2
+    # the oldest records are kept, the overflow is what's lost
+    assert [r[3] for r in ring.drain()] == [0.0, 1.0, 2.0]
+
+def test_ring_wraps_around():
+    ring = RecordRing(2)
+    values = []
+    for i in range(7):
+        ring.push(1, telemetry.PROGRESS, i)
+        values += [r[3] for r in ring.drain()]
+    assert values == [float(i) for i in range(7)]
+    assert ring.dropped == 0
+    assert len(ring.buffer) == 2 * RECORD.size
+
+def test_drain_limit():
+    ring = RecordRing(8)
+    for i in range(5):
+        ring.push(1, telemetry.PROGRESS, i)
+    assert len(ring.drain(limit=2)) == 2
+    assert [r[3] for r in ring.drain()] == [2.0, 3.0, 4.0]
+
+def test_writer_records_dropped_counts(tmp_path):
+    db_path = str(tmp_path / "telemetry.db")
+    ring = RecordRing(2)
+    writer = telemetry.TelemetryWriter(ring, db_path, 60)
+    for i in range(5):
+        ring.push(1, telemetry.PROGRESS, i)
+    writer.start()
+    writer.stop()
+    db = sqlite3.connect(db_path)
+    assert db.execute("select count(*) from events").fetchone()[0] == 2
+    assert db.execute("select sum(dropped) from writer_stats").fetchone()[0] == 3
+    assert writer.written == 2
+
+def _game(state, minigame=None):
+    return SimpleNamespace(game_state=state, minigame=minigame, bite_time=0, reel_input=ReelInput())
+
+def _outcomes(db_path):
+    db = sqlite3.connect(db_path)
+    return db.execute("select a, b from events where kind = ?", (telemetry.OUTCOME,)).fetchall()
+
+def test_catch_running_at_quit_is_abandoned(tmp_path):
+    db_path = str(tmp_path / "telemetry.db")
+    t = telemetry.Telemetry(db_path, capacity=64, flush_interval_s=60)
+    minigame = SimpleNamespace(fish=game_logic.Carp(), first_hit_made=False, catch_progress=10)
+    gs = _game('waiting_for_bite')
+    t.observe(gs, 1000)
+    gs.game_state, gs.minigame = 'fishing', minigame
+    t.observe(gs, 1500)
+    t.close(4000)
+    assert _outcomes(db_path) == [(telemetry.OUTCOME_ABANDONED, 2500.0)]
+
+def test_quit_between_catches_adds_no_outcome(tmp_path):
+    db_path = str(tmp_path / "telemetry.db")
+    t = telemetry.Telemetry(db_path, capacity=64, flush_interval_s=60)
+    t.observe(_game('menu'), 0)
+    t.close(100)
+    assert _outcomes(db_path) == []
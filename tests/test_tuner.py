@@ -0,0 +1,104 @@
+import json
+import pytest
+import settings
+import tuner
+
+class _InlinePool:
+    """Stands in for the ProcessPoolExecutor."""
+    def map(self, fn, tasks, chunksize=1):
+        return [fn(task) for task in tasks]
+
+@pytest.fixture
+def fake_simulation(monkeypatch):
+    """Win rate = difficulty / 10, and a list of every (difficulty) that got simulated."""
+    simulated = []
+    def evaluate_task(task):
+        params, difficulty, sessions, seed, player = task
+        simulated.append(difficulty)
+        return difficulty / 10
+    monkeypatch.setattr(tuner, "_evaluate_task", evaluate_task)
+    return simulated
+
+def _defaults():
+    return {name: getattr(settings, name) for name in tuner.PARAM_SPACE}
+
+def test_score_is_squared_error_over_the_targets():
+    assert tuner.score({1: 0.9, 2: 0.5}, {1: 1.0, 2: 0.5}) == pytest.approx(0.01)
+    # extra win rates that aren't targets don't count
+    assert tuner.score({1: 1.0, 5: 0.0}, {1: 1.0}) == 0.0
+
+def test_params_key_ignores_float_noise():
+    params = _defaults()
+    noisy = {name: value + 1e-9 for name, value in params.items()}
+    assert tuner._params_key(params, 60, "human", "f") == tuner._params_key(noisy, 60, "human", "f")
+
+def test_params_key_depends_on_sessions_player_and_fingerprint():
+    params = _defaults()
+    base = tuner._params_key(params, 60, "human", "f")
+    assert base != tuner._params_key(params, 30, "human", "f")
+    assert base != tuner._params_key(params, 60, "pd", "f")
+    assert base != tuner._params_key(params, 60, "human", "other code")
+
+def test_fingerprint_changes_with_a_fixed_setting(monkeypatch):
+    before = tuner.simulation_fingerprint()
+    monkeypatch.setattr(settings, "FISH_CAUGHT_SLOWDOWN", settings.FISH_CAUGHT_SLOWDOWN + 0.1)
+    assert tuner.simulation_fingerprint() != before
+
+def test_fingerprint_ignores_searched_settings(monkeypatch):
+    before = tuner.simulation_fingerprint()
+    monkeypatch.setattr(settings, "FISH_DRAG", settings.FISH_DRAG * 0.5)
+    assert tuner.simulation_fingerprint() == before
+
+def test_cached_candidate_is_not_simulated_again(fake_simulation):
+    t = tuner.Tuner({1: 0.9, 2: 0.8}, workers=1)
+    first = t.evaluate(_InlinePool(), [_defaults()])
+    second = t.evaluate(_InlinePool(), [_defaults()])
+    assert first == second == [{1: 0.1, 2: 0.2}]
+    assert sorted(fake_simulation) == [1, 2]
+    assert t.cache_hits == 1
+
+def test_new_targets_only_simulate_the_missing_difficulties(fake_simulation, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    t = tuner.Tuner({1: 0.9, 2: 0.8}, workers=1, cache_path=cache_path)
+    t.evaluate(_InlinePool(), [_defaults()])
+    t.save_cache()
+    fake_simulation.clear()
+
+    # a rerun with another --targets against the same cache file
+    targets = {1: 0.9, 2: 0.8, 5: 0.6}
+    t = tuner.Tuner(targets, workers=1, cache_path=cache_path)
+    rates = t.evaluate(_InlinePool(), [_defaults()])
+    assert fake_simulation == [5]
+    assert rates == [{1: 0.1, 2: 0.2, 5: 0.5}]
+    assert tuner.score(rates[0], targets) >= 0.0
+
+def test_results_only_cover_the_current_targets(fake_simulation):
+    t = tuner.Tuner({1: 0.9, 2: 0.8, 3: 0.7}, workers=1)
+    t.evaluate(_InlinePool(), [_defaults()])
+    t.targets = {2: 0.8}
+    assert t.evaluate(_InlinePool(), [_defaults()]) == [{2: 0.2}]
+
+def test_cache_from_other_code_is_not_reused(fake_simulation, tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "cache.json")
+    t = tuner.Tuner({1: 0.9}, workers=1, cache_path=cache_path)
+    t.evaluate(_InlinePool(), [_defaults()])
+    t.save_cache()
+    fake_simulation.clear()
+
+    monkeypatch.setattr(tuner, "simulation_fingerprint", lambda: "edited mechanics")
+    t = tuner.Tuner({1: 0.9}, workers=1, cache_path=cache_path)
+    t.evaluate(_InlinePool(), [_defaults()])
+    assert fake_simulation == [1]
+
+def test_simulated_catch_is_deterministic_for_a_seed():
+    import bots
+    fish = tuner.ALL_FISH_CLASSES[0]
+    results = {tuner.simulate_catch(fish, bots.make_bot("pd", seed=1), seed=7) for _ in range(2)}
+    assert len(results) == 1
+
+def test_write_profile_round_trips(tmp_path):
+    path = tmp_path / "profile.json"
+    tuner.write_profile(str(path), _defaults(), {1: 0.9}, {1: 0.95}, 0.0025)
+    profile = json.loads(path.read_text())
+    assert profile["FISH_DRAG"] == round(settings.FISH_DRAG, 5)
+    assert profile["_tuner"]["win_rates"] == {"1": 0.9}
@@ -0,0 +1,69 @@
+import gc
+from types import SimpleNamespace
+import pygame
+import pytest
+import settings
+import water
+
+pytestmark = pytest.mark.skipif(not water._NUMPY_SUPPORT, reason="water effects need numpy")
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.display.init()
+    pygame.display.set_mode((320, 240))
+    yield
+    pygame.display.quit()
+
+def _layout():
+    return SimpleNamespace(water_rect=(40, 20, 240, 200), track_x=150, track_w=20, fish_h=10, scale=1.0)
+
+def _minigame():
+    return SimpleNamespace(fish_y=100, fish_vel=2.0, first_hit_made=False, catch_progress=10)
+
+def _draw(effects, scene, minigame):
+    effects.draw(pygame.display.get_surface(), scene, (0, 0), _layout(), minigame, True)
+
+def test_sources_do_not_keep_the_scene_alive():
+    effects = water.WaterEffects()
+    scene = pygame.Surface((320, 240))
+    _draw(effects, scene, _minigame())
+    assert len(effects.sources) == 1
+    del scene
+    gc.collect()
+    assert len(effects.sources) == 0
+
+def test_source_is_cached_per_offset():
+    effects = water.WaterEffects()
+    scene = pygame.Surface((320, 240))
+    _draw(effects, scene, _minigame())
+    first = effects._source(scene, (0, 0), _layout().water_rect)
+    assert effects._source(scene, (0, 0), _layout().water_rect) is first
+    effects._source(scene, (3, -2), _layout().water_rect)
+    assert len(effects.sources[scene]) == 2
+
+def test_quality_drops_a_level_when_over_budget():
+    effects = water.WaterEffects()
+    for _ in range(10):
+        effects._account(settings.WATER_BUDGET_MS * 2)
+    assert effects.level == 1
+    assert not effects.suspended
+
+def test_switched_off_for_the_catch_when_the_lowest_level_is_over_budget():
+    effects = water.WaterEffects()
+    effects.level = len(settings.WATER_QUALITY_LEVELS) - 1
+    scene, minigame = pygame.Surface((320, 240)), _minigame()
+    _draw(effects, scene, minigame)
+    for _ in range(10):
+        if effects.suspended:
+            break
+        effects._account(settings.WATER_BUDGET_MS * 4)
+    assert effects.suspended
+    frames = effects.frames
+    _draw(effects, scene, minigame)
+    assert effects.frames == frames # nothing drawn or counted
+
+    # the next catch tries again
+    _draw(effects, scene, _minigame())
+    assert not effects.suspended
+    assert effects.frames == frames + 1
+    assert effects.stats()["suspensions"] == 1
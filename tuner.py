@@ -0,0 +1,280 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import settings
+from layout import Layout
+from game_logic import FishingMinigame, ALL_FISH_CLASSES
+import bots
+
+# difficulty auto-tuner.
+# fits the catch physics and the per-difficulty fish formulas to target win
+# rates for a reference player (bots.HumanBot by default). candidates are
+# evaluated with simulated catches in worker processes, results are cached on
+# disk, and the best settings are written out as a json settings profile:
+#     python tuner.py --workers 32 --out tuned_settings.json
+#     python go_fish.py --settings-profile tuned_settings.json
+
+# win rate we want the reference player to have against each difficulty
+DEFAULT_TARGET_WIN_RATES = {
+    1: 0.95,
+    2: 0.90,
+    3: 0.85,
+    4: 0.75,
+    5: 0.65,
+    6: 0.55,
+    8: 0.40,
+    10: 0.25,
+}
+
+# setting name -> (min, max) the search stays inside
+PARAM_SPACE = {
+    "CATCH_BAR_SPEED_UP": (-0.9, -0.3),
+    "CATCH_BAR_GRAVITY": (0.1, 0.45),
+    "FISH_ACCEL": (0.05, 0.5),
+    "FISH_DRAG": (0.85, 0.99),
+    "PROGRESS_GAIN": (0.2, 0.8),
+    "PROGRESS_LOSS": (0.1, 0.5),
+    "FISH_SPEED_MOD_BASE": (0.2, 1.0),
+    "FISH_SPEED_MOD_PER_LEVEL": (0.05, 0.3),
+    "FISH_GAIN_MOD_BASE": (0.8, 2.0),
+    "FISH_GAIN_MOD_PER_LEVEL": (-0.2, 0.0),
+    "FISH_LOSS_MOD_BASE": (0.2, 1.0),
+    "FISH_LOSS_MOD_PER_LEVEL": (0.02, 0.2),
+}
+
+SIM_MAX_FRAMES = 60 * 180 # a catch that takes longer than 3 minutes counts as lost
+
+# ---- headless simulation ----
+class _SimAssets:
+    """No sounds, no cutscene: the minigame only needs the attributes to exist."""
+    reeling_sound = lose_sound = success_sound = cutscene_sound_1 = None
+    cutscene_frames = None
+
+    def prefetch_fish(self, species_id):
+        pass
+
+class SimState:
+    """The subset of go_fish.GameState that FishingMinigame reads, without pygame."""
+    def __init__(self, bot):
+        layout = Layout(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+        self.track_x, self.track_y, self.track_w, self.track_h = (
+            layout.track_x, layout.track_y, layout.track_w, layout.track_h)
+        self.catch_bar_h, self.fish_h = layout.catch_bar_h, layout.fish_h
+        self.physics_scale = layout.scale
+        self.assets = _SimAssets()
+        self.cheats = {"fast_catch": False}
+        self.bot = bot
+        self.game_state = 'fishing'
+
+    def play_bgm(self, track_path):
+        pass
+
+    def stop_bgm(self):
+        pass
+
+def simulate_catch(fish_class, bot, seed):
+    """Plays one catch against `fish_class`. Returns True if the bot landed it."""
+    random.seed(seed)
+    gs = SimState(bot)
+    gs.minigame = FishingMinigame(gs, fish_class=fish_class)
+    bot.on_new_catch(gs.minigame)
+    for _ in range(SIM_MAX_FRAMES):
+        gs.minigame.update(gs)
+        if gs.game_state != 'fishing':
+            return gs.game_state in ('won', 'cutscene')
+    return False
+
+def _evaluate_task(task):
+    """Worker entry point: win rate of one candidate against one difficulty."""
+    params, difficulty, sessions, seed, player = task
+    for name, value in params.items():
+        setattr(settings, name, value)
+    fish_classes = [cls for cls in ALL_FISH_CLASSES if cls().difficulty == difficulty]
+    bot = bots.make_bot(player, seed=seed)
+    wins = 0
+    for i in range(sessions):
+        wins += simulate_catch(fish_classes[i % len(fish_classes)], bot, seed * 100003 + i)
+    return wins / sessions
+
+# ---- search ----
+CACHE_VERSION = 2 # bump when the meaning of a cached entry changes
+# modules whose code decides a simulated catch
+_SIM_SOURCES = ("game_logic.py", "bots.py", "layout.py", "tuner.py")
+
+def _is_plain(value):
+    if isinstance(value, (bool, int, float)):
+        return True
+    return isinstance(value, (list, tuple)) and all(_is_plain(v) for v in value)
+
+def simulation_fingerprint():
+    """Hash of the simulation code and of every numeric setting the search doesn't change.
+
+    part of every cache key, so results aren't reused after someone edits the
+    mechanics or a fixed setting. paths and other non-numeric settings can't
+    change a catch and are left out, so the cache survives moving the checkout.
+    """
+    digest = hashlib.sha1()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in _SIM_SOURCES:
+        with open(os.path.join(directory, name), "rb") as f:
+            digest.update(f.read())
+    fixed = {name: value for name, value in vars(settings).items()
+             if name.isupper() and name not in PARAM_SPACE and _is_plain(value)}
+    digest.update(json.dumps(fixed, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def _params_key(params, sessions, player, fingerprint):
+    """Stable cache key for a candidate (values rounded so float noise doesn't miss).
+
+    the difficulties aren't part of the key: an entry holds a win rate per
+    difficulty and only the ones it's missing get simulated.
+    """
+    rounded = {name: round(value, 5) for name, value in sorted(params.items())}
+    text = json.dumps([CACHE_VERSION, fingerprint, rounded, sessions, player], sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+def score(win_rates, targets):
+    """Squared error between the simulated and target win rates (lower is better)."""
+    return sum((win_rates[d] - targets[d]) ** 2 for d in targets)
+
+class Tuner:
+    def __init__(self, targets, workers=None, sessions=60, player="human", cache_path=None, seed=0):
+        self.targets = targets
+        self.workers = workers or os.cpu_count() or 1
+        self.sessions = sessions
+        self.player = player
+        self.cache_path = cache_path
+        self.rng = random.Random(seed)
+        self.cache = {}
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path) as f:
+                    self.cache = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable tuner cache {cache_path}: {e}")
+        self.fingerprint = simulation_fingerprint()
+        self.cache_hits = 0
+
+    def save_cache(self):
+        if self.cache_path:
+            with open(self.cache_path, "w") as f:
+                json.dump(self.cache, f)
+
+    def evaluate(self, pool, candidates):
+        """Returns the per-difficulty win rates for each candidate, using the cache where possible."""
+        keys = [_params_key(params, self.sessions, self.player, self.fingerprint) for params in candidates]
+        tasks, task_slots = [], []
+        for i, (params, key) in enumerate(zip(candidates, keys)):
+            cached = self.cache.get(key, {})
+            missing = [difficulty for difficulty in self.targets if str(difficulty) not in cached]
+            if not missing:
+                self.cache_hits += 1
+                continue
+            for difficulty in missing:
+                # same seeds for every candidate, so differences come from the params
+                tasks.append((params, difficulty, self.sessions, difficulty, self.player))
+                task_slots.append((i, difficulty))
+
+        for (i, difficulty), win_rate in zip(task_slots, pool.map(_evaluate_task, tasks, chunksize=1)):
+            self.cache.setdefault(keys[i], {})[str(difficulty)] = win_rate
+
+        # only the difficulties asked for, an entry can hold more from an earlier run
+        return [{d: self.cache[key][str(d)] for d in self.targets} for key in keys]
+
+    def mutate(self, params, step):
+        """Gaussian step on every parameter, `step` is a fraction of each range."""
+        child = {}
+        for name, (low, high) in PARAM_SPACE.items():
+            value = params[name] + self.rng.gauss(0, step * (high - low))
+            child[name] = min(high, max(low, value))
+        return child
+
+    def run(self, generations=40, population=None, tolerance=0.002, patience=6, step=0.15):
+        """(1+lambda) evolution strategy. stops early once the error is below
+        `tolerance` or nothing improved for `patience` generations."""
+        population = population or self.workers
+        best = {name: getattr(settings, name) for name in PARAM_SPACE}
+        start = time.perf_counter()
+        stale = 0
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            best_rates = self.evaluate(pool, [best])[0]
+            best_score = score(best_rates, self.targets)
+            print(f"[gen 0] current settings: error {best_score:.4f}")
+
+            for generation in range(1, generations + 1):
+                candidates = [self.mutate(best, step) for _ in range(population)]
+                results = self.evaluate(pool, candidates)
+                gen_best = min(range(len(candidates)), key=lambda i: score(results[i], self.targets))
+                gen_score = score(results[gen_best], self.targets)
+
+                if gen_score < best_score:
+                    best, best_rates, best_score = candidates[gen_best], results[gen_best], gen_score
+                    stale = 0
+                else:
+                    stale += 1
+                    step *= 0.8 # search closer to the best once we stop finding improvements
+                self.save_cache()
+
+                print(f"[gen {generation}] error {best_score:.4f} (this gen {gen_score:.4f}), "
+                      f"step {step:.3f}, {time.perf_counter() - start:.0f}s, cache hits {self.cache_hits}")
+                if best_score <= tolerance:
+                    print("Target reached, stopping early.")
+                    break
+                if stale >= patience:
+                    print(f"No improvement for {patience} generations, stopping early.")
+                    break
+
+        return best, best_rates, best_score
+
+def write_profile(path, params, win_rates, targets, error):
+    """Writes a settings profile. keys starting with '_' are metadata and ignored when loading."""
+    profile = {name: round(value, 5) for name, value in sorted(params.items())}
+    profile["_tuner"] = {
+        "error": round(error, 6),
+        "win_rates": {str(d): round(rate, 3) for d, rate in sorted(win_rates.items())},
+        "targets": {str(d): rate for d, rate in sorted(targets.items())},
+    }
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+    print(f"Wrote tuned settings profile to {path}")
+
+def parse_targets(text):
+    """Parses '1=0.95,2=0.9,...' into {1: 0.95, 2: 0.9, ...}."""
+    targets = {}
+    for part in text.split(","):
+        difficulty, rate = part.split("=")
+        targets[int(difficulty)] = float(rate)
+    return targets
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit physics settings to target win rates per difficulty")
+    parser.add_argument("--targets", type=parse_targets, default=DEFAULT_TARGET_WIN_RATES,
+                        help="win rate per difficulty, e.g. 1=0.95,5=0.6,10=0.25")
+    parser.add_argument("--player", choices=sorted(bots.BOT_TYPES), default="human", help="reference player model")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--sessions", type=int, default=60, help="simulated catches per difficulty per candidate")
+    parser.add_argument("--generations", type=int, default=40)
+    parser.add_argument("--population", type=int, default=None, help="candidates per generation (default: workers)")
+    parser.add_argument("--patience", type=int, default=6)
+    parser.add_argument("--tolerance", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default="tuner_cache.json", help="evaluation cache file")
+    parser.add_argument("--out", default="tuned_settings.json")
+    cli = parser.parse_args()
+
+    known = {cls().difficulty for cls in ALL_FISH_CLASSES}
+    unknown = set(cli.targets) - known
+    if unknown:
+        parser.error(f"no fish with difficulty {sorted(unknown)} (have {sorted(known)})")
+
+    tuner = Tuner(cli.targets, workers=cli.workers, sessions=cli.sessions, player=cli.player,
+                  cache_path=cli.cache, seed=cli.seed)
+    best, best_rates, best_score = tuner.run(cli.generations, cli.population, cli.tolerance, cli.patience)
+    for difficulty in sorted(cli.targets):
+        print(f"  difficulty {difficulty}: win rate {best_rates[difficulty]:.2f} (target {cli.targets[difficulty]:.2f})")
+    write_profile(cli.out, best, best_rates, cli.targets, best_score)
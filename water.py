@@ -0,0 +1,266 @@
+import time
+import random
+import weakref
+import pygame
+import settings
+
+try:
+    import numpy
+    import pygame.surfarray
+    _NUMPY_SUPPORT = True
+except ImportError:
+    numpy = None
+    _NUMPY_SUPPORT = False
+
+# animated water for the fishing minigame.
+# a height field (the classic two-buffer ripple simulation) runs on a grid a few
+# times smaller than the screen, only inside Layout.water_rect around the track.
+# each frame the fish pokes it (harder the faster it swims), the first hit makes
+# a splash, and the background under the rect is displaced by the slope of the
+# water, stronger as the catch progresses. only the window where the water is
+# actually moving gets upscaled and alpha blended (opacity follows the slope),
+# so calm water shows the full resolution background untouched.
+# everything is vectorised with numpy; without numpy the static background is
+# drawn as before.
+# the whole effect has a time budget (WATER_BUDGET_MS). when it runs over, the
+# quality drops a level (coarser grid, then nearest-neighbour upscaling) and
+# it climbs back once there is plenty of headroom again. if even the lowest
+# level is over budget the water is switched off for the rest of the catch
+# (the static background is drawn) and tried again on the next one.
+
+_MAX_SOURCES = 32 # cached low-res backgrounds per scene (one per vibration offset)
+
+class WaterEffects:
+    """Ripple/displacement layer drawn over the fishing scene."""
+    def __init__(self):
+        self.level = 0 # index into settings.WATER_QUALITY_LEVELS, 0 is the best
+        self.grid_key = None
+        # scene surface -> {(offset, rect, grid size): low-res pixels}. weak, so a
+        # composite Assets dropped isn't kept alive by its cached pixels
+        self.sources = weakref.WeakKeyDictionary()
+        self.minigame = None
+        self.suspended = False # over budget at the lowest level, off until the next catch
+        self.first_hit_seen = False
+        self.cost_ema = None
+        self.frames_at_level = 0
+        self.phase = 0
+        self.rng = random.Random()
+
+        # --- metrics ---
+        self.frames = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.over_budget = 0
+        self.downgrades = 0
+        self.upgrades = 0
+        self.suspensions = 0
+        self.dirty_cells = 0 # cells rendered vs cells in the grid, to show what the dirty window saves
+        self.total_cells = 0
+
+    @property
+    def available(self):
+        return _NUMPY_SUPPORT and settings.WATER_EFFECTS_ENABLED
+
+    # ---- grid ----
+    def _reset_grid(self, rect, factor, smooth):
+        x, y, w, h = rect
+        self.grid_size = (max(3, w // factor), max(3, h // factor))
+        self.factor = factor
+        self.smooth = smooth
+        self.current = numpy.zeros(self.grid_size, numpy.float32)
+        self.previous = numpy.zeros(self.grid_size, numpy.float32)
+        self.low_surface = pygame.Surface(self.grid_size, pygame.SRCALPHA).convert_alpha()
+        self.grid_key = (rect, factor, smooth)
+
+    def _source(self, scene, offset, rect):
+        """The scene under the water rect, shrunk to the grid (cached per scene and shake offset)."""
+        cached = self.sources.setdefault(scene, {})
+        key = (offset, rect, self.grid_size)
+        pixels = cached.get(key)
+        if pixels is None:
+            if len(cached) >= _MAX_SOURCES:
+                cached.clear()
+            # the scene is drawn moved by `offset`, so what's under the rect comes from the other way
+            area = scene.subsurface(pygame.Rect(rect).move(-offset[0], -offset[1]).clamp(scene.get_rect()))
+            pixels = pygame.surfarray.array3d(pygame.transform.smoothscale(area, self.grid_size))
+            cached[key] = pixels
+        return pixels
+
+    # ---- simulation ----
+    def _poke(self, gx, gy, radius, amount):
+        """Adds a round bump to the height field (grid coordinates)."""
+        gw, gh = self.grid_size
+        x0, x1 = max(1, gx - radius), min(gw - 1, gx + radius + 1)
+        y0, y1 = max(1, gy - radius), min(gh - 1, gy + radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        xs = numpy.arange(x0, x1)[:, None] - gx
+        ys = numpy.arange(y0, y1)[None, :] - gy
+        self.current[x0:x1, y0:y1] += amount * numpy.clip(1.0 - (xs * xs + ys * ys) / float(radius * radius + 1), 0.0, None)
+
+    def _disturb(self, layout, minigame):
+        rect_x, rect_y = layout.water_rect[0], layout.water_rect[1]
+        # the line comes out of the water where the fish is, in the middle of the track
+        gx = int((layout.track_x + layout.track_w // 2 - rect_x) / self.factor)
+        gy = int((minigame.fish_y + layout.fish_h // 2 - rect_y) / self.factor)
+        radius = max(1, int(layout.track_w / (2 * self.factor)))
+
+        # the line bobs up and down (a one-way push would just raise the whole pond)
+        self.phase += 1
+        bob = 1.0 if (self.phase // settings.WATER_LINE_PERIOD) % 2 == 0 else -1.0
+        speed = abs(minigame.fish_vel) / max(layout.scale, 0.01)
+        self._poke(gx, gy, radius, bob * settings.WATER_LINE_RIPPLE * (0.2 + min(speed, 10.0) / 10.0))
+
+        if minigame.first_hit_made and not self.first_hit_seen:
+            self.first_hit_seen = True
+            self._poke(gx, gy, radius * 3, settings.WATER_SPLASH)
+            for _ in range(6): # droplets landing around the splash
+                self._poke(gx + self.rng.randint(-radius * 6, radius * 6),
+                           gy + self.rng.randint(-radius * 6, radius * 6),
+                           max(1, radius // 2), settings.WATER_SPLASH * 0.3)
+
+    def _step(self):
+        """One step of the ripple simulation, in place (previous becomes the new current)."""
+        cur, prev = self.current, self.previous
+        inner = prev[1:-1, 1:-1]
+        # new height = half the sum of the four neighbours minus the height two steps ago
+        numpy.subtract((cur[:-2, 1:-1] + cur[2:, 1:-1] + cur[1:-1, :-2] + cur[1:-1, 2:]) * 0.5, inner, out=inner)
+        inner *= settings.WATER_DAMPING
+        self.current, self.previous = prev, cur
+
+    def _dirty_window(self):
+        """Grid cells (x0, y0, x1, y1) where the water is visibly moving, or None if it's calm."""
+        moving = numpy.abs(self.current) > settings.WATER_CALM_HEIGHT
+        columns = numpy.flatnonzero(moving.any(axis=1))
+        if not len(columns):
+            return None
+        rows = numpy.flatnonzero(moving.any(axis=0))
+        gw, gh = self.grid_size
+        # one cell of margin for the slope, but never the border cells
+        return (max(1, int(columns[0]) - 1), max(1, int(rows[0]) - 1),
+                min(gw - 1, int(columns[-1]) + 2), min(gh - 1, int(rows[-1]) + 2))
+
+    def _render(self, screen, source, rect, tension, window):
+        x0, y0, x1, y1 = window
+        cur = self.current
+        slope_x = cur[x0 + 1:x1 + 1, y0:y1] - cur[x0 - 1:x1 - 1, y0:y1]
+        slope_y = cur[x0:x1, y0 + 1:y1 + 1] - cur[x0:x1, y0 - 1:y1 - 1]
+        strength = settings.WATER_DISPLACEMENT * (0.5 + tension) / self.factor
+        gw, gh = self.grid_size
+        sample_x = numpy.clip(numpy.arange(x0, x1)[:, None] + (slope_x * strength).astype(numpy.int32), 0, gw - 1)
+        sample_y = numpy.clip(numpy.arange(y0, y1)[None, :] + (slope_y * strength).astype(numpy.int32), 0, gh - 1)
+
+        shading = (slope_x * settings.WATER_SHADING)[:, :, None]
+        pixels = numpy.clip(source[sample_x, sample_y] + shading, 0, 255).astype(numpy.uint8)
+        layer = self.low_surface.subsurface((x0, y0, x1 - x0, y1 - y0))
+        pygame.surfarray.blit_array(layer, pixels)
+        # calm water is transparent, so the full-res background stays sharp outside the ripples
+        alpha = pygame.surfarray.pixels_alpha(layer)
+        alpha[...] = numpy.clip((numpy.abs(slope_x) + numpy.abs(slope_y)) * settings.WATER_ALPHA, 0, 255)
+        del alpha # unlocks the surface
+
+        # only the dirty window gets upscaled and blended
+        scale_x, scale_y = rect[2] / gw, rect[3] / gh
+        left, top = int(x0 * scale_x), int(y0 * scale_y)
+        size = (int(x1 * scale_x + 0.999) - left, int(y1 * scale_y + 0.999) - top)
+        if self.smooth:
+            layer = pygame.transform.smoothscale(layer, size)
+        else:
+            layer = pygame.transform.scale(layer, size)
+        screen.blit(layer, (rect[0] + left, rect[1] + top))
+        return (x1 - x0) * (y1 - y0)
+
+    # ---- frame ----
+    def draw(self, screen, scene, offset, layout, minigame, is_catching):
+        """Steps the water and draws it over the scene that was just blitted to `screen` at `offset`."""
+        if not self.available or minigame is None:
+            return
+        rect = layout.water_rect
+        factor, smooth = settings.WATER_QUALITY_LEVELS[min(self.level, len(settings.WATER_QUALITY_LEVELS) - 1)]
+        if self.grid_key != (rect, factor, smooth):
+            self._reset_grid(rect, factor, smooth)
+        if minigame is not self.minigame:
+            self.current[...] = 0.0
+            self.previous[...] = 0.0
+            self.minigame = minigame
+            self.first_hit_seen = minigame.first_hit_made
+            self.suspended = False
+            self.frames_at_level = 0
+            self.cost_ema = None
+        if self.suspended:
+            return
+        source = self._source(scene, offset, rect) # one-off cost per scene, not counted against the budget
+
+        start = time.perf_counter()
+        self._disturb(layout, minigame)
+        self._step()
+        window = self._dirty_window()
+        if window:
+            tension = minigame.catch_progress / 100.0 if minigame.first_hit_made and is_catching else 0.0
+            self.dirty_cells += self._render(screen, source, rect, tension, window)
+        self.total_cells += self.grid_size[0] * self.grid_size[1]
+        self._account((time.perf_counter() - start) * 1000.0)
+
+    def _account(self, cost_ms):
+        self.frames += 1
+        self.total_ms += cost_ms
+        self.max_ms = max(self.max_ms, cost_ms)
+        self.frames_at_level += 1
+        budget = settings.WATER_BUDGET_MS
+        if cost_ms > budget:
+            self.over_budget += 1
+        self.cost_ema = cost_ms if self.cost_ema is None else self.cost_ema * 0.9 + cost_ms * 0.1
+
+        worst = len(settings.WATER_QUALITY_LEVELS) - 1
+        # give a new level a few frames before judging it, one slow frame can be a gc pause
+        if self.frames_at_level < 10:
+            return
+        if self.cost_ema > budget or cost_ms > budget * 3:
+            if self.level < worst:
+                self.level += 1
+                self.downgrades += 1
+                self._changed_level()
+            else:
+                # nothing cheaper left, a static background beats blowing the frame budget
+                self.suspended = True
+                self.suspensions += 1
+        elif self.cost_ema < budget * 0.4 and self.level > 0 and self.frames_at_level > 120:
+            self.level -= 1
+            self.upgrades += 1
+            self._changed_level()
+
+    def _changed_level(self):
+        self.frames_at_level = 0
+        self.cost_ema = None
+        self.sources.clear()
+
+    def stats(self):
+        factor, smooth = settings.WATER_QUALITY_LEVELS[min(self.level, len(settings.WATER_QUALITY_LEVELS) - 1)]
+        return {
+            "frames": self.frames,
+            "mean_ms": round(self.total_ms / self.frames, 3) if self.frames else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "over_budget": self.over_budget,
+            "level": self.level,
+            "grid_factor": factor,
+            "smooth": smooth,
+            "downgrades": self.downgrades,
+            "upgrades": self.upgrades,
+            "suspensions": self.suspensions,
+            "dirty_percent": round(100.0 * self.dirty_cells / self.total_cells, 1) if self.total_cells else 0.0,
+        }
+
+    def report(self):
+        if not self.available:
+            if settings.WATER_EFFECTS_ENABLED:
+                print("Water effects need numpy, drawing static water")
+            return
+        s = self.stats()
+        print("--- Water Effects ---")
+        print(f"{s['frames']} frames, {s['mean_ms']}ms mean / {s['max_ms']}ms max "
+              f"(budget {settings.WATER_BUDGET_MS}ms, {s['over_budget']} over)")
+        print(f"quality level {s['level']} (1/{s['grid_factor']} grid, {'smooth' if s['smooth'] else 'nearest'} upscale), "
+              f"{s['downgrades']} downgrades, {s['upgrades']} upgrades, {s['dirty_percent']}% of the grid redrawn")
+        if s["suspensions"]:
+            print(f"switched off for {s['suspensions']} catch(es), over budget even at the lowest quality")
+        print("---------------------")